@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compares lexing and parsing a file with loading its tree from the cache.
+Run with `python -m benchmarks.bench_cache [lines]`"""
+
+# Global Python imports
+import gc
+import os
+import sys
+import tempfile
+import time
+# Huitr API imports
+from benchmarks.bench_lexer import generate_source
+from src.project.frontend import parse_file
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.huitr")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_source(line_count))
+
+        timings = {}
+        for name, use_cache in [("no cache", False), ("cache miss", True), ("cache hit", True)]:
+            parsed = None
+            gc.collect()  # not to time the collection of the previous tree
+            start = time.perf_counter()
+            parsed = parse_file(path, use_cache)
+            timings[name] = time.perf_counter() - start
+            assert parsed.error is None, parsed.error
+            assert parsed.cached == (name == "cache hit")
+            print(f"{name:>10}: {timings[name]:.3f}s")
+        print(f"a cache hit takes {timings['cache hit'] / timings['no cache']:.0%} of the time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Times small edits in the middle of growing files: the time per edit should stay about the
+same. Run with `python -m benchmarks.bench_incremental [max statements]`"""
+
+# Global Python imports
+import random
+import sys
+import time
+# Huitr API imports
+from src.lexer.lexer import Lexer
+from src.lexer.source_file import SourceFile
+from src.parser.incremental import apply_edit
+from src.parser.parser import Parser
+
+STATEMENT = "[_, 1 > lt, [0], [(__, 1 > sub > f), (__, 2 > sub > f) > add] > if] > f{};\n"
+EDITS = 100
+
+
+def main():
+    max_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(0)
+    for statements in (max_statements // 100, max_statements // 10, max_statements):
+        source_file = SourceFile("".join(STATEMENT.format(i) for i in range(statements)), "<bench>")
+        tokens, err = Lexer(source_file).tokenize()
+        assert err is None, err
+        tree, err = Parser(tokens).parse()
+        assert err is None, err
+
+        start = time.perf_counter()
+        tokens, tree, err = apply_edit(source_file, tokens, tree, 0, 0, " ")
+        first = time.perf_counter() - start
+        timings = []
+        for i in range(EDITS):
+            offset = source_file.source.index("sub", rng.randrange(len(source_file.source) // 2))
+            start = time.perf_counter()
+            tokens, tree, err = apply_edit(source_file, tokens, tree, offset, 3, "add" if i % 2 else "sub")
+            timings.append(time.perf_counter() - start)
+            assert err is None, err
+        timings.sort()
+        print(
+            f"{len(tokens):>8} tokens: first edit {first * 1000:.1f}ms, "
+            f"then {timings[EDITS // 2] * 1000:.3f}ms per edit (median)"
+        )
+
+
+if __name__ == "__main__":
+    main()
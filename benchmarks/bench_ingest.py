@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compares the peak RSS of lexing a file read into a str and of lexing it mapped in memory.
+Run with `python -m benchmarks.bench_ingest [lines]`, each way is measured in a new process."""
+
+# Global Python imports
+import os
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+# Huitr API imports
+from benchmarks.bench_lexer import generate_source
+from src.lexer.lexer import Lexer
+
+WAYS = ["str", "mmap"]
+
+
+def lex(way: str, path: str):
+    """Child process: lexes the file, then prints the time it took and the peak RSS in KiB"""
+    start = time.perf_counter()
+    if way == "str":
+        with open(path, encoding="utf-8") as file:
+            lexer = Lexer(file.read(), path)
+    else:
+        lexer = Lexer(pathlib.Path(path))
+    tokens, err = lexer.tokenize_compact()
+    assert err is None, err
+    duration = time.perf_counter() - start
+    print(len(tokens), duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        lex(sys.argv[2], sys.argv[3])
+        return
+
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".huitr", delete=False) as file:
+        file.write(generate_source(line_count))
+    try:
+        print(f"{line_count} lines, {os.path.getsize(file.name) / 2**20:.1f} MiB")
+        for way in WAYS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_ingest", "--child", way, file.name],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            token_count, duration, max_rss = output.split()
+            print(f"{way:>5}: {token_count} tokens in {float(duration):.3f}s, peak RSS {int(max_rss) / 1024:.1f} MiB")
+    finally:
+        os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
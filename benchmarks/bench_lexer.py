@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compares the lexer engines on a generated script. Run with `python -m benchmarks.bench_lexer [lines]`"""
+
+# Global Python imports
+import sys
+import time
+# Huitr API imports
+from src.lexer.lexer import Lexer, LEXER_ENGINES
+
+LINES = [
+    "a_{i}, 12_000, 3.5e-2 > some::name > [x > y; 'str {i}'];",
+    ". a line comment {i}",
+    ".. a multi\nline comment ..",
+    "«guillemets» > ::lib::f > (1, 2) > ();",
+]
+
+
+def generate_source(line_count: int) -> str:
+    return "\n".join(LINES[i % len(LINES)].format(i=i) for i in range(line_count)) + "\n"
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    source = generate_source(line_count)
+    print(f"{line_count} lines, {len(source)} chars")
+
+    timings: dict[str, float] = {}
+    for engine in LEXER_ENGINES:
+        start = time.perf_counter()
+        tokens, err = Lexer(source, "<bench>", engine).tokenize()
+        timings[engine] = time.perf_counter() - start
+        assert err is None, err
+        print(f"{engine:>8}: {timings[engine]:.3f}s, {len(tokens) / timings[engine]:,.0f} tokens/s")
+
+    start = time.perf_counter()
+    buffer, err = Lexer(source, "<bench>").tokenize_compact()
+    timings["compact"] = time.perf_counter() - start
+    assert err is None, err
+    print(f"{'compact':>8}: {timings['compact']:.3f}s, {len(buffer) / timings['compact']:,.0f} tokens/s")
+
+    print(f"speedup: {timings['char'] / timings['regex']:.1f}x, {timings['char'] / timings['compact']:.1f}x compact")
+
+
+if __name__ == "__main__":
+    main()
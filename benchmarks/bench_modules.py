@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Runs programs using one module, and all the modules, of a generated library, then the first
+program again, whose module is already loaded. Run with `python -m benchmarks.bench_modules [modules]`"""
+
+# Global Python imports
+import os
+import sys
+import tempfile
+import time
+# Huitr API imports
+from src.lexer.source_file import SourceFile
+from src.project.frontend import lex_and_parse
+from src.runtime.interpreter import interpret
+from src.runtime.modules import Importer, loaded_modules
+
+FUNCTIONS_PER_MODULE = 200
+
+
+def write_library(directory: str, module_count: int):
+    os.makedirs(os.path.join(directory, "lib"))
+    for module in range(module_count):
+        with open(os.path.join(directory, "lib", f"m{module}.huitr"), "w", encoding="utf-8") as file:
+            for function in range(FUNCTIONS_PER_MODULE):
+                file.write(f"[_, {function} > add, 2 > mul] > f{function};\n")
+
+
+def run(directory: str, source: str) -> float:
+    path = os.path.join(directory, "main.huitr")
+    source_file = SourceFile(source, path)
+    tree, error, _, _ = lex_and_parse(source_file)
+    assert tree is not None, error
+    start = time.perf_counter()
+    _, error = interpret(tree, source_file, importer=Importer.for_program(path, use_cache=False))
+    elapsed = time.perf_counter() - start
+    assert error is None, error
+    return elapsed
+
+
+def main():
+    module_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as directory:
+        write_library(directory, module_count)
+        one = "1 > ::lib::m0::f7"
+        every = "; ".join(f"1 > ::lib::m{module}::f7" for module in range(module_count))
+        print(f"one module of {module_count}: {run(directory, one):.3f}s")
+        print(f"  all {module_count} modules: {run(directory, every):.3f}s")
+        print(f" one module again: {run(directory, one):.3f}s (loaded by the first run)")
+        slowest = max(loaded_modules(), key=lambda module: module.parse_time + module.compile_time + module.run_time)
+        print(f"slowest load: {slowest}")
+
+
+if __name__ == "__main__":
+    main()
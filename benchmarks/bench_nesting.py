@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Times parsing and walking deeply nested code, at growing depths: the time per level should
+stay about the same. Run with `python -m benchmarks.bench_nesting [max depth]`"""
+
+# Global Python imports
+import gc
+import sys
+import time
+# Huitr API imports
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.parser.visitor import Visitor
+
+SHAPES = {
+    "functions": ("[", "]"),  # curried lambdas, [[[x]]]
+    "parentheses": ("(", ")"),
+    "lists": ("[x, (", ")]"),
+}
+
+
+class _Depth(Visitor):
+    def generic_visit(self, node, children_values):
+        return 1 + max(children_values, default=0)
+
+
+def generate_nested(depth: int, opening: str, closing: str) -> str:
+    return opening * depth + "a" + closing * depth
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    depths = [max_depth // 100, max_depth // 10, max_depth]
+    for shape, (opening, closing) in SHAPES.items():
+        for depth in depths:
+            tokens, err = Lexer(generate_nested(depth, opening, closing)).tokenize()
+            assert err is None, err
+            timings = {}
+            gc.collect()
+            start = time.perf_counter()
+            tree, err = Parser(tokens).parse()
+            timings["parse"] = time.perf_counter() - start
+            assert err is None, err
+
+            start = time.perf_counter()
+            repr(tree)
+            timings["repr"] = time.perf_counter() - start
+            start = time.perf_counter()
+            _Depth().visit(tree)
+            timings["visit"] = time.perf_counter() - start
+
+            per_level = ", ".join(f"{name} {duration / depth * 1e6:.2f}µs" for name, duration in timings.items())
+            print(f"{shape:>11} {depth:>7} levels: {per_level} per level")
+            tree = tokens = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Evaluates a list of costly items in order, then in parallel on more and more workers, and
+checks the values are the same. Run with `python -m benchmarks.bench_parallel [n] [max workers]`"""
+
+# Global Python imports
+import os
+import sys
+import time
+# Huitr API imports
+from src.lexer.source_file import SourceFile
+from src.project.frontend import lex_and_parse
+from src.runtime.interpreter import interpret
+from src.runtime.vm import VM
+
+PROGRAM = (
+    "[_, 2 > lt, [__], [(__, 1 > sub > fib), (__, 2 > sub > fib) > add] > if] > fib;"
+    "{items}"
+)
+
+
+def run(source_file: SourceFile, workers: int) -> tuple[float, str]:
+    tree, error, _, _ = lex_and_parse(source_file)
+    assert tree is not None, error
+    start = time.perf_counter()
+    value, error = interpret(tree, source_file, VM(workers=workers))
+    elapsed = time.perf_counter() - start
+    assert error is None, error
+    return elapsed, repr(value)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    items = ", ".join(f"({n} > fib)" for _ in range(max(max_workers, 2) * 2))
+    source_file = SourceFile(PROGRAM.format(items=items), "<bench>")
+
+    serial_time, serial_value = run(source_file, 1)
+    print(f"  in order: {serial_time:.3f}s")
+    workers = 2
+    while workers <= max(max_workers, 2):
+        run(source_file, workers)  # starts the workers
+        elapsed, value = run(source_file, workers)
+        assert value == serial_value, (value, serial_value)
+        print(f"{workers:>2} workers: {elapsed:.3f}s ({serial_time / elapsed:.1f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compares updating the persistent vector and hash map with copying a Python list or dict for
+each update, keeping some versions. Run with `python -m benchmarks.bench_persistent [updates]`"""
+
+# Global Python imports
+import random
+import sys
+import time
+from typing import Any, Callable
+# Huitr API imports
+from src.lexer.source_file import SourceFile
+from src.project.frontend import lex_and_parse
+from src.runtime.interpreter import interpret
+from src.runtime.persistent import Vector, HashMap
+
+# Appends items one by one in Huitr
+APPEND_PROGRAM = (
+    "[_ > first, 0 > eq, [__ > last], [(__ > first, 1 > sub), ((__ > last), (__ > first) > append) > loop] > if] > loop;"
+    "{updates}, (0 > range) > loop"
+)
+
+
+def _copied_list_append(items: list, item: Any) -> list:
+    return items + [item]
+
+
+def _copied_list_set(items: list, index: int, item: Any) -> list:
+    items = items.copy()
+    items[index] = item
+    return items
+
+
+def _copied_dict_set(items: dict, key: Any, item: Any) -> dict:
+    items = items.copy()
+    items[key] = item
+    return items
+
+
+def timed(function: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def updates(empty: Any, update: Callable[[Any, int], Any], count: int) -> list:
+    """Every 100th version of a structure updated count times"""
+    versions = []
+    version = empty
+    for index in range(count):
+        version = update(version, index)
+        if not index % 100:
+            versions.append(version)
+    return versions
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    indexes = [random.randrange(count) for _ in range(count)]
+    keys = [str(random.randrange(count)) for _ in range(count)]
+    comparisons = {
+        "append": (
+            lambda: updates(Vector(), lambda vector, index: vector.append(index), count),
+            lambda: updates([], _copied_list_append, count),
+        ),
+        "set": (
+            lambda: updates(Vector(range(count)), lambda vector, index: vector.set(indexes[index], index), count),
+            lambda: updates(list(range(count)), lambda items, index: _copied_list_set(items, indexes[index], index), count),
+        ),
+        "dict set": (
+            lambda: updates(HashMap(), lambda hash_map, index: hash_map.set(keys[index], index), count),
+            lambda: updates({}, lambda items, index: _copied_dict_set(items, keys[index], index), count),
+        ),
+    }
+    for name, (persistent, copied) in comparisons.items():
+        persistent_time, copied_time = timed(persistent), timed(copied)
+        print(f"{name:>10}: persistent {persistent_time:.3f}s, copied {copied_time:.3f}s ({copied_time / persistent_time:.1f}x)")
+
+    source_file = SourceFile(APPEND_PROGRAM.format(updates=count), "<bench>")
+    tree, error, _, _ = lex_and_parse(source_file)
+    assert tree is not None, error
+    elapsed = timed(lambda: interpret(tree, source_file))
+    print(f"{'huitr':>10}: {count} appends in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
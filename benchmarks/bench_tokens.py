@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Measures the memory used per token by each token form. Run with `python -m benchmarks.bench_tokens [lines]`"""
+
+# Global Python imports
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+# Huitr API imports
+from benchmarks.bench_lexer import generate_source
+from src.lexer.lexer import Lexer
+from src.lexer.source_file import SourceFile
+
+
+def measure(name: str, build: Callable[[], Any], token_count: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = build()
+    duration = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+    print(f"{name:>20}: {size / token_count:6.1f} bytes/token, built in {duration:.3f}s")
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    source_file = SourceFile(generate_source(line_count), "<bench>")
+    token_count = len(Lexer(source_file).tokenize_compact()[0])
+    print(f"{line_count} lines, {token_count} tokens")
+
+    measure("list[Token]", lambda: Lexer(source_file).tokenize()[0], token_count)
+    measure("list[CompactToken]", lambda: list(Lexer(source_file).tokenize_compact()[0]), token_count)
+    measure("TokenBuffer", lambda: Lexer(source_file).tokenize_compact()[0], token_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Measures the time and the memory taken by the values of arithmetic-heavy programs.
+Run with `python -m benchmarks.bench_values [items]`"""
+
+# Global Python imports
+import sys
+import time
+import tracemalloc
+# Huitr API imports
+from src.lexer.source_file import SourceFile
+from src.project.frontend import lex_and_parse
+from src.runtime.interpreter import interpret
+
+PROGRAMS = {
+    # The list of the results is kept: its size is the size of the values
+    "kept list": "{items} > range, [_, 3 > mul, 1 > add] > map > xs; xs > len",
+    "small ints": "{items} > range, [_, 100 > mod] > map > sum",
+    "arithmetic": "{items} > range, [(_, _ > mul), (_, 7 > mod) > sub, 2 > idiv] > map > sum",
+    "recursion": "[_ > first, 0 > eq, [__ > last], [(__ > first, 1 > sub), (__ > first, __ > last > add) > loop] > if] > loop;"
+                 "{items}, 0 > loop",
+}
+
+
+def run(source: str) -> tuple[float, int]:
+    """Runs a program, returns the time it took and the peak of the memory it allocated"""
+    source_file = SourceFile(source, "<bench>")
+    tree, error, _, _ = lex_and_parse(source_file)
+    assert tree is not None, error
+    start = time.perf_counter()
+    _, error = interpret(tree, source_file)
+    elapsed = time.perf_counter() - start
+    assert error is None, error
+
+    # Again, tracing the allocations, which is slow
+    tracemalloc.start()
+    interpret(tree, source_file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, program in PROGRAMS.items():
+        elapsed, peak = run(program.format(items=items))
+        print(f"{name:>10}: {elapsed:.3f}s, peak {peak / 1024 / 1024:.1f}MiB ({peak / items:.0f} bytes per item)")
+
+
+if __name__ == "__main__":
+    main()
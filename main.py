@@ -17,6 +17,134 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from src.lexer.lexer import Lexer
+# Global Python imports
+import argparse
+import sys
+import time
+# Huitr API imports
+from src.optimizer.fold import fold
+from src.optimizer.inline import inline, DEFAULT_MAX_SIZE
+from src.project.build import build
+from src.project.frontend import parse_files, parse_file
+from src.runtime.interpreter import interpret
+from src.runtime.modules import Importer, loaded_modules
+from src.runtime.vm import VM, DEFAULT_PARALLEL_THRESHOLD
 
-print("Hello world!")
+
+def parse_command(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    file_count = error_count = 0
+    for parsed in parse_files(args.paths, args.workers, not args.no_cache):
+        file_count += 1
+        if parsed.error is not None:
+            error_count += 1
+            print(parsed.error, file=sys.stderr)
+        if args.timings and parsed.cached:
+            print(f"{parsed.path}: loaded from the cache")
+        elif args.timings:
+            print(f"{parsed.path}: lexed in {parsed.lex_time * 1000:.1f}ms, parsed in {parsed.parse_time * 1000:.1f}ms")
+    if args.timings:
+        print(f"{file_count} files, {error_count} with errors, in {time.perf_counter() - start:.3f}s")
+    return 1 if error_count else 0
+
+
+def build_command(args: argparse.Namespace) -> int:
+    report = build(args.root, args.workers, not args.no_cache)
+    for error in report.errors:
+        print(error, file=sys.stderr)
+    if args.explain:
+        print(report.explain())
+    else:
+        print(f"{len(report.rebuilt)} rebuilt, {len(report.up_to_date)} up to date, {len(report.errors)} with errors")
+    return 1 if report.errors else 0
+
+
+def run_command(args: argparse.Namespace) -> int:
+    parsed = parse_file(args.path, not args.no_cache)
+    if parsed.error is not None:
+        print(parsed.error, file=sys.stderr)
+        return 1
+    tree = parsed.tree
+    assert tree is not None
+    if not args.no_inline:
+        tree, report = inline(tree, args.max_inline_size)
+        if args.stats:
+            print(
+                f"inlining replaced {report.inlined} calls, reduced {report.reduced} functions, "
+                f"dropped {report.dropped} statements",
+                file=sys.stderr,
+            )
+    # Inlined bodies can fold: `3 > [_, 1 > add]` becomes `3, 1 > add`
+    if not args.no_fold:
+        tree, eliminated = fold(tree)
+        if args.stats:
+            print(f"constant folding eliminated {eliminated} nodes", file=sys.stderr)
+    if args.dump:
+        print(tree, file=sys.stderr)
+    vm = VM(lazy=args.lazy, workers=args.workers, parallel_threshold=args.parallel_threshold)
+    importer = Importer.for_program(args.path, args.library_path, not args.no_cache)
+    value, err = interpret(tree, parsed.source_file, vm, importer)
+    if args.stats:
+        for cache in vm.memo_caches:
+            print(cache, file=sys.stderr)
+        for module in loaded_modules():
+            print(module, file=sys.stderr)
+    if err is not None:
+        print(err, file=sys.stderr)
+        return 1
+    if args.print:
+        print(value)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog="huitr", description="Huitr - a purely functional programming language.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    parse = commands.add_parser("parse", help="check the syntax of files and directories")
+    parse.add_argument("paths", nargs="+", help="source files, or directories to search for .huitr files")
+    parse.add_argument("-j", "--workers", type=int, default=None, help="number of processes (default: all the CPUs)")
+    parse.add_argument("--timings", action="store_true", help="print the time spent on each file")
+    parse.add_argument("--no-cache", action="store_true", help="do not read or write __huitr_cache__ directories")
+    parse.set_defaults(run=parse_command)
+
+    build_parser = commands.add_parser("build", help="build the modules of a project which changed")
+    build_parser.add_argument("root", help="root directory of the project")
+    build_parser.add_argument("-j", "--workers", type=int, default=None, help="number of processes (default: all the CPUs)")
+    build_parser.add_argument("--explain", action="store_true", help="tell which modules were rebuilt and why")
+    build_parser.add_argument("--no-cache", action="store_true", help="do not read or write the cached trees")
+    build_parser.set_defaults(run=build_command)
+
+    run = commands.add_parser("run", help="run a program")
+    run.add_argument("path", help="source file of the program")
+    run.add_argument("--print", action="store_true", help="print the value of the last statement")
+    run.add_argument("--no-cache", action="store_true", help="do not read or write the __huitr_cache__ directory")
+    run.add_argument("--no-fold", action="store_true", help="do not run the calls of builtins on literals before the program")
+    run.add_argument("--no-inline", action="store_true", help="do not replace calls of small functions by their body")
+    run.add_argument(
+        "--max-inline-size", type=int, default=DEFAULT_MAX_SIZE,
+        help=f"nodes of the biggest functions inlined, 0 to only reduce functions called where they are written (default: {DEFAULT_MAX_SIZE})",
+    )
+    run.add_argument("--dump", action="store_true", help="print the tree after the optimisations")
+    run.add_argument("--lazy", action="store_true", help="compute the items of lists made by range, map and filter when they are needed")
+    run.add_argument(
+        "-L", "--library-path", action="append", default=[],
+        help="directory to look for modules in, after the directory of the program (can be repeated)",
+    )
+    run.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help="number of processes evaluating the items of costly lists in parallel (default: 1, in order)",
+    )
+    run.add_argument(
+        "--parallel-threshold", type=int, default=DEFAULT_PARALLEL_THRESHOLD,
+        help=f"estimated cost of the items of the lists evaluated in parallel (default: {DEFAULT_PARALLEL_THRESHOLD})",
+    )
+    run.add_argument("--stats", action="store_true", help="print what the optimisations did, and the time taken by each module loaded")
+    run.set_defaults(run=run_command)
+
+    args = arg_parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
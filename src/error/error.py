@@ -85,3 +85,43 @@ class ModuleNotFoundError(Error):
         end_pos: Position | None = None,
     ):
         super().__init__("ModuleNotFoundError", error_message, start_pos, end_pos)
+
+
+class TypeError(Error):
+    def __init__(
+        self,
+        error_message: str,
+        start_pos: Position,
+        end_pos: Position | None = None,
+    ):
+        super().__init__("TypeError", error_message, start_pos, end_pos)
+
+
+class ValueError(Error):
+    def __init__(
+        self,
+        error_message: str,
+        start_pos: Position,
+        end_pos: Position | None = None,
+    ):
+        super().__init__("ValueError", error_message, start_pos, end_pos)
+
+
+class ZeroDivisionError(Error):
+    def __init__(
+        self,
+        error_message: str,
+        start_pos: Position,
+        end_pos: Position | None = None,
+    ):
+        super().__init__("ZeroDivisionError", error_message, start_pos, end_pos)
+
+
+class RecursionError(Error):
+    def __init__(
+        self,
+        error_message: str,
+        start_pos: Position,
+        end_pos: Position | None = None,
+    ):
+        super().__init__("RecursionError", error_message, start_pos, end_pos)
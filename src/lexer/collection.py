@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Fewer garbage collections while many objects are allocated at once (tokens, nodes)"""
+
+# Global Python imports
+import gc
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# While in `fewer_collections`. Measured on 20k lines with a tree of them alive: lexing 10.4s
+# with the default thresholds, 2.4s with these, 2.1s without collecting at all; loading a
+# cached tree 13.9s, 2.3s and 1.6s.
+THRESHOLD = (100_000, 50, 100)
+
+_lock = threading.Lock()
+_depth = 0  # runs of `fewer_collections` in progress, in all threads
+_previous_threshold = gc.get_threshold()
+
+
+@contextmanager
+def fewer_collections() -> Iterator[None]:
+    """Raises the thresholds of the garbage collector, which are global: the objects still get
+    collected, in this thread and in the others, but in batches. The thresholds are restored
+    when no thread is in it anymore."""
+    global _depth, _previous_threshold
+    with _lock:
+        if not _depth:
+            _previous_threshold = gc.get_threshold()
+            gc.set_threshold(*THRESHOLD)
+        _depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _depth -= 1
+            if not _depth:
+                gc.set_threshold(*_previous_threshold)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+from bisect import bisect_left
+from typing import NamedTuple
+# Huitr API imports
+from src.error.error import SyntaxError
+from src.lexer.lexer import Lexer, scan_into
+from src.lexer.position import MovingPosition, moving
+from src.lexer.source_file import SourceFile
+from src.lexer.token import Token, TokenBuffer
+
+# Size of the first window re-lexed after an edit, it doubles until the tokens are in sync again
+RELEX_WINDOW = 256
+
+
+class Damage(NamedTuple):
+    """The new tokens[first:new_end] replaced the `removed` tokens"""
+    first: int
+    new_end: int
+    removed: list[Token]
+
+
+def _start(token: Token) -> int:
+    return token.start_pos.index
+
+
+def _moving(tokens: list[Token]):
+    for token in tokens:
+        moving(token.start_pos)
+        moving(token.end_pos)
+
+
+def relex(
+    source_file: SourceFile,
+    tokens: list[Token],
+    offset: int,
+    deleted: int,
+    inserted: str,
+) -> tuple[list[Token], Damage, None] | tuple[list[Token], None, SyntaxError]:
+    """Replaces `deleted` chars at `offset` by `inserted` in source_file, and updates its
+    tokens by only re-lexing from the last token before the edit, until a new token starts
+    where an old one did.
+
+    source_file and `tokens` are edited in place, and returned. The positions of the tokens
+    are MovingPositions, which move with the text when they are next read, so the work done
+    does not depend on what comes after the edit. Only the first edit of the tokens goes
+    through all of them, to turn their positions into MovingPositions. If `tokens` is empty,
+    everything is lexed again.
+    """
+    if not tokens:
+        source_file.replace(offset, deleted, inserted)
+        new_tokens, err = Lexer(source_file).tokenize()
+        if err is not None:
+            return [], None, err
+        _moving(new_tokens)
+        return new_tokens, Damage(0, len(new_tokens), []), None
+    if type(tokens[-1].start_pos) is not MovingPosition:
+        _moving(tokens)
+
+    # The last token before the edit may be continued by it
+    first = bisect_left(tokens, offset, key=_start)
+    if first > 0:
+        first -= 1
+        index = tokens[first].start_pos.index
+    else:
+        index = 0
+    # Old tokens after the edit, the first one starting where a new token does is kept, with the next ones
+    old = bisect_left(tokens, offset + deleted, lo=first, key=_start)
+
+    source_file.replace(offset, deleted, inserted)
+    edit_end = offset + len(inserted)
+    source = source_file.source
+
+    new_tokens: list[Token] = []
+    window_end = edit_end + RELEX_WINDOW
+    in_sync = False
+    while not in_sync:
+        at_eof = window_end >= len(source)
+        buffer = TokenBuffer(source_file)
+        if at_eof:
+            index, err, needs_more = scan_into(buffer, source, 0, index, True)
+        else:
+            index, err, needs_more = scan_into(buffer, source[index:window_end], index, index, False)
+        if err is not None:
+            return [], None, err
+
+        for token in buffer.tokens():
+            start = token.start_pos.index
+            if start >= edit_end:
+                while old < len(tokens) and tokens[old].start_pos.index < start:
+                    old += 1
+                if old < len(tokens) and tokens[old].start_pos.index == start:
+                    in_sync = True
+                    break
+            new_tokens.append(token)
+        else:
+            if not needs_more:
+                old = len(tokens)
+                break
+        window_end = index + 2 * (window_end - index)
+
+    # Keeps the old tokens that were lexed again without any change
+    unchanged = 0
+    while (
+        unchanged < len(new_tokens)
+        and first + unchanged < old
+        and new_tokens[unchanged] == tokens[first + unchanged]
+    ):
+        unchanged += 1
+    first += unchanged
+    del new_tokens[:unchanged]
+
+    _moving(new_tokens)
+    removed = tokens[first:old]
+    tokens[first:old] = new_tokens
+    return tokens, Damage(first, first + len(new_tokens), removed), None
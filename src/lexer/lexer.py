@@ -8,12 +8,17 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 # Global Python imports
+import os
+import re
 import string
+from typing import Iterable, Iterator, TextIO
 
 # Huitr API imports
 from src.error.error import SyntaxError
+from src.lexer.collection import fewer_collections
 from src.lexer.position import Position
-from src.lexer.token import Token
+from src.lexer.source_file import Buffer, SourceFile
+from src.lexer.token import Token, TokenBuffer, TokenKind, TOKEN_KIND_NAMES
 
 DIGITS = "0123456789"
 ALLOWED_CHARS_IN_INT = "_"
@@ -27,29 +32,93 @@ STRING_DELIMITERS = {
     "«": "»",
 }
 
-TOKEN_TYPES = [
-    "LPAREN",
-    "RPAREN",
-    "LSQUARE",
-    "RSQUARE",
-    "CHAINOP",  # >
-    "COMMA",
-    "SEMICOLON",
-    "STRING",
-    "INT",
-    "FLOAT",
-    "IDENTIFIER",
-    "NAMESP",  # ::
-    "EOF"
-]
+TOKEN_TYPES = frozenset(TOKEN_KIND_NAMES)
 
 WHITESPACES = " \n\N{NBSP}\N{NNBSP}\t"
 
+SINGLE_CHAR_TOKENS = {
+    "(": "LPAREN",
+    ")": "RPAREN",
+    "[": "LSQUARE",
+    "]": "RSQUARE",
+    ">": "CHAINOP",
+    ",": "COMMA",
+    ";": "SEMICOLON",
+}
+SINGLE_CHAR_KINDS = {char: int(TokenKind[token_type]) for char, token_type in SINGLE_CHAR_TOKENS.items()}
+_SINGLE_CHAR_BYTE_KINDS = {char.encode(): kind for char, kind in SINGLE_CHAR_KINDS.items()}
+# Plain ints, looking up enum members is slow in the scanning loop
+_STRING, _INT, _FLOAT, _IDENTIFIER, _NAMESP, _EOF = map(
+    int, (TokenKind.STRING, TokenKind.INT, TokenKind.FLOAT, TokenKind.IDENTIFIER, TokenKind.NAMESP, TokenKind.EOF)
+)
+
+CHUNK_SIZE = 1 << 16
+# Tokens scanned at a time when they are yielded one by one, so only that many are kept
+BATCH_SIZE = 1 << 12
+
+# "char" is the reference engine, "regex" scans the source with TOKEN_REGEX. The regex engine
+# is about 3x faster, and tokenize_compact about 6x (python -m benchmarks.bench_lexer): not the
+# 10x that was aimed at, most of the time goes to building the Token objects.
+LEXER_ENGINES = ["regex", "char"]
+
+
+def _token_regex(utf8: bool) -> re.Pattern:
+    """Builds the regex matching the whitespaces and the token at the start of the string,
+    for str or for UTF-8 bytes. A bytes regex matches non-ASCII chars byte by byte."""
+    def one_of(chars: Iterable[str]) -> str:
+        if utf8:  # each latin-1 char of the pattern is one byte of the bytes pattern
+            chars = (char.encode("utf-8").decode("latin-1") for char in chars)
+        return f"(?:{'|'.join(map(re.escape, chars))})"
+
+    def delimited(opening: str, closing: str) -> str:
+        if utf8 and len(closing.encode("utf-8")) > 1:
+            return f"{one_of(opening)}(?s:.*?){one_of(closing)}"
+        return f"{one_of(opening)}[^{re.escape(closing)}]*{re.escape(closing)}"
+
+    any_char = r"[\x00-\x7f]|[\xc0-\xff][\x80-\xbf]*" if utf8 else "(?s:.)"
+    pattern = (
+        f"{one_of(WHITESPACES)}*+(?:"
+        f"(?P<SINGLE_CHAR>[{re.escape(''.join(SINGLE_CHAR_TOKENS))}])"
+        f"|(?P<IDENTIFIER>[{IDENTIFIERS_LEGAL_CHARS}][{IDENTIFIERS_LEGAL_CHARS}{DIGITS}]*)"
+        f"|(?P<NUMBER>[{DIGITS}](?:[{DIGITS}{ALLOWED_CHARS_IN_INT}.]|[eE]-?)*)"
+        f"|(?P<STRING>{'|'.join(delimited(o, c) for o, c in STRING_DELIMITERS.items())})"
+        f"|(?P<UNCLOSED_STRING>{one_of(STRING_DELIMITERS)})"
+        f"|(?P<NAMESP>::)"
+        f"|(?P<MULTILINE_COMMENT>\\.(?=\\.)(?s:.*?)\\.\\.)"  # the second dot may also be the first closing one
+        f"|(?P<UNCLOSED_COMMENT>\\.\\.)"
+        f"|(?P<COMMENT>\\.[^\\n]*)"
+        f"|(?P<END>\\Z)"
+        f"|(?P<ERROR>{any_char})"
+        ")"
+    )
+    if utf8:
+        return re.compile(pattern.encode("latin-1"))
+    return re.compile(pattern)
+
+
+TOKEN_REGEX = _token_regex(utf8=False)
+BYTES_TOKEN_REGEX = _token_regex(utf8=True)
+
 
 class Lexer:
-    def __init__(self, source: str, filename: str | None = None) -> None:
-        self.source = source
-        self.cursor_pos = Position(0, 0, 0, filename, self.source)
+    def __init__(
+        self,
+        source: str | Buffer | os.PathLike | SourceFile,
+        filename: str | None = None,
+        engine: str = "regex",
+    ) -> None:
+        """source may be the code, its UTF-8 bytes (bytes, mmap, memoryview...) or the path of
+        a file to map in memory. Bytes are scanned as they are, without decoding them first."""
+        assert engine in LEXER_ENGINES, "Undefined lexer engine"
+        if isinstance(source, os.PathLike):
+            source = SourceFile.from_path(source, filename)
+        elif not isinstance(source, SourceFile):
+            source = SourceFile(source, filename)
+        assert engine == "regex" or not source.is_bytes, "The char engine only reads str sources"
+        self.engine = engine
+        self.source_file = source
+        self.source = source.data
+        self.cursor_pos = Position(0, self.source_file)
 
         self.tokens: list[Token] = []
 
@@ -91,6 +160,13 @@ class Lexer:
         )
 
     def tokenize(self) -> tuple[list[Token], None | SyntaxError]:
+        if self.engine == "regex":
+            with fewer_collections():
+                return self.tokenize_regex()
+        return self.tokenize_chars()
+
+    def tokenize_chars(self) -> tuple[list[Token], None | SyntaxError]:
+        """Reference engine, reads the source one char at a time"""
         while self.current is not None:
             start_pos = self.cursor_pos.copy()
             if self.current in WHITESPACES:
@@ -215,3 +291,222 @@ class Lexer:
 
         self.new_token("EOF")
         return self.tokens, None
+
+    def tokenize_regex(self) -> tuple[list[Token], None | SyntaxError]:
+        """Same tokens and errors as tokenize_chars, but matches whole tokens with TOKEN_REGEX"""
+        tokens = self.tokens
+        tokens.extend(scan(self.source_file, self.cursor_pos.index))
+        if isinstance(tokens[-1], SyntaxError):
+            return [], tokens.pop()
+
+        self.cursor_pos.index = tokens[-1].start_pos.index
+        self.current = None
+        return tokens, None
+
+    def tokenize_compact(self) -> tuple[TokenBuffer, None | SyntaxError]:
+        """Like tokenize_regex, but stores the tokens in a TokenBuffer instead of creating Token objects"""
+        buffer = TokenBuffer(self.source_file)
+        index, err, _ = scan_into(buffer, self.source, 0, self.cursor_pos.index, True)
+        if err is not None:
+            return TokenBuffer(self.source_file), err
+
+        self.cursor_pos.index = index
+        self.current = None
+        return buffer, None
+
+    def stream(self) -> Iterator[Token | SyntaxError]:
+        """Yields the tokens one by one instead of building a list. See `scan`"""
+        return scan(self.source_file, self.cursor_pos.index)
+
+
+def read_chunks(source: str | TextIO | Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    if isinstance(source, str):
+        return iter((source,))
+    if hasattr(source, "read"):
+        return iter(lambda: source.read(chunk_size), "")
+    return iter(source)
+
+
+def stream_tokens(
+    source: str | TextIO | Iterable[str],
+    filename: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Token | SyntaxError]:
+    """Lexes a string, a text file or an iterable of chunks lazily. See `scan`"""
+    return scan(SourceFile("", filename), 0, read_chunks(source, chunk_size))
+
+
+def scan(
+    source_file: SourceFile,
+    start: int = 0,
+    chunks: Iterator[str] | None = None,
+) -> Iterator[Token | SyntaxError]:
+    """Regex engine: yields the tokens of source_file from `start`, EOF included.
+    If the source is invalid, the last item is the SyntaxError instead.
+
+    If `chunks` is given, they are appended to source_file while tokens are requested,
+    and only the part of the source that is not tokenized yet is kept in the scanning window.
+    """
+    at_eof = chunks is None
+    window = source_file.data
+    base = 0  # index of window[0] in the source
+    if not at_eof:
+        window = window[start:]
+        base = start
+
+    index = start
+    while True:
+        buffer = TokenBuffer(source_file)
+        index, err, needs_more = scan_into(buffer, window, base, index, at_eof, BATCH_SIZE)
+        yield from buffer.tokens()
+
+        if err is not None:
+            if not at_eof and "\n" not in window[err.start_pos.index - base :]:
+                # Reads the rest of the line, so that it is shown in the error message
+                for chunk in chunks:  # type: ignore
+                    source_file.append(chunk)
+                    if "\n" in chunk:
+                        break
+            yield err
+            return
+        if not needs_more:
+            return
+        if len(buffer.kinds) == BATCH_SIZE:
+            continue  # the window may have more tokens
+
+        chunk = next(chunks, None)  # type: ignore
+        if chunk is None:
+            at_eof = True
+        else:
+            source_file.append(chunk)
+            window = window[index - base :] + chunk
+            base = index
+
+
+def scan_into(
+    buffer: TokenBuffer,
+    window: str | Buffer,
+    base: int,
+    index: int,
+    at_eof: bool,
+    max_tokens: int = -1,
+) -> tuple[int, SyntaxError | None, bool]:
+    """Appends the tokens found in the window from `index` to the buffer, at most `max_tokens`
+    of them if given. `base` is the index of window[0] in the source, and `at_eof` tells if the
+    window goes to the end of the source. In that case, EOF is appended at the end.
+    The window may be UTF-8 bytes, only the values of the tokens are decoded then.
+
+    Returns the index at which it stopped, the SyntaxError if the source is invalid,
+    and whether it has to be called again to go on, with the window extended if it stopped
+    before `max_tokens`.
+    """
+    source_file = buffer.source_file
+    append_kind = buffer.kinds.append
+    append_value = buffer.values.append
+    append_start = buffer.starts.append
+    append_end = buffer.ends.append
+    window_length = len(window)
+    encoded = not isinstance(window, str)
+    regex = BYTES_TOKEN_REGEX if encoded else TOKEN_REGEX
+    single_char_kinds = _SINGLE_CHAR_BYTE_KINDS if encoded else SINGLE_CHAR_KINDS
+
+    remaining = max_tokens  # tokens that can still be appended, never 0 if negative
+    for m in regex.finditer(window, index - base):  # type: ignore
+        if not remaining:
+            return m.start() + base, None, True
+        remaining -= 1
+        kind = m.lastgroup
+
+        # The token may go on after the end of the window
+        if not at_eof and (m.end() == window_length or kind == "UNCLOSED_STRING" or kind == "UNCLOSED_COMMENT"):
+            return m.start() + base, None, True
+
+        if kind == "SINGLE_CHAR":
+            token_start = m.end() - 1 + base
+            append_kind(single_char_kinds[m.group(kind)])
+            append_value(None)
+            append_start(token_start)
+            append_end(token_start)
+        elif kind == "IDENTIFIER":
+            append_kind(_IDENTIFIER)
+            append_value(m.group(kind).decode() if encoded else m.group(kind))
+            append_start(m.start(kind) + base)
+            append_end(m.end() - 1 + base)
+        elif kind == "NUMBER":
+            token_start = m.start(kind) + base
+            number = m.group(kind).decode().lower() if encoded else m.group(kind).lower()
+            if "." in number:
+                err = _check_number(number, token_start, source_file)
+                if err is not None:
+                    return token_start, err, False
+                append_kind(_FLOAT)
+                append_value(float(number))
+            elif "e" in number:
+                append_kind(_FLOAT)
+                append_value(float(number))
+            else:
+                append_kind(_INT)
+                append_value(int(number))
+            append_start(token_start)
+            append_end(m.end() - 1 + base)
+        elif kind == "STRING":
+            text = m.group(kind)
+            token_end = m.end() - 1 + base
+            if encoded:  # the closing delimiter may be several bytes long
+                text = text.decode()
+                token_end = source_file.previous_char_index(token_end + 1)
+            append_kind(_STRING)
+            append_value(text[1:-1])
+            append_start(m.start(kind) + base)
+            append_end(token_end)
+        elif kind == "NAMESP":
+            append_kind(_NAMESP)
+            append_value(None)
+            append_start(m.start(kind) + base)
+            append_end(m.end() - 1 + base)
+        elif kind == "UNCLOSED_COMMENT":
+            # Runs past the implicit final newline like in tokenize_chars
+            index = source_file.length + 3
+            buffer.append(_EOF, None, index, index)
+            return index, None, False
+        elif kind == "END":
+            index = source_file.length + 1  # after the implicit final newline
+            buffer.append(_EOF, None, index, index)
+            return index, None, False
+        elif kind == "UNCLOSED_STRING":
+            char = m.group(kind).decode() if encoded else m.group(kind)
+            last_char = source_file.previous_char_index(source_file.length)
+            return m.start(kind) + base, SyntaxError(f"`{char}` was never closed", Position(last_char, source_file)), False
+        elif kind == "ERROR":
+            token_start = m.start(kind) + base
+            char = m.group(kind).decode("utf-8", "replace") if encoded else m.group(kind)
+            if char == "»":
+                err = SyntaxError("`»` was never opened", Position(token_start, source_file))
+            elif char == ":":
+                err = SyntaxError("incorrect use of `:`", Position(token_start, source_file))
+            else:
+                err = SyntaxError(f"unexpected char U+{hex(ord(char))[2:].upper()}", Position(token_start, source_file))
+            return token_start, err, False
+        else:  # a comment, which is not a token
+            remaining += 1
+
+    raise AssertionError("TOKEN_REGEX always matches the end of the window")
+
+
+def _check_number(number: str, start: int, source_file: SourceFile) -> SyntaxError | None:
+    """Finds the misplaced dot in a number, if any"""
+    seen_dot = False
+    seen_e = False
+    for i, char in enumerate(number):
+        if char == "e":
+            seen_e = True
+        elif char == ".":
+            if seen_dot:
+                return SyntaxError("a number can not have more than one dot", Position(start + i, source_file))
+            if seen_e:
+                return SyntaxError(
+                    "exponent of scientific notation should be an integer, not float",
+                    Position(start + i, source_file)
+                )
+            seen_dot = True
+    return None
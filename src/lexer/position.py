@@ -7,89 +7,44 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# Huitr API imports
+from src.lexer.source_file import SourceFile
+
 
 class Position:
-    def __init__(
-        self,
-        line_number: int,
-        index: int,
-        column: int,
-        filename: str | None = None,
-        file_source: str | None = None,
-        current_char: str | None = None,
-    ):
-        self.line_number = line_number
+    """An offset in a SourceFile. Line and column are only computed when asked for."""
+    __slots__ = ("index", "source_file")
+
+    def __init__(self, index: int, source_file: SourceFile):
         self.index = index
-        self.column = column
-        self.filename = filename if filename is not None else "<undefined>"
-        self.file_source = file_source
-        self.end_of_line = False
-
-        current = current_char if current_char is not None else self.get_char_at_pos()
-
-        if current == "\n":
-            self.end_of_line = True
-
-    def set_position(
-        self,
-        line_number: int | None = None,
-        index: int | None = None,
-        column: int | None = None,
-        filename: str | None = None,
-        file_source: str | None = None,
-        current_char: str | None = None,
-    ) -> str | None:
-        if line_number is not None:
-            self.line_number = line_number
-        if index is not None:
-            self.index = index
-        if column is not None:
-            self.column = column
-        if filename is not None:
-            self.filename = filename
-        if file_source is not None:
-            self.file_source = file_source
-
-        current = current_char if current_char is not None else self.get_char_at_pos()
-
-        if current == "\n":
-            self.end_of_line = True
-
-        return current
+        self.source_file = source_file
 
-    def get_char_at_pos(self):
-        line = self.get_line()
-        if line is None:
-            return None
-        return line[self.column] if len(line) > self.column else None
+    @property
+    def line_number(self) -> int:
+        return self.source_file.line_number_at(self.index)
 
-    def advance(self, n: int = 1, current_char: str | None = None):
-        """Advances the position by n character, return the character it landed at or None if impossible"""
-        current = None
-        for _ in range(n):
-            self.index += 1
-            self.column += 1
+    @property
+    def column(self) -> int:
+        return self.source_file.column_at(self.index)
 
-            if self.end_of_line:  # Last char was \n
-                self.line_number += 1
-                self.column = 0
-                self.end_of_line = False
+    @property
+    def filename(self) -> str:
+        return self.source_file.filename
 
-            current = (
-                current_char if current_char is not None else self.get_char_at_pos()
-            )
-            if current == "\n":  # Previous if will be executed next char
-                self.end_of_line = True
+    @property
+    def file_source(self) -> str:
+        return self.source_file.source
 
-        return current
+    def get_char_at_pos(self):
+        return self.source_file.char_at(self.index)
+
+    def advance(self, n: int = 1):
+        """Advances the position by n character, return the character it landed at or None if impossible"""
+        self.index += n
+        return self.source_file.char_at(self.index)
 
     def get_line(self):
-        if self.file_source is None:
-            return None
-        lines = self.file_source.split("\n")
-        if self.line_number >= len(lines):
-            return None
-        return lines[self.line_number] + "\n"
+        return self.source_file.get_line(self.line_number)
 
     def __repr__(self) -> str:
         return f"[{self.filename}:{self.line_number}:{self.column}]"
@@ -98,18 +53,46 @@ class Position:
         return repr(self)
 
     def copy(self):
-        return Position(
-            self.line_number, self.index, self.column, self.filename, self.file_source
-        )
+        return type(self)(self.index, self.source_file)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Position):
             return False
-        return (
-            self.line_number == other.line_number
-            and self.index == other.index
-            and self.column == other.column
-            and self.filename == other.filename
-            and self.file_source == other.file_source
-            and self.end_of_line == other.end_of_line
-        )
+        return self.index == other.index and (self.source_file is other.source_file or self.source_file == other.source_file)
+
+
+# The slot of Position, where a MovingPosition keeps its index with the edits it takes into account
+_INDEX = Position.index
+
+
+class MovingPosition(Position):
+    """A Position in a source file edited in place (see `SourceFile.replace`), which moves with
+    the text after the edits, but only when its index is read: an edit does not go through
+    all the positions after it. See `moving` to turn a Position into one."""
+    __slots__ = ()
+
+    @property  # type: ignore
+    def index(self) -> int:
+        index, edit_count = _INDEX.__get__(self)
+        source_file = self.source_file
+        if edit_count != source_file.edit_count:
+            for start, end, delta in source_file.edits[edit_count:]:
+                if index >= end:  # after the replaced text, or where it ended
+                    index += delta
+            _INDEX.__set__(self, (index, source_file.edit_count))
+        return index
+
+    @index.setter
+    def index(self, index: int):
+        _INDEX.__set__(self, (index, self.source_file.edit_count))
+
+    def __reduce__(self) -> tuple:
+        return Position, (self.index, self.source_file)
+
+
+def moving(position: Position):
+    """Turns the position into a MovingPosition in place, so everything holding it sees it move"""
+    if type(position) is Position:
+        index = position.index
+        position.__class__ = MovingPosition
+        position.index = index
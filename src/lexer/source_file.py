@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+import mmap
+import os
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+# Encoded sources: bytes, bytearray, mmap, memoryview...
+Buffer = bytes | bytearray | mmap.mmap | memoryview
+
+NEWLINE_REGEX = re.compile("\n")
+NEWLINE_BYTES_REGEX = re.compile(b"\n")
+
+
+class SourceFile:
+    """A source file, built once and shared by every Position pointing into it.
+
+    The lexer behaves as if the file always ended with a newline: the char right
+    after the end of the source is "\\n", and the next index is on a line of its own.
+    A streamed file is built from an empty source, then grown with `append`.
+
+    The source may also be UTF-8 bytes, which are kept as they are (see `data`). Indexes
+    are then byte offsets, and only the slices that are asked for are decoded.
+
+    A source can be edited in place with `replace`, for the incremental lexer and parser.
+    """
+    def __init__(self, source: str | Buffer = "", filename: str | None = None) -> None:
+        self.filename = filename if filename is not None else "<undefined>"
+        self.length = 0
+        self._line_starts: list[int] | None = [0]
+        # (start, end, delta) of each edit: the text from start to end was replaced by a text
+        # delta chars longer, see `MovingPosition`
+        self.edits: list[tuple[int, int, int]] = []
+        self.edit_count = 0
+        self._chunks: list[str] = []
+        self._source = ""
+        self._buffer: Buffer | None = None
+        if isinstance(source, str):
+            self.append(source)
+        else:
+            self._buffer = source
+            self.length = len(source)
+            self.line_starts.extend(m.end() for m in NEWLINE_BYTES_REGEX.finditer(source))
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike, filename: str | None = None) -> "SourceFile":
+        """Maps the file at path in memory, instead of reading it into a str"""
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                buffer: Buffer = b""  # empty files can not be mapped
+            else:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, filename if filename is not None else os.fspath(path))
+
+    def __reduce__(self) -> tuple:
+        # A mapped file can not be pickled, its bytes can
+        data = self.data
+        return SourceFile, (data if isinstance(data, str) else bytes(data), self.filename)
+
+    @property
+    def is_bytes(self) -> bool:
+        return self._buffer is not None
+
+    @property
+    def data(self) -> str | Buffer:
+        """What the lexer scans: the source, or its UTF-8 bytes if it was given as bytes"""
+        if self._buffer is not None:
+            return self._buffer
+        return self.source
+
+    def append(self, chunk: str):
+        """Adds a chunk at the end of the source"""
+        assert self._buffer is None, "can not append to an encoded source"
+        starts = accumulate((len(line) + 1 for line in chunk.split("\n")[:-1]), initial=self.length)
+        next(starts)  # not a line start, or already in the table
+        self.line_starts.extend(starts)
+        self.length += len(chunk)
+        self._chunks.append(chunk)
+
+    def replace(self, offset: int, deleted: int, inserted: str):
+        """Replaces `deleted` chars at `offset` by `inserted`, in place. The positions after them
+        and the line starts are only updated when they are used."""
+        assert self._buffer is None, "can not edit an encoded source"
+        source = self.source
+        self._source = source[:offset] + inserted + source[offset + deleted :]
+        delta = len(inserted) - deleted
+        self.length += delta
+        if delta:
+            self.edits.append((offset, offset + deleted, delta))
+            self.edit_count += 1
+        self._line_starts = None
+
+    @property
+    def line_starts(self) -> list[int]:
+        if self._line_starts is None:  # edited since they were found
+            self._line_starts = [0, *(m.end() for m in NEWLINE_REGEX.finditer(self.source))]
+        return self._line_starts
+
+    @property
+    def source(self) -> str:
+        if self._buffer is not None:
+            return str(self._buffer, "utf-8")
+        if self._chunks:
+            self._source += "".join(self._chunks)
+            self._chunks.clear()
+        return self._source
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_number_at(self, index: int) -> int:
+        if index > self.length:  # after the implicit final newline
+            return self.line_count
+        return bisect_right(self.line_starts, index) - 1
+
+    def column_at(self, index: int) -> int:
+        line_number = self.line_number_at(index)
+        if line_number == self.line_count:
+            return index - self.length - 1
+        if self._buffer is not None:  # in chars, not in bytes
+            return len(self._decode(self.line_starts[line_number], index))
+        return index - self.line_starts[line_number]
+
+    def char_at(self, index: int) -> str | None:
+        if index < self.length:
+            if self._buffer is not None:
+                return self._decode(index, self.next_char_index(index))
+            return self.source[index]
+        if index == self.length:
+            return "\n"  # implicit final newline
+        return None
+
+    def next_char_index(self, index: int) -> int:
+        """Index of the char after the one at index"""
+        if self._buffer is None:
+            return index + 1
+        lead = self._buffer[index]
+        return index + (1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4)
+
+    def previous_char_index(self, index: int) -> int:
+        """Index of the char before the one at index"""
+        index -= 1
+        if self._buffer is not None:
+            while index > 0 and 0x80 <= self._buffer[index] < 0xC0:  # UTF-8 continuation byte
+                index -= 1
+        return index
+
+    def get_line(self, line_number: int) -> str | None:
+        if line_number >= self.line_count:
+            return None
+        start = self.line_starts[line_number]
+        end = self.length if line_number + 1 == self.line_count else self.line_starts[line_number + 1] - 1
+        if self._buffer is not None:
+            return self._decode(start, end) + "\n"
+        return self.source[start:end] + "\n"
+
+    def _decode(self, start: int, end: int) -> str:
+        return str(self._buffer[start:end], "utf-8", "replace")  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<SourceFile {self.filename}>"
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, SourceFile):
+            return False
+        if self.filename != other.filename:
+            return False
+        if self.is_bytes and other.is_bytes:
+            return self.length == other.length and self.data[:] == other.data[:]  # type: ignore
+        return self.source == other.source
+
+    def __hash__(self) -> int:
+        return hash(self.filename)
@@ -2,27 +2,48 @@
 # -*- coding:utf-8 -*-
 
 # Huitr - a purely functional programming language.
-# Copyright (C) 2024  3fxcf9, jd-develop
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# Global Python imports
+from array import array
+from enum import IntEnum
+from typing import Iterator
 # Huitr API imports
 from src.lexer.position import Position
+from src.lexer.source_file import SourceFile
 
 
-class Token:
-    def __init__(
-        self,
-        token_type: str,
-        value: str | int | float | None,
-        start_pos: Position,
-        end_pos: Position,
-    ):
-        self.type = token_type
-        self.value = value
-        self.start_pos = start_pos
-        self.end_pos = end_pos
+class TokenKind(IntEnum):
+    LPAREN = 0
+    RPAREN = 1
+    LSQUARE = 2
+    RSQUARE = 3
+    CHAINOP = 4  # >
+    COMMA = 5
+    SEMICOLON = 6
+    STRING = 7
+    INT = 8
+    FLOAT = 9
+    IDENTIFIER = 10
+    NAMESP = 11  # ::
+    EOF = 12
+
+
+# Token.type of each TokenKind, indexed by kind
+TOKEN_KIND_NAMES = tuple(kind.name for kind in TokenKind)
+
+
+class BaseToken:
+    """Methods shared by Token and CompactToken, the parser accepts both"""
+    __slots__ = ()
+
+    type: str
+    value: str | int | float | None
+    start_pos: Position
+    end_pos: Position
 
     def __repr__(self) -> str:
         if self.value is not None:
@@ -33,18 +54,108 @@ class Token:
 
     def __str__(self):
         return repr(self)
-    
+
     def is_eof(self):
         return self.type == "EOF"
-    
+
     def matches(self, type: str, value: str | int | float | None):
         return self.type == type and self.value == value
-    
+
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Token):
+        if not isinstance(other, BaseToken):
             return False
         return (
             self.start_pos == other.start_pos and
             self.end_pos == other.end_pos and
             self.matches(other.type, other.value)
         )
+
+
+class Token(BaseToken):
+    __slots__ = ("type", "value", "start_pos", "end_pos")
+
+    def __init__(
+        self,
+        token_type: str,
+        value: str | int | float | None,
+        start_pos: Position,
+        end_pos: Position,
+    ):
+        self.type = token_type
+        self.value = value
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+
+
+class CompactToken(BaseToken):
+    """Token storing its kind and offsets as ints, positions are built when asked for"""
+    __slots__ = ("kind", "value", "start", "end", "source_file")
+
+    def __init__(
+        self,
+        kind: int,
+        value: str | int | float | None,
+        start: int,
+        end: int,
+        source_file: SourceFile,
+    ):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.source_file = source_file
+
+    @property
+    def type(self) -> str:  # type: ignore
+        return TOKEN_KIND_NAMES[self.kind]
+
+    @property
+    def start_pos(self) -> Position:  # type: ignore
+        return Position(self.start, self.source_file)
+
+    @property
+    def end_pos(self) -> Position:  # type: ignore
+        return Position(self.end, self.source_file)
+
+    def is_eof(self):
+        return self.kind == TokenKind.EOF
+
+
+class TokenBuffer:
+    """Struct-of-arrays list of tokens: kinds and offsets are stored in arrays, values in a list.
+    Indexing or iterating over it gives CompactTokens.
+    """
+    __slots__ = ("source_file", "kinds", "starts", "ends", "values")
+
+    def __init__(self, source_file: SourceFile):
+        self.source_file = source_file
+        self.kinds = array("B")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.values: list[str | int | float | None] = []
+
+    def append(self, kind: int, value: str | int | float | None, start: int, end: int):
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> CompactToken:
+        return CompactToken(
+            self.kinds[index], self.values[index], self.starts[index], self.ends[index], self.source_file
+        )
+
+    def __iter__(self) -> Iterator[CompactToken]:
+        source_file = self.source_file
+        for kind, value, start, end in zip(self.kinds, self.values, self.starts, self.ends):
+            yield CompactToken(kind, value, start, end, source_file)
+
+    def tokens(self) -> Iterator[Token]:
+        """Iterates over the buffer as full Tokens"""
+        source_file = self.source_file
+        names = TOKEN_KIND_NAMES
+        for kind, value, start, end in zip(self.kinds, self.values, self.starts, self.ends):
+            yield Token(names[kind], value, Position(start, source_file), Position(end, source_file))
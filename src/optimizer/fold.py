@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Constant folding: chains of pure builtins called on literals are run before the program.
+
+In `1, 2 > add > neg > x`, `1, 2 > add > neg` becomes the literal -3, which spans the positions
+of the chain it replaces. A call which would fail is left as it is, so the error is reported
+when the program runs, where it was written. Builtins can not be rebound, so a builtin name
+in a chain is always the builtin.
+
+Functions are folded even if they are never called, so calls which could take long are left to
+the program too: their arguments are checked before running them (see `too_costly`).
+"""
+
+# Global Python imports
+from typing import Any
+# Huitr API imports
+from src.lexer.position import Position
+from src.lexer.token import Token
+from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, IdentifierNode
+from src.parser.nodes import FuncDefNode, UnitNode
+from src.parser.visitor import Visitor, walk
+from src.runtime.builtins import BUILTINS
+from src.runtime.value import Value
+from src.runtime.values import Int, Float, String, List, LazyList, Unit, UNIT, int_value
+from src.runtime.vm import VM, Failure
+
+# Bigger results are left to the program: folding must not make the tree (and the code) bigger
+MAX_STRING_LENGTH = 1024
+MAX_INT_BITS = 1024
+# Longer ranges are left to the program: the next stages of the chain would go through them
+MAX_RANGE_LENGTH = 1 << 16
+
+LITERAL_NODES = (IntNode, FloatNode, StringNode, UnitNode)
+
+
+def is_literal(node: Node) -> bool:
+    """A literal, or a list of literals"""
+    nodes = [node]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, ListNode):
+            nodes += node.list
+        elif not isinstance(node, LITERAL_NODES):
+            return False
+    return True
+
+
+def pure_builtin(node: Node) -> str | None:
+    """Name of the builtin the node refers to, if it is a pure one"""
+    if not isinstance(node, IdentifierNode) or len(node.identifiers_list) != 1:
+        return None
+    name = node.identifiers_list[0].value
+    builtin = BUILTINS.get(name)  # type: ignore
+    return name if builtin is not None and builtin.pure else None  # type: ignore
+
+
+def too_costly(name: str, value: Value) -> bool:
+    """Whether calling the builtin with value could take long: the result of `pow` would be an
+    int too big to fold, or the range too long"""
+    if name == "pow" and type(value) is List and len(value.value) == 2:
+        base, exponent = value.value
+        if type(base) is Int and type(exponent) is Int:
+            return exponent.value * max(base.value.bit_length(), 1) > MAX_INT_BITS
+    elif name == "range":
+        bounds = value.value if type(value) is List else [value]
+        if 1 <= len(bounds) <= 3 and all(type(bound) is Int for bound in bounds) and (len(bounds) < 3 or bounds[2].value):
+            return len(range(*(bound.value for bound in bounds))) > MAX_RANGE_LENGTH  # type: ignore
+    return False
+
+
+def node_value(node: Node) -> Value:
+    """The value of a literal node (see `is_literal`)"""
+    if isinstance(node, IntNode):
+        return int_value(node.int_token.value)  # type: ignore
+    if isinstance(node, FloatNode):
+        return Float(node.float_token.value)  # type: ignore
+    if isinstance(node, StringNode):
+        return String(node.string_token.value)  # type: ignore
+    if isinstance(node, UnitNode):
+        return UNIT
+    assert isinstance(node, ListNode)
+    return List([node_value(item) for item in node.list])
+
+
+def value_node(value: Value, pos_start: Position, pos_end: Position) -> Node | None:
+    """A literal node for the value, at the given positions, None if there is none"""
+    if isinstance(value, Int):
+        if value.value.bit_length() > MAX_INT_BITS:
+            return None
+        return IntNode(Token("INT", value.value, pos_start, pos_end))
+    if isinstance(value, Float):
+        return FloatNode(Token("FLOAT", value.value, pos_start, pos_end))
+    if isinstance(value, String):
+        if len(value.value) > MAX_STRING_LENGTH:
+            return None
+        return StringNode(Token("STRING", value.value, pos_start, pos_end))
+    if isinstance(value, Unit):
+        return UnitNode(pos_start, pos_end)
+    if isinstance(value, LazyList):
+        return None  # it may be huge, or infinite
+    if isinstance(value, List):
+        items = []
+        for item in value.value:
+            item_node = value_node(item, pos_start, pos_end)
+            if item_node is None:
+                return None
+            items.append(item_node)
+        return ListNode(items, pos_start, pos_end)
+    return None  # functions and dicts
+
+
+def size(node: Node) -> int:
+    return sum(1 for _ in walk(node))
+
+
+def fold(tree: Node) -> tuple[Node, int]:
+    """Returns the folded tree, and how many nodes less it has. The tree is not modified."""
+    folder = _Folder()
+    return folder.visit(tree), folder.eliminated
+
+
+class _Folder(Visitor):
+    """Rebuilds the nodes whose children were folded, folds chains"""
+    def __init__(self):
+        super().__init__()
+        self.eliminated = 0
+        self.vm = VM(lazy=True)  # `1000000000 > range` is not built
+
+    def visit_ChainNode(self, node: ChainNode, chain: list[Node]) -> Node:
+        if len(chain) == 1 and is_literal(chain[0]):  # in parentheses
+            self.eliminated += 1
+            return chain[0]
+        # The longest start of the chain which is a literal piped into pure builtins
+        end = 1
+        while end < len(chain) and pure_builtin(chain[end]) is not None:
+            end += 1
+        if end > 1 and is_literal(chain[0]):
+            folded = self.fold_calls(chain[:end], end == len(chain))
+            if folded is not None:
+                folded_node, stages = folded
+                chain = [folded_node] + chain[stages:]
+                if len(chain) == 1:
+                    return folded_node
+        if _same(chain, node.chain):
+            return node
+        return ChainNode(chain, node.pos_start, node.pos_end)
+
+    def fold_calls(self, chain: list[Node], whole: bool) -> tuple[Node, int] | None:
+        """Runs the calls of the start of a chain (the whole chain if `whole`). Returns the literal
+        node of the result of the most stages which could be run, and the number of nodes of the
+        chain it replaces, or None if none could."""
+        pos_start = chain[0].pos_start
+        value = node_value(chain[0])
+        best = None
+        for stage in range(1, len(chain)):
+            name = chain[stage].identifiers_list[0].value  # type: ignore
+            if too_costly(name, value):  # type: ignore
+                break
+            builtin = BUILTINS[name]  # type: ignore
+            try:
+                value = self.vm.box(builtin.function(self.vm, value))
+            except Failure:
+                break
+            folded_node = value_node(value, pos_start, chain[stage].pos_end)
+            if folded_node is None:
+                continue
+            replaced = sum(size(node) for node in chain[:stage + 1])
+            if whole and stage + 1 == len(chain):
+                replaced += 1  # the chain itself, when it is replaced as a whole
+            if size(folded_node) < replaced:
+                best = folded_node, stage + 1, replaced - size(folded_node)
+        if best is None:
+            return None
+        folded_node, stages, eliminated = best
+        self.eliminated += eliminated
+        return folded_node, stages
+
+    def visit_ListNode(self, node: ListNode, items: list[Node]) -> Node:
+        return node if _same(items, node.list) else ListNode(items, node.pos_start, node.pos_end)
+
+    def visit_FuncDefNode(self, node: FuncDefNode, body: list[Node]) -> Node:
+        return node if body[0] is node.body_node else FuncDefNode(body[0], node.pos_start, node.pos_end)
+
+    def generic_visit(self, node: Node, children_values: list[Any]) -> Node:
+        return node
+
+
+def _same(nodes: list[Node], other: list[Node]) -> bool:
+    return len(nodes) == len(other) and all(node is other_node for node, other_node in zip(nodes, other))
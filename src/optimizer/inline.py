@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Inlining: calls of small functions are replaced by their bodies.
+
+- A function applied where it is written is beta-reduced: `x > [_, 1 > add]` becomes
+  `x, 1 > add`. The argument replaces `_` in the body.
+- A call of a function bound to a name, `x > inc` after `[_, 1 > add] > inc`, is replaced by
+  the body when the function is small (see `DEFAULT_MAX_SIZE`) and does not call itself.
+- Statements whose value is not used and which call nothing are dropped, and so are the
+  bindings of such values to names which are not used anymore.
+
+Only bodies of one statement, which binds nothing, are inlined. The argument is copied where
+`_` is used when it is a literal or a name, otherwise `_` must be used once, and be the first
+thing the body evaluates, so everything still runs in the same order.
+"""
+
+# Global Python imports
+from typing import Callable, NamedTuple
+# Huitr API imports
+from src.lexer.token import Token
+from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, NoNode, IdentifierNode
+from src.parser.nodes import FuncDefNode, UnitNode
+from src.parser.visitor import children, walk
+from src.runtime.builtins import BUILTINS
+from src.runtime.compiler import argument_depth, binding_name, scope_bindings, statements_of
+
+# Functions with more nodes are not inlined
+DEFAULT_MAX_SIZE = 24
+
+
+class InlineReport(NamedTuple):
+    inlined: int  # calls of named functions replaced by their body
+    reduced: int  # functions applied where they are written, replaced by their body
+    dropped: int  # statements removed
+
+
+class _Function(NamedTuple):
+    """A function bound to a name, which can be inlined"""
+    node: FuncDefNode
+    depth: int  # of the scope it is bound in
+    unbound_names: set[str]  # not bound where it is written, so they must not be bound at the call either
+
+
+class _Scope:
+    __slots__ = ("depth", "names", "bindings", "functions", "droppable")
+
+    def __init__(self, depth: int, bindings: list[str | None]):
+        self.depth = depth  # number of functions around, 0 for the program
+        self.bindings = bindings  # name bound by each statement
+        self.names = {name for name in bindings if name is not None}
+        self.functions: dict[str, _Function] = {}
+        self.droppable: list[bool] = []  # whether each statement can be dropped if its value is not used
+
+
+def inline(tree: Node, max_size: int = DEFAULT_MAX_SIZE) -> tuple[Node, InlineReport]:
+    """Returns the tree with small functions inlined (none with a `max_size` of 0). The tree is not modified."""
+    inliner = _Inliner(max_size)
+    tree = inliner.run(tree)
+    return tree, InlineReport(inliner.inlined, inliner.reduced, inliner.dropped)
+
+
+def size(node: Node) -> int:
+    return sum(1 for _ in walk(node))
+
+
+def _rebuild(node: Node, new_children: list[Node]) -> Node:
+    """The node with other children, the node itself when they are the same"""
+    if all(child is new_child for child, new_child in zip(children(node), new_children)):
+        return node
+    if isinstance(node, ChainNode):
+        return ChainNode(new_children, node.pos_start, node.pos_end)
+    if isinstance(node, ListNode):
+        return ListNode(new_children, node.pos_start, node.pos_end)
+    assert isinstance(node, FuncDefNode)
+    return FuncDefNode(new_children[0], node.pos_start, node.pos_end)
+
+
+def _arguments(node: Node) -> list[tuple[IdentifierNode, int, int]]:
+    """The `_`, `__`... in the tree, with how many functions out they refer to, and how many
+    functions of the tree they are in"""
+    found = []
+    stack: list[tuple[Node, int]] = [(node, 0)]
+    while stack:
+        node, level = stack.pop()
+        if isinstance(node, IdentifierNode) and len(node.identifiers_list) == 1:
+            depth = argument_depth(str(node.identifiers_list[0].value))
+            if depth is not None:
+                found.append((node, depth, level))
+        inner = level + 1 if isinstance(node, FuncDefNode) else level
+        stack.extend((child, inner) for child in children(node))
+    return found
+
+
+def _replace_arguments(node: Node, replace: Callable[[IdentifierNode, int, int], Node]) -> Node:
+    """Rebuilds the tree with `replace(identifier, depth, level)` for each `_`, `__`... (see `_arguments`)"""
+    order = []
+    stack: list[tuple[Node, int]] = [(node, 0)]
+    while stack:
+        node, level = stack.pop()
+        node_children = children(node)
+        order.append((node, level, len(node_children)))
+        inner = level + 1 if isinstance(node, FuncDefNode) else level
+        stack.extend((child, inner) for child in node_children)
+
+    values: list[Node] = []
+    for node, level, count in reversed(order):
+        if count:
+            new_children = values[-count:]
+            del values[-count:]
+            values.append(_rebuild(node, new_children))
+            continue
+        depth = None
+        if isinstance(node, IdentifierNode) and len(node.identifiers_list) == 1:
+            depth = argument_depth(str(node.identifiers_list[0].value))
+        values.append(node if depth is None else replace(node, depth, level))  # type: ignore
+    return values[0]
+
+
+def _argument(node: IdentifierNode, depth: int) -> IdentifierNode:
+    """`_` (depth 0), `__`... at the positions of node"""
+    return IdentifierNode([Token("IDENTIFIER", "_" * (depth + 1), node.pos_start, node.pos_end)])
+
+
+def _shift(node: Node, levels: int) -> Node:
+    """The expression, to be put in `levels` more functions"""
+    if not levels:
+        return node
+    return _replace_arguments(
+        node, lambda identifier, depth, level: _argument(identifier, depth + levels) if depth >= level else identifier
+    )
+
+
+def _first_evaluated(node: Node) -> Node:
+    while True:
+        if isinstance(node, ChainNode):
+            node = node.chain[0]
+        elif isinstance(node, ListNode) and node.list:
+            node = node.list[0]
+        else:
+            return node
+
+
+def _head(chain: list[Node]) -> list[Node]:
+    """`(a > f) > g` is `a > f > g`"""
+    while isinstance(chain[0], ChainNode):
+        chain = chain[0].chain + chain[1:]
+    return chain
+
+
+class _Inliner:
+    # Tasks, on a stack: trees can be nested deeper than the recursion limit
+    _NODE = 0  # optimize the node
+    _BODY = 1  # optimize the statements of a scope
+    _STATEMENT = 2  # a statement of the scope is optimized
+    _END_NODE = 3  # the children of the node are optimized
+    _END_BODY = 4  # the statements of the scope are optimized
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.scopes: list[_Scope] = []
+        # Names bound in the scopes, and the ones bound by the statements before the one being
+        # optimized (a name is bound in one scope at most, the scopes in it call it)
+        self.visible: set[str] = set()
+        self.bound: set[str] = set()
+        self.inlined = self.reduced = self.dropped = 0
+
+    def run(self, tree: Node) -> Node:
+        tasks: list[tuple[int, Node | int, int]] = [(self._BODY, tree, 0)]
+        values: list[Node] = []
+        while tasks:
+            kind, node, count = tasks.pop()
+            if kind == self._NODE:
+                assert isinstance(node, Node)
+                if isinstance(node, FuncDefNode):
+                    tasks.append((self._END_NODE, node, 1))
+                    tasks.append((self._BODY, node.body_node, 0))
+                else:
+                    node_children = children(node)
+                    tasks.append((self._END_NODE, node, len(node_children)))
+                    tasks.extend((self._NODE, child, 0) for child in reversed(node_children))
+            elif kind == self._BODY:
+                assert isinstance(node, Node)
+                statements = statements_of(node)
+                scope = _Scope(len(self.scopes), scope_bindings(statements, self.visible))
+                self.scopes.append(scope)
+                self.visible |= scope.names
+                tasks.append((self._END_BODY, node, len(statements)))
+                for index in reversed(range(len(statements))):
+                    tasks.append((self._STATEMENT, index, 0))
+                    tasks.append((self._NODE, statements[index], 0))
+            elif kind == self._STATEMENT:
+                assert isinstance(node, int)
+                self.statement(node, values[-1])
+            else:
+                assert isinstance(node, Node)
+                if count:
+                    new_children = values[-count:]
+                    del values[-count:]
+                else:
+                    new_children = []
+                if kind == self._END_BODY:
+                    values.append(self.end_body(node, new_children))
+                elif isinstance(node, ChainNode):
+                    values.append(self.chain(node, new_children))
+                elif count:
+                    values.append(_rebuild(node, new_children))
+                else:
+                    values.append(node)
+        return values[0]
+
+    def function(self, name: str) -> _Function | None:
+        for scope in reversed(self.scopes):
+            if name in scope.names:
+                return scope.functions.get(name)
+        return None
+
+    def statement(self, index: int, statement: Node):
+        """Remembers whether the statement can be dropped, and the function it binds to a name
+        if it can be inlined"""
+        scope = self.scopes[-1]
+        name = scope.bindings[index]
+        if name is None:
+            scope.droppable.append(self.pure(statement))
+            return
+        # Checked before the name is bound: `x > y` can not be dropped if x is bound after it
+        scope.droppable.append(len(statement.chain) == 2 and self.pure(statement.chain[0]))  # type: ignore
+        self.bound.add(name)
+        if not isinstance(statement, ChainNode) or len(statement.chain) != 2:
+            return
+        function = statement.chain[0]
+        if not isinstance(function, FuncDefNode) or size(function) > self.max_size:
+            return
+        # Names bound in the functions in it, and names bound nowhere (an error where it is written)
+        names = set()
+        for node in walk(function):
+            if isinstance(node, IdentifierNode) and len(node.identifiers_list) == 1:
+                used = str(node.identifiers_list[0].value)
+                if used == name:
+                    return  # it calls itself
+                if argument_depth(used) is None and used not in BUILTINS:
+                    names.add(used)
+            if isinstance(node, FuncDefNode):
+                names.update(binding_name(statement) for statement in statements_of(node.body_node))
+        names.discard(None)  # type: ignore
+        scope.functions[name] = _Function(function, scope.depth, names - self.visible)
+
+    def chain(self, node: ChainNode, chain: list[Node]) -> Node:
+        # The stages already gone through, with the bodies of the functions inlined in them. The
+        # body starts with its argument (`done`) most of the time, then the rest of it is appended.
+        done = [chain[0]]
+        for stage in chain[1:]:
+            function = extra_depth = None
+            if isinstance(stage, FuncDefNode):
+                function, extra_depth = stage, 0
+            elif self.max_size and isinstance(stage, IdentifierNode) and len(stage.identifiers_list) == 1:
+                named = self.function(str(stage.identifiers_list[0].value))
+                if named is not None and named.unbound_names.isdisjoint(self.visible):
+                    function, extra_depth = named.node, self.scopes[-1].depth - named.depth
+            if function is None:
+                done.append(stage)
+                continue
+            # Not copied: if it is used, it is used once, first, and taken apart below
+            argument = done[0] if len(done) == 1 else ChainNode(done, done[0].pos_start, done[-1].pos_end)
+            body = self.beta_reduce(function, argument, extra_depth)  # type: ignore
+            if body is None:
+                done.append(stage)
+                continue
+            if function is stage:
+                self.reduced += 1
+            else:
+                self.inlined += 1
+            # The stages of the body are optimized already. `(a > f) > g` is `a > f > g`.
+            kept = argument if len(done) > 1 else None
+            tails = []
+            while isinstance(body, ChainNode) and body is not kept:
+                tails.append(body.chain)
+                body = body.chain[0]
+            if body is not kept:
+                done = [body]
+            for tail in reversed(tails):
+                done += tail[1:]
+        chain = done
+        if len(chain) == 1:
+            return chain[0]
+        chain = _head(chain)
+        if len(chain) == len(node.chain) and all(child is new_child for child, new_child in zip(node.chain, chain)):
+            return node
+        return ChainNode(chain, node.pos_start, node.pos_end)
+
+    def copyable(self, node: Node) -> bool:
+        """Evaluating the expression can not fail and costs nothing, it can be copied or dropped.
+        Names bound after the statement being optimized could be used before they are bound."""
+        if isinstance(node, (IntNode, FloatNode, StringNode, UnitNode)):
+            return True
+        if isinstance(node, IdentifierNode) and len(node.identifiers_list) == 1:
+            name = str(node.identifiers_list[0].value)
+            depth = argument_depth(name)
+            if depth is not None:
+                return depth < self.scopes[-1].depth
+            return name in BUILTINS or name in self.bound
+        return False
+
+    def beta_reduce(self, function: FuncDefNode, argument: Node, extra_depth: int) -> Node | None:
+        """The body of the function, with the argument in place of `_`, or None if it can not be
+        inlined. The function is `extra_depth` functions out of the call."""
+        statements = statements_of(function.body_node)
+        if len(statements) > 1 or (statements and binding_name(statements[0]) is not None):
+            return None
+        body = statements[0] if statements else UnitNode(function.pos_start, function.pos_end)
+        uses = [(identifier, level) for identifier, depth, level in _arguments(body) if depth == level]
+        if not self.copyable(argument):
+            if uses:
+                # The argument is evaluated first in `argument > function`: it must be in the body too
+                if len(uses) != 1 or uses[0][1] != 0 or _first_evaluated(body) is not uses[0][0]:
+                    return None
+            else:
+                return None
+
+        def replace(identifier: IdentifierNode, depth: int, level: int) -> Node:
+            if depth < level:  # argument of a function in the body
+                return identifier
+            if depth == level:
+                return _shift(argument, level)
+            return _argument(identifier, depth - 1 + extra_depth)
+        return _replace_arguments(body, replace)
+
+    def end_body(self, node: Node, statements: list[Node]) -> Node:
+        """Drops the statements which are not used, then leaves the scope"""
+        scope = self.scopes[-1]
+        kept = []
+        used: dict[str, int] | None = None
+        for index, statement in enumerate(statements):
+            name = scope.bindings[index]
+            if index == len(statements) - 1 or not scope.droppable[index]:
+                kept.append(statement)
+            elif name is None:
+                self.dropped += 1
+            else:
+                if used is None:
+                    used = self.names_used(statements)
+                if used.get(name, 0) > 1:  # more than where it is bound
+                    kept.append(statement)
+                else:
+                    self.dropped += 1
+        self.scopes.pop()
+        self.visible -= scope.names
+        self.bound -= scope.names
+        if len(kept) == len(statements) and all(statement is old for statement, old in zip(kept, statements_of(node))):
+            return node
+        if isinstance(node, NoNode):
+            return node
+        return ListNode(kept, node.pos_start, node.pos_end)
+
+    def pure(self, node: Node) -> bool:
+        """Evaluating the expression calls nothing, and can not fail"""
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, (ChainNode, ListNode)):
+                if isinstance(node, ChainNode) and len(node.chain) > 1:
+                    return False
+                nodes.extend(children(node))
+            elif not isinstance(node, FuncDefNode) and not self.copyable(node):
+                return False
+        return True
+
+    @staticmethod
+    def names_used(statements: list[Node]) -> dict[str, int]:
+        """How many times each name is in the statements"""
+        used: dict[str, int] = {}
+        for statement in statements:
+            for node in walk(statement):
+                if isinstance(node, IdentifierNode) and len(node.identifiers_list) == 1:
+                    name = str(node.identifiers_list[0].value)
+                    used[name] = used.get(name, 0) + 1
+        return used
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+from bisect import bisect_right
+# Huitr API imports
+from src.error.error import Error
+from src.lexer.incremental import Damage, relex
+from src.lexer.position import Position
+from src.lexer.source_file import SourceFile
+from src.lexer.token import Token
+from src.parser.nodes import Node, ListNode, FuncDefNode, NoNode
+from src.parser.parser import Parser, ParseError
+from src.parser.visitor import children
+
+
+def apply_edit(
+    source_file: SourceFile,
+    tokens: list[Token],
+    tree: Node | None,
+    offset: int,
+    deleted: int,
+    inserted: str,
+) -> tuple[list[Token], Node, None] | tuple[list[Token], None, Error]:
+    """Replaces `deleted` chars at `offset` by `inserted` in source_file, and updates the tokens
+    and the tree parsed from it.
+
+    Only the changed tokens are lexed again (see `relex`), and only the statements containing them
+    are parsed again, in the innermost function body around them. Everything else is kept as it
+    is, its positions move with the text (see `Position.index`), so `tokens` and `tree` are
+    updated in place and the work done depends on the size of the changed statements, not of
+    the file.
+    If the previous tokens or tree are unavailable (empty or None), they are built from scratch.
+    """
+    tokens, damage, err = relex(source_file, tokens, offset, deleted, inserted)
+    if err is not None:
+        return [], None, err
+    assert damage is not None
+
+    if tree is not None and damage.first == damage.new_end and not damage.removed:
+        return tokens, tree, None  # only whitespace or comments changed
+
+    region = None if tree is None else _statements_region(tokens, tree, damage)
+    if region is not None:
+        new_tree = _reparse_region(tokens, tree, damage, *region)  # type: ignore
+        if new_tree is not None:
+            return tokens, new_tree, None
+
+    node, err = Parser(tokens).parse()
+    if err is not None:
+        return tokens, None, err
+    assert node is not None
+    return tokens, node, None
+
+
+def _statements_region(tokens: list[Token], tree: Node, damage: Damage) -> tuple[int, int, FuncDefNode | None] | None:
+    """Finds the statements around the changed tokens: returns the index of their first token,
+    the index of the token after them (SEMICOLON, closing RSQUARE or EOF), and the function they
+    are in (None at top level).
+    Returns None if the changes go beyond the function, or if the tokens are not balanced.
+    Only the tokens of these statements are looked at.
+    """
+    depth = 0
+    i = damage.first - 1
+    while i >= 0:
+        token_type = tokens[i].type
+        if token_type in ("RSQUARE", "RPAREN"):
+            depth += 1
+        elif token_type in ("LSQUARE", "LPAREN"):
+            if depth:
+                depth -= 1
+            elif token_type == "LSQUARE":
+                break
+            # else the statement started before this parenthesis
+        elif token_type == "SEMICOLON" and not depth:
+            break
+        i -= 1
+    start = i + 1
+    if i < 0:
+        scope = None
+    else:
+        # The innermost function around the `;` or the `[`, which were not changed
+        scope = _function_around(tree, tokens[i].start_pos.index)
+        if tokens[i].type == "LSQUARE" and (scope is None or scope.pos_start is not tokens[i].start_pos):
+            return None
+
+    depth = 0
+    i = start
+    while True:
+        token_type = tokens[i].type
+        if token_type == "EOF":
+            if scope is not None:
+                return None
+            break
+        if token_type in ("LSQUARE", "LPAREN"):
+            depth += 1
+        elif token_type in ("RSQUARE", "RPAREN"):
+            if depth:
+                depth -= 1
+            elif token_type == "RSQUARE":
+                if scope is None or i < damage.new_end:
+                    return None  # stray `]`, or the end of the function changed
+                break
+        elif token_type == "SEMICOLON" and not depth and i >= damage.new_end:
+            break
+        i += 1
+
+    return start, i, scope
+
+
+def _function_around(tree: Node, index: int) -> FuncDefNode | None:
+    """The innermost function from whose `[` to before whose `]` the index is, only going down
+    the nodes around it"""
+    function = None
+    node = tree
+    while True:
+        if isinstance(node, FuncDefNode):
+            function = node
+        nodes = children(node)
+        # The children are in the order of the source, the last one starting at or before index
+        child = bisect_right(nodes, index, key=_node_start) - 1
+        if child < 0 or isinstance(nodes[child], NoNode) or index >= nodes[child].pos_end.index:
+            return function
+        node = nodes[child]
+
+
+def _node_start(node: Node) -> int:
+    return -1 if isinstance(node, NoNode) else node.pos_start.index
+
+
+def _in_region(pos: Position, prefix_end: int, suffix_start: int, removed_positions: set[int]) -> bool:
+    return id(pos) in removed_positions or prefix_end < pos.index < suffix_start
+
+
+def _statement_end(node: Node) -> int:
+    return node.pos_end.index
+
+
+def _reparse_region(
+    tokens: list[Token],
+    tree: Node,
+    damage: Damage,
+    start: int,
+    end: int,
+    scope: FuncDefNode | None,
+) -> Node | None:
+    """Parses tokens[start:end] again and puts the new statements in place of the old ones.
+    Returns the new tree, or None if it has to be parsed from scratch."""
+    if scope is None:
+        body = tree
+    else:
+        if scope.pos_end is not tokens[end].end_pos:
+            return None  # the function does not end with the same `]` anymore
+        body = scope.body_node
+    statements = body.list if isinstance(body, ListNode) else []
+
+    # The old statements are sorted out with positions before the region, which did not move,
+    # and with positions after it, which moved like the tokens. Positions of removed tokens may
+    # be anywhere after the ones before the region, so the old statements in the region are
+    # gone through, but not the ones after it.
+    prefix_end = tokens[start - 1].end_pos.index if start > 0 else -1
+    suffix_start = tokens[end].start_pos.index
+    removed_positions = {id(pos) for token in damage.removed for pos in (token.start_pos, token.end_pos)}
+
+    before = bisect_right(statements, prefix_end, key=_statement_end)
+    after = before
+    while after < len(statements) and (
+        id(statements[after].pos_start) in removed_positions or statements[after].pos_start.index < suffix_start
+    ):
+        after += 1
+    # A unit `()` ends with the token after it, which can be the stop token of the region
+    if before < after and not (
+        _in_region(statements[before].pos_start, prefix_end, suffix_start, removed_positions)
+        and _in_region(statements[after - 1].pos_end, prefix_end, suffix_start + 1, removed_positions)
+    ):
+        return None  # an old statement went over the bounds of the region
+
+    stop = tokens[end]
+    region = (tokens[i] for i in range(start, end))
+    parser = Parser([*region, Token("EOF", None, stop.start_pos, stop.end_pos)])
+    try:
+        new_body = parser.statements()
+    except ParseError:
+        return None  # parsing everything gives the right error
+    new_statements = new_body.list if isinstance(new_body, ListNode) else []
+
+    # In place, so only the statements after the region move in the list
+    statements[before:after] = new_statements
+    if not statements:
+        body = NoNode()
+    elif isinstance(body, ListNode):
+        body.pos_start, body.pos_end = statements[0].pos_start, statements[-1].pos_end
+    else:
+        body = ListNode(statements, statements[0].pos_start, statements[-1].pos_end)
+
+    if scope is None:
+        return body
+    scope.body_node = body
+    return tree
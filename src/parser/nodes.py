@@ -10,7 +10,7 @@
 # __future__ imports (must be first)
 from __future__ import annotations
 # Huitr API imports
-from src.lexer.token import Token as _Token
+from src.lexer.token import BaseToken as _Token
 from src.lexer.position import Position as _Position
 
 
@@ -19,10 +19,11 @@ class Node:
     pos_end: _Position
 
     def pos_eq(self, other: Node) -> bool:
-        return self.pos_start == other.pos_end
+        return self.pos_start == other.pos_start and self.pos_end == other.pos_end
 
-    def __eq__(self, _: object) -> bool:
-        return False
+    def __eq__(self, other: object) -> bool:
+        """Same tree at the same positions, see `src.parser.structural` to leave positions out"""
+        return _equal(self, other)
 
     def __str__(self):
         return repr(self)
@@ -34,17 +35,8 @@ class ChainNode(Node):
         self.pos_start = pos_start
         self.pos_end = pos_end
 
-    def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, ChainNode) and
-            self.pos_eq(other) and
-            self.chain == other.chain
-        )
-
     def __repr__(self):
-        if len(self.chain) == 1:
-            return f"c({self.chain[0]})"
-        return " > ".join(map(str, self.chain))
+        return _repr(self)
 
 
 class ListNode(Node):
@@ -53,15 +45,8 @@ class ListNode(Node):
         self.pos_start = pos_start
         self.pos_end = pos_end
 
-    def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, ListNode) and
-            self.pos_eq(other) and
-            self.list == other.list
-        )
-
     def __repr__(self):
-        return "[" + ", ".join(map(str, self.list)) + "]"
+        return _repr(self)
 
 
 class StringNode(Node):
@@ -127,7 +112,7 @@ class FuncDefNode(Node):
         self.pos_end = pos_end
 
     def __repr__(self):
-        return "f[" + str(self.body_node) + "]"
+        return _repr(self)
 
 
 class UnitNode(Node):
@@ -137,3 +122,82 @@ class UnitNode(Node):
 
     def __repr__(self):
         return "()"
+
+
+# Trees can be nested deeper than the recursion limit: these use an explicit stack
+
+
+def _equal(node: Node, other: object) -> bool:
+    pairs = [(node, other)]
+    while pairs:
+        node, other = pairs.pop()
+        if node is other:
+            continue
+        if type(node) is not type(other):
+            return False
+        assert isinstance(other, Node)
+        if isinstance(node, NoNode):
+            continue
+        if not node.pos_eq(other):
+            return False
+        if isinstance(node, ChainNode):
+            node_children, other_children = node.chain, other.chain  # type: ignore
+        elif isinstance(node, ListNode):
+            node_children, other_children = node.list, other.list  # type: ignore
+        elif isinstance(node, FuncDefNode):
+            node_children, other_children = [node.body_node], [other.body_node]  # type: ignore
+        elif isinstance(node, StringNode):
+            node_children, other_children = [], []
+            if node.string_token != other.string_token:  # type: ignore
+                return False
+        elif isinstance(node, IntNode):
+            node_children, other_children = [], []
+            if node.int_token != other.int_token:  # type: ignore
+                return False
+        elif isinstance(node, FloatNode):
+            node_children, other_children = [], []
+            if node.float_token != other.float_token:  # type: ignore
+                return False
+        elif isinstance(node, (IdentifierNode, LibIdentifierNode)):
+            node_children, other_children = [], []
+            if node.identifiers_list != other.identifiers_list:  # type: ignore
+                return False
+        else:
+            node_children, other_children = [], []
+        if len(node_children) != len(other_children):
+            return False
+        pairs.extend(zip(node_children, other_children))
+    return True
+
+
+def _repr(node: Node) -> str:
+    parts = []
+    stack: list[Node | str] = [node]  # what is left to write, reversed
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, ChainNode):
+            if len(item.chain) == 1:
+                stack += (")", item.chain[0], "c(")
+            else:
+                stack += _joined(item.chain, " > ")
+        elif isinstance(item, ListNode):
+            stack.append("]")
+            stack += _joined(item.list, ", ")
+            stack.append("[")
+        elif isinstance(item, FuncDefNode):
+            stack += ("]", item.body_node, "f[")
+        else:
+            parts.append(repr(item))
+    return "".join(parts)
+
+
+def _joined(nodes: list[Node], separator: str) -> list[Node | str]:
+    """nodes with separators between them, reversed"""
+    items: list[Node | str] = []
+    for node in reversed(nodes):
+        if items:
+            items.append(separator)
+        items.append(node)
+    return items
@@ -7,18 +7,60 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# Global Python imports
+from typing import Iterable
 # Huitr API imports
-from src.lexer.token import Token
+from src.lexer.token import BaseToken
 from src.error.error import Error, SyntaxError
 from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, NoNode, LibIdentifierNode
 from src.parser.nodes import IdentifierNode, FuncDefNode, UnitNode
+from src.parser.token_stream import TokenStream
+
+
+class ParseError(Exception):
+    """Raised by the parsing methods with the SyntaxError, caught by `parse` and `parse_all`"""
+    def __init__(self, error: Error):
+        super().__init__(error.message)
+        self.error = error
+
+
+# What `Parser.statements` does next with the frame on top of its stack
+_NEXT_STATEMENT = 0  # _Statements: parse the next statement, or end
+_END_STATEMENTS = 1  # _Statements: end
+_ATOM = 2  # _Expression: parse the next atom
+_RESULT = 3  # give the node just parsed to the frame
+
+
+class _Statements:
+    """Frame of `statements`: the whole input, or the body of the function opened by `opening`"""
+    __slots__ = ("stop", "stop_or_semicolon", "opening", "statements")
+
+    def __init__(self, stop: tuple[str, ...], opening: BaseToken | None):
+        self.stop = stop
+        self.stop_or_semicolon = stop + ("SEMICOLON",)
+        self.opening = opening
+        self.statements: list[Node] = []
+
+
+class _Expression:
+    """Frame of a statement, which can be in parentheses opened by `opening`"""
+    __slots__ = ("opening", "items", "is_chain")
+
+    def __init__(self, opening: BaseToken | None):
+        self.opening = opening
+        self.items: list[Node] = []
+        self.is_chain = True  # whether items are chained with `>` or listed with `,`
 
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: Iterable[BaseToken | Error]):
+        """`tokens` can be a list of Token or CompactToken, a TokenBuffer, or a lazy stream such as `Lexer.stream()`"""
+        self.tokens = TokenStream(tokens)
         self.tokens_index = 0
-        self.current_token = tokens[0]
+        self.current_token = self.tokens.next()
+        self.last_token = self.current_token
+        # Set by parse_all: statements() then records errors here and skips to the next statement
+        self.errors: list[Error] | None = None
 
     def advance(self, return_old_token: bool = False):
         old_tok = self.current_token
@@ -27,153 +69,194 @@ class Parser:
             self.current_token = None
         else:
             self.tokens_index += 1
-            self.current_token = self.tokens[self.tokens_index]
+            self.current_token = self.tokens.next()
+            if self.current_token is not None:
+                self.last_token = self.current_token
 
         if return_old_token:
             return old_tok
         return self.current_token
 
     def parse(self) -> tuple[Node, None] | tuple[None, Error]:
-        return self.statements()
-
-    def statements(self, stop: list[str] | None = None) -> tuple[Node, None] | tuple[None, Error]:
-        """Register statements, stops at any token listed in `stop` (don’t forget EOF)"""
-        if stop is None:
-            stop = ["EOF"]
-
-        statements_list: list[Node] = []
-
-        while self.current_token is not None:
-            while self.current_token.type == "SEMICOLON":
-                self.advance()
-            if self.current_token.type in stop:
-                break
-
-            node, err = self.statement()
-            if err is not None:
-                return None, err
-            assert node is not None
-            statements_list.append(node)
-
-            if self.current_token.type not in stop + ["SEMICOLON"]:
-                return None, SyntaxError("expected semicolon to finish the line", self.current_token.start_pos, self.current_token.end_pos)
-
-            while self.current_token.type == "SEMICOLON":
-                self.advance()
-
-            if self.current_token.type in stop:
-                break
-
-        if len(statements_list) == 0:
-            return NoNode(), None
-        return ListNode(statements_list, statements_list[0].pos_start, statements_list[-1].pos_end), None
-
-    def statement(self) -> tuple[Node, None] | tuple[None, Error]:
-        node, err = self.chain()
-        if err is not None:
-            return None, err
-        assert node is not None
+        """Parses everything, stops at the first error"""
+        try:
+            node = self.statements()
+        except ParseError as e:
+            if self.tokens.error is not None:  # the lexer failed
+                return None, self.tokens.error
+            self.tokens.read_line(e.error.start_pos)
+            return None, e.error
+        if self.tokens.error is not None:
+            return None, self.tokens.error
         return node, None
 
-    def chain(self, first_element: Node | None = None) -> tuple[Node, None] | tuple[None, Error]:
-        # this is a messy draft
-        chain: list[Node] = []
-
-        if first_element is not None:
-            chain.append(first_element)
-        elif self.current_token is not None and self.current_token.type == "CHAINOP":
-            chain.append(ListNode([], self.current_token.start_pos, self.current_token.start_pos))
-            self.advance()
-
-        node, err = self.atom()
-        if err is not None:
-            return None, err
-        assert node is not None
-        chain.append(node)
-
-        while self.current_token is not None and self.current_token.type == "CHAINOP":
-            self.advance()
-            node, err = self.atom()
-            if err is not None:
-                return None, err
-            assert node is not None
-            chain.append(node)
-
-        if self.current_token is not None and self.current_token.type == "COMMA":
-            self.advance()
-            return self.list(ChainNode(chain, chain[0].pos_start, chain[-1].pos_end))
-
-        return ChainNode(chain, chain[0].pos_start, chain[-1].pos_end), None
-
-    def list(self, first_element: Node | None = None) -> tuple[Node, None] | tuple[None, Error]:
-        """assuming current token is the first element of the list"""
-        list_: list[Node] = []
-
-        if first_element is not None:
-            if isinstance(first_element, ChainNode) and len(first_element.chain) == 1:
-                list_.append(first_element.chain[0])
-            else:
-                list_.append(first_element)
-
-        node, err = self.atom()
-        if err is not None:
-            return None, err
-        assert node is not None
-        list_.append(node)
-
-        while self.current_token is not None and self.current_token.type == "COMMA":
-            self.advance()
-            node, err = self.atom()
-            if err is not None:
-                return None, err
-            assert node is not None
-            list_.append(node)
-
+    def parse_all(self) -> tuple[Node, list[Error]]:
+        """Parses everything, and returns every error with the tree of the statements without errors.
+        After an error, parsing goes on at the next `;` or at the `]` ending the function."""
+        self.errors = []
+        node = self.statements()
+        errors = self.errors
+        self.errors = None
+        if self.tokens.error is not None:
+            errors.append(self.tokens.error)
+        for err in errors:
+            self.tokens.read_line(err.start_pos)
+        return node, errors
+
+    def statements(self, stop: tuple[str, ...] = ("EOF",)) -> Node:
+        """Register statements, stops at any token listed in `stop` (don’t forget EOF).
+
+        Parentheses and functions are parsed with an explicit stack of frames instead of
+        recursive calls, so nesting is only limited by memory.
+        """
+        stack: list[_Statements | _Expression] = [_Statements(stop, None)]
+        action = _NEXT_STATEMENT
+        result: Node = NoNode()  # given to the frame on top of the stack when action is _RESULT
+        while True:
+            try:
+                while True:
+                    frame = stack[-1]
+                    if action == _ATOM:
+                        assert isinstance(frame, _Expression)
+                        token = self.current_token
+                        if token is None:
+                            raise ParseError(SyntaxError("expected valid expression", self.last_token.end_pos))
+                        token_type = token.type
+                        if token_type == "STRING":
+                            self.advance()
+                            result = StringNode(token)
+                        elif token_type == "INT":
+                            self.advance()
+                            result = IntNode(token)
+                        elif token_type == "FLOAT":
+                            self.advance()
+                            result = FloatNode(token)
+                        elif token_type == "NAMESP" or token_type == "IDENTIFIER":
+                            result = self.identifier()
+                        elif token_type == "LPAREN":
+                            cur_tok = self.advance()
+                            if cur_tok is not None and cur_tok.type == "RPAREN":
+                                self.advance()
+                                result = UnitNode(token.start_pos, self.current_token.end_pos)
+                            else:
+                                self.start_expression(stack, token)
+                                continue
+                        elif token_type == "LSQUARE":
+                            self.advance()
+                            stack.append(_Statements(("RSQUARE", "EOF"), token))
+                            action = _NEXT_STATEMENT
+                            continue
+                        else:
+                            raise ParseError(SyntaxError("expected valid expression", token.start_pos, token.end_pos))
+                        action = _RESULT
+
+                    elif action == _RESULT and isinstance(frame, _Expression):
+                        # The atom is part of a chain (`a > b`) or a list (`a, b`). One turns into the
+                        # other when the operator changes: `a > b, c` is `(a > b), c`.
+                        items = frame.items
+                        items.append(result)
+                        cur_tok = self.current_token
+                        next_type = None if cur_tok is None else cur_tok.type
+                        if next_type == "CHAINOP":
+                            self.advance()
+                            if not frame.is_chain:
+                                frame.items = [ListNode(items, items[0].pos_start, items[-1].pos_end)]
+                                frame.is_chain = True
+                            action = _ATOM
+                            continue
+                        if next_type == "COMMA":
+                            self.advance()
+                            if frame.is_chain:
+                                if len(items) > 1:
+                                    frame.items = [ChainNode(items, items[0].pos_start, items[-1].pos_end)]
+                                frame.is_chain = False
+                            action = _ATOM
+                            continue
+                        if frame.is_chain:
+                            result = ChainNode(items, items[0].pos_start, items[-1].pos_end)
+                        else:
+                            result = ListNode(items, items[0].pos_start, items[-1].pos_end)
+                        stack.pop()
+                        if frame.opening is not None:
+                            # The token is not consumed if it is not `)`: recovery starts from it
+                            if self.current_token is None or self.current_token.type != "RPAREN":
+                                raise ParseError(SyntaxError("unmatched '('", frame.opening.start_pos, frame.opening.end_pos))
+                            self.advance()
+
+                    elif action == _RESULT:  # a statement
+                        assert isinstance(frame, _Statements)
+                        if self.current_token.type not in frame.stop_or_semicolon:
+                            raise ParseError(SyntaxError(
+                                "expected semicolon to finish the line", self.current_token.start_pos, self.current_token.end_pos
+                            ))
+                        frame.statements.append(result)
+                        action = _NEXT_STATEMENT
+
+                    else:
+                        assert isinstance(frame, _Statements)
+                        cur_tok = self.current_token
+                        if action == _NEXT_STATEMENT and cur_tok is not None:
+                            while cur_tok.type == "SEMICOLON":
+                                cur_tok = self.advance()
+                            if cur_tok.type not in frame.stop:
+                                self.start_expression(stack, None)
+                                action = _ATOM
+                                continue
+
+                        stack.pop()
+                        statements_list = frame.statements
+                        if len(statements_list) == 0:
+                            result = NoNode()
+                        else:
+                            result = ListNode(statements_list, statements_list[0].pos_start, statements_list[-1].pos_end)
+                        if frame.opening is None:
+                            return result
+
+                        if self.current_token is None or self.current_token.type != "RSQUARE":
+                            raise ParseError(SyntaxError("unmatched '['", frame.opening.start_pos, frame.opening.end_pos))
+                        pos_end = self.current_token.end_pos
+                        self.advance()
+                        result = FuncDefNode(result, frame.opening.start_pos, pos_end)
+                        action = _RESULT
+
+            except ParseError as e:
+                if self.errors is None:
+                    raise
+                # Like a statement failing in a recursive parser: back to the statements it is part of
+                while not isinstance(stack[-1], _Statements):
+                    stack.pop()
+                frame = stack[-1]
+                action = _END_STATEMENTS
+                if self.tokens.error is not None and (self.current_token is None or self.current_token.is_eof()):
+                    continue  # the input stops at the lexing error, so this error is only due to it
+                self.errors.append(e.error)
+                self.synchronize(frame.stop_or_semicolon)
+                if self.current_token is not None:
+                    action = _NEXT_STATEMENT
+
+    def start_expression(self, stack: list, opening: BaseToken | None):
+        """Pushes the frame of a statement, or of the statement in parentheses opened by `opening`"""
+        frame = _Expression(opening)
         if self.current_token is not None and self.current_token.type == "CHAINOP":
+            # `> f` chains from an empty list
+            frame.items.append(ListNode([], self.current_token.start_pos, self.current_token.start_pos))
             self.advance()
-            return self.chain(ListNode(list_, list_[0].pos_start, list_[-1].pos_end))
-
-        return ListNode(list_, list_[0].pos_start, list_[-1].pos_end), None
-
-    def atom(self) -> tuple[Node, None] | tuple[None, Error]:
-        if self.current_token is None:
-            return None, SyntaxError("expected valid expression", self.tokens[-1].end_pos)
-        elif self.current_token.type == "STRING":
-            token = self.current_token
-            self.advance()
-            return StringNode(token), None
-        elif self.current_token.type == "INT":
-            token = self.current_token
-            self.advance()
-            return IntNode(token), None
-        elif self.current_token.type == "FLOAT":
-            token = self.current_token
+        stack.append(frame)
+
+    def synchronize(self, stop_or_semicolon: tuple[str, ...]):
+        """Skips tokens until one of stop_or_semicolon which is not nested in brackets or parentheses"""
+        depth = 0
+        while self.current_token is not None and not self.current_token.is_eof():
+            token_type = self.current_token.type
+            if not depth and token_type in stop_or_semicolon:
+                return
+            if token_type == "LSQUARE" or token_type == "LPAREN":
+                depth += 1
+            elif (token_type == "RSQUARE" or token_type == "RPAREN") and depth:
+                depth -= 1
             self.advance()
-            return FloatNode(token), None
-        elif self.current_token.type == "LPAREN":
-            pos = (self.current_token.start_pos, self.current_token.end_pos)
-            cur_tok = self.advance()
-            if cur_tok is not None and cur_tok.type == "RPAREN":
-                self.advance()
-                return UnitNode(pos[0], self.current_token.end_pos), None
-
-            statement, err = self.statement()
-            if err is not None:
-                return None, err
-            assert statement is not None
-
-            rparen = self.advance(True)
-            if rparen is None or rparen.type != "RPAREN":
-                return None, SyntaxError("unmatched '('", *pos)
-            return statement, None
-        elif self.current_token.type in ["NAMESP", "IDENTIFIER"]:
-            return self.identifier()
-        elif self.current_token.type == "LSQUARE":
-            return self.function()
-        else:
-            return None, SyntaxError("expected valid expression", self.current_token.start_pos, self.current_token.end_pos)
 
-    def identifier(self) -> tuple[Node, None] | tuple[None, Error]:
+    def identifier(self) -> Node:
         assert self.current_token is not None
 
         lib_identifier = False
@@ -182,9 +265,9 @@ class Parser:
             self.advance()
             lib_identifier = True
 
-        identifiers_list: list[Token] = []
+        identifiers_list: list[BaseToken] = []
         if self.current_token.type != "IDENTIFIER":
-            return None, SyntaxError("expected identifier", self.current_token.start_pos, self.current_token.end_pos)
+            raise ParseError(SyntaxError("expected identifier", self.current_token.start_pos, self.current_token.end_pos))
 
         identifiers_list.append(self.current_token)
         new_token = self.advance()
@@ -195,26 +278,12 @@ class Parser:
                 if lib_identifier:
                     identifiers_list.append(new_token)
                     break
-                return None, SyntaxError("expected identifier", self.current_token.start_pos, self.current_token.end_pos)
+                raise ParseError(SyntaxError(
+                    "expected identifier", self.current_token.start_pos, self.current_token.end_pos
+                ))
             identifiers_list.append(self.current_token)
             new_token = self.advance()
 
         if lib_identifier:
-            return LibIdentifierNode(identifiers_list, pos_start, identifiers_list[-1].end_pos), None
-        return IdentifierNode(identifiers_list), None
-
-    def function(self) -> tuple[Node, None] | tuple[None, Error]:
-        assert self.current_token is not None
-        pos = (self.current_token.start_pos, self.current_token.end_pos)
-        self.advance()  # LSQUARE
-
-        body, err = self.statements(["RSQUARE", "EOF"])
-        if err is not None:
-            return None, err
-        if self.current_token.type != "RSQUARE":
-            return None, SyntaxError("unmatched '['", *pos)
-        pos_end = self.current_token.end_pos
-        self.advance()
-
-        assert body is not None
-        return FuncDefNode(body, pos[0], pos_end), None
+            return LibIdentifierNode(identifiers_list, pos_start, identifiers_list[-1].end_pos)
+        return IdentifierNode(identifiers_list)
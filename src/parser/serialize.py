@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compact serialisation of parsed trees.
+
+Each node is flattened into a tuple of its tag, offsets and token values. The tuples of the
+nodes are listed in post-order (children before their parent), then marshalled: nesting does
+not depend on the depth of the tree. Positions are stored as plain offsets, they are rebuilt
+against the SourceFile given to `load`, so the source itself is never serialised.
+"""
+
+# Global Python imports
+import marshal
+from typing import Any
+# Huitr API imports
+from src.lexer.collection import fewer_collections
+from src.lexer.position import Position
+from src.lexer.source_file import SourceFile
+from src.lexer.token import Token, TokenKind, TOKEN_KIND_NAMES
+from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, NoNode, LibIdentifierNode
+from src.parser.nodes import IdentifierNode, FuncDefNode, UnitNode
+from src.parser.visitor import children
+
+# Bumped whenever the layout below changes
+SERIAL_VERSION = 3
+
+# Node tags, the first item of the tuple of a node. The other items are:
+_CHAIN = 0  # start, end, number of children
+_LIST = 1  # start, end, number of children
+_FUNC_DEF = 2  # start, end (its body is the node before)
+_NO_NODE = 3  #
+_UNIT = 4  # start, end
+_STRING = 5  # start, end, value
+_INT = 6  # start, end, value
+_FLOAT = 7  # start, end, value
+_IDENTIFIER = 8  # (start, end, value) of each token
+_LIB_IDENTIFIER = 9  # start, end, (kind, start, end, value) of each token
+
+
+def dump(node: Node) -> bytes:
+    """Serialises a tree"""
+    with fewer_collections():
+        # Visiting children from right to left then reversing gives the post-order
+        items = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            items.append(_item(node))
+            stack += children(node)
+        items.reverse()
+        return marshal.dumps(tuple(items))
+
+
+def _item(node: Node) -> tuple:
+    if isinstance(node, ChainNode):
+        return _CHAIN, node.pos_start.index, node.pos_end.index, len(node.chain)
+    if isinstance(node, ListNode):
+        return _LIST, node.pos_start.index, node.pos_end.index, len(node.list)
+    if isinstance(node, FuncDefNode):
+        return _FUNC_DEF, node.pos_start.index, node.pos_end.index
+    if isinstance(node, NoNode):
+        return (_NO_NODE,)
+    if isinstance(node, UnitNode):
+        return _UNIT, node.pos_start.index, node.pos_end.index
+    if isinstance(node, IdentifierNode):
+        return _IDENTIFIER, tuple(
+            (token.start_pos.index, token.end_pos.index, token.value) for token in node.identifiers_list
+        )
+    if isinstance(node, LibIdentifierNode):
+        return _LIB_IDENTIFIER, node.pos_start.index, node.pos_end.index, tuple(
+            (int(TokenKind[token.type]), token.start_pos.index, token.end_pos.index, token.value)
+            for token in node.identifiers_list
+        )
+    if isinstance(node, StringNode):
+        return _STRING, node.pos_start.index, node.pos_end.index, node.string_token.value
+    if isinstance(node, IntNode):
+        return _INT, node.pos_start.index, node.pos_end.index, node.int_token.value
+    if isinstance(node, FloatNode):
+        return _FLOAT, node.pos_start.index, node.pos_end.index, node.float_token.value
+    raise AssertionError(f"can not serialise {type(node).__name__}")
+
+
+def load(data: bytes, source_file: SourceFile) -> Node:
+    """Rebuilds a tree serialised with `dump`, with positions pointing into source_file"""
+    with fewer_collections():
+        return _build(marshal.loads(data), source_file)
+
+
+def _build(items: tuple[tuple, ...], source_file: SourceFile) -> Node:
+    nodes: list[Node] = []  # built nodes whose parent is not built yet
+    for item in items:
+        tag = item[0]
+        if tag == _CHAIN or tag == _LIST:
+            _, start, end, count = item
+            if count:
+                children = nodes[-count:]
+                del nodes[-count:]
+            else:
+                children = []
+            # Like in parsed trees, the node shares the positions of its first and last children
+            if children and children[0].pos_start.index == start:
+                start_pos = children[0].pos_start
+            else:
+                start_pos = Position(start, source_file)
+            if children and children[-1].pos_end.index == end:
+                end_pos = children[-1].pos_end
+            else:
+                end_pos = Position(end, source_file)
+            nodes.append(ChainNode(children, start_pos, end_pos) if tag == _CHAIN else ListNode(children, start_pos, end_pos))
+        elif tag == _IDENTIFIER:
+            nodes.append(IdentifierNode([
+                Token("IDENTIFIER", value, Position(start, source_file), Position(end, source_file))
+                for start, end, value in item[1]
+            ]))
+        elif tag == _STRING:
+            nodes.append(StringNode(Token("STRING", item[3], Position(item[1], source_file), Position(item[2], source_file))))
+        elif tag == _INT:
+            nodes.append(IntNode(Token("INT", item[3], Position(item[1], source_file), Position(item[2], source_file))))
+        elif tag == _FLOAT:
+            nodes.append(FloatNode(Token("FLOAT", item[3], Position(item[1], source_file), Position(item[2], source_file))))
+        elif tag == _FUNC_DEF:
+            nodes.append(FuncDefNode(nodes.pop(), Position(item[1], source_file), Position(item[2], source_file)))
+        elif tag == _UNIT:
+            nodes.append(UnitNode(Position(item[1], source_file), Position(item[2], source_file)))
+        elif tag == _NO_NODE:
+            nodes.append(NoNode())
+        elif tag == _LIB_IDENTIFIER:
+            tokens: list[Any] = [
+                Token(TOKEN_KIND_NAMES[kind], value, Position(start, source_file), Position(end, source_file))
+                for kind, start, end, value in item[3]
+            ]
+            nodes.append(LibIdentifierNode(tokens, Position(item[1], source_file), Position(item[2], source_file)))
+        else:
+            raise ValueError(f"invalid serialised node tag {tag!r}")
+    if len(nodes) != 1:
+        raise ValueError("invalid serialised tree")
+    return nodes[0]
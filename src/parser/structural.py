@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Structure of trees, positions left out.
+
+Two trees are structurally equal when they only differ by their positions. `digest` hashes
+that structure (the same in every process, so it can key on-disk caches), and `hash_cons`
+makes structurally equal subtrees of a tree a single shared node.
+"""
+
+# Global Python imports
+import hashlib
+from typing import Any
+# Huitr API imports
+from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, NoNode, LibIdentifierNode
+from src.parser.nodes import IdentifierNode, FuncDefNode, UnitNode
+from src.parser.visitor import Visitor, children
+
+
+def shape(node: Node) -> tuple:
+    """What a node is without its positions and its children, which are structural too"""
+    if isinstance(node, ChainNode):
+        return ("chain", len(node.chain))
+    if isinstance(node, ListNode):
+        return ("list", len(node.list))
+    if isinstance(node, FuncDefNode):
+        return ("function",)
+    if isinstance(node, StringNode):
+        return ("string", node.string_token.value)
+    if isinstance(node, IntNode):
+        return ("int", node.int_token.value)
+    if isinstance(node, FloatNode):
+        return ("float", node.float_token.value)
+    if isinstance(node, IdentifierNode):
+        return ("identifier", *(token.value for token in node.identifiers_list))
+    if isinstance(node, LibIdentifierNode):
+        return ("lib", *(token.value for token in node.identifiers_list))
+    if isinstance(node, UnitNode):
+        return ("unit",)
+    assert isinstance(node, NoNode), f"unknown node {type(node).__name__}"
+    return ("none",)
+
+
+def structural_equal(node: Node, other: Node) -> bool:
+    pairs = [(node, other)]
+    while pairs:
+        node, other = pairs.pop()
+        if node is other:
+            continue
+        if type(node) is not type(other) or shape(node) != shape(other):
+            return False
+        pairs.extend(zip(children(node), children(other)))
+    return True
+
+
+class _Digests(Visitor):
+    def generic_visit(self, node: Node, children_values: list[bytes]) -> bytes:
+        # Unlike marshal, repr does not depend on which objects are shared
+        return hashlib.sha256(repr((shape(node), *children_values)).encode()).digest()
+
+
+def digest(node: Node) -> bytes:
+    """SHA-256 of the structure of a tree: structurally equal trees have the same digest"""
+    return _Digests().visit(node)
+
+
+def structural_hash(node: Node) -> int:
+    return int.from_bytes(digest(node)[:8], "little", signed=True)
+
+
+class _HashConser(Visitor):
+    def __init__(self, table: dict[tuple, Node]):
+        super().__init__()
+        self.table = table
+
+    def generic_visit(self, node: Node, children_values: list[Node]) -> Node:
+        # Children are already shared: they are equal when they are the same node
+        key = (type(node), shape(node), *map(id, children_values))
+        shared = self.table.get(key)
+        if shared is not None:
+            return shared
+        if isinstance(node, ChainNode):
+            node.chain[:] = children_values
+        elif isinstance(node, ListNode):
+            node.list[:] = children_values
+        elif isinstance(node, FuncDefNode):
+            node.body_node = children_values[0]
+        self.table[key] = node
+        return node
+
+
+def hash_cons(tree: Node, table: dict[tuple, Any] | None = None) -> Node:
+    """Makes the structurally equal subtrees of a tree one shared node, and returns the new root.
+
+    The tree is changed in place. A shared node keeps the positions of its first occurrence, so
+    do not hash-cons a tree errors are reported on or which is edited with `apply_edit`. Give
+    the same table to share nodes between trees: it keeps the nodes it shares alive.
+    """
+    return _HashConser({} if table is None else table).visit(tree)
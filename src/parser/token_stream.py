@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+from collections import deque
+from typing import Iterable
+# Huitr API imports
+from src.error.error import Error
+from src.lexer.position import Position
+from src.lexer.token import BaseToken, Token
+
+
+class TokenStream:
+    """Pulls tokens from a list or from a lazy lexer, only keeping a small lookahead buffer.
+
+    An Error yielded by the lexer (see `src.lexer.lexer.scan`) ends the stream: it is
+    stored in `error` and replaced by an EOF token.
+    """
+    def __init__(self, tokens: Iterable[BaseToken | Error]):
+        self._iterator = iter(tokens)
+        self._lookahead: deque[BaseToken] = deque()
+        self.error: Error | None = None
+
+    def _pull(self) -> BaseToken | None:
+        item = next(self._iterator, None)
+        if isinstance(item, Error):
+            self.error = item
+            self._iterator = iter(())
+            return Token("EOF", None, item.start_pos, item.end_pos)
+        return item
+
+    def peek(self, n: int = 0) -> BaseToken | None:
+        """Returns the nth next token without consuming it"""
+        while len(self._lookahead) <= n:
+            token = self._pull()
+            if token is None:
+                return None
+            self._lookahead.append(token)
+        return self._lookahead[n]
+
+    def next(self) -> BaseToken | None:
+        if self._lookahead:
+            return self._lookahead.popleft()
+        return self._pull()
+
+    def read_line(self, position: Position):
+        """Lexes until the line of `position` is complete, so that an error there can show it"""
+        source_file = position.source_file
+        line_number = position.line_number
+        while source_file.line_count <= line_number + 1:
+            token = self.peek(len(self._lookahead))
+            if token is None or token.is_eof():
+                break
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Walking trees with an explicit stack, so deeply nested code does not hit the recursion limit"""
+
+# Global Python imports
+from typing import Any, Callable, Iterator
+# Huitr API imports
+from src.parser.nodes import Node, ChainNode, ListNode, FuncDefNode
+
+
+def children(node: Node) -> list[Node]:
+    if isinstance(node, ChainNode):
+        return node.chain
+    if isinstance(node, ListNode):
+        return node.list
+    if isinstance(node, FuncDefNode):
+        return [node.body_node]
+    return []
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """Nodes of the tree, in pre-order"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+class Visitor:
+    """Computes a value for each node of a tree, from the node and the values of its children.
+
+    `visit` calls `visit_<node class name>(node, children_values)`, or `generic_visit` when
+    there is no such method. Children are visited before their parent (post-order), in order.
+    """
+    def __init__(self):
+        self._methods: dict[type, Callable[[Node, list[Any]], Any]] = {}
+
+    def _method(self, node_class: type) -> Callable[[Node, list[Any]], Any]:
+        method = self._methods.get(node_class)
+        if method is None:
+            method = self._methods[node_class] = getattr(self, f"visit_{node_class.__name__}", self.generic_visit)
+        return method
+
+    def visit(self, node: Node) -> Any:
+        # Pre-order with children from right to left, reversed, is the post-order
+        order = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_children = children(node)
+            order.append((node, len(node_children)))
+            stack += node_children
+
+        values: list[Any] = []
+        method = self._method
+        for node, count in reversed(order):
+            # The values of its children are the last ones
+            if count:
+                children_values = values[-count:]
+                del values[-count:]
+            else:
+                children_values = []
+            values.append(method(type(node))(node, children_values))
+        return values[0]
+
+    def generic_visit(self, node: Node, children_values: list[Any]) -> Any:
+        return None
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Incremental build of the modules of a project.
+
+The module `a::b` is the file `a/b.huitr` under the project root. A module references the
+modules named by the namespaces of its identifiers: `b::name` is looked for next to the module,
+then from the root, and `::lib::name` from the root only.
+
+The interface of a module is what other modules can see of it: the names bound at its top
+level (statements ending with `> name`), each with a fingerprint of its statement which does
+not depend on positions. A module is rebuilt when its source changed, or when a name it uses
+from another module changed in that module's interface (or the module it resolves to changed).
+The state of the last build is kept in `__huitr_cache__/build.json` at the root.
+"""
+
+# Global Python imports
+import hashlib
+import json
+import os
+from typing import Any, Iterable, NamedTuple
+# Huitr API imports
+from src.error.error import Error
+from src.lexer.token import BaseToken
+from src.parser import structural
+from src.parser.nodes import Node, ChainNode, ListNode, NoNode, LibIdentifierNode, IdentifierNode
+from src.parser.visitor import walk
+from src.project import cache
+from src.project.frontend import SOURCE_SUFFIX, find_sources, parse_files
+
+BUILD_STATE = "build.json"
+BUILD_STATE_VERSION = 3
+
+# A reference to another module: its namespace, whether it is absolute (`::lib::name`),
+# and the name used in it (None for the whole module, as in `::lib::`)
+Reference = tuple[tuple[str, ...], bool, str | None]
+
+
+class BuildReport(NamedTuple):
+    rebuilt: dict[str, str]  # module name -> why it was rebuilt
+    up_to_date: list[str]
+    removed: list[str]
+    errors: list[Error]
+
+    def explain(self) -> str:
+        lines = [f"rebuilt {module}: {reason}" for module, reason in self.rebuilt.items()]
+        lines += [f"removed {module}" for module in self.removed]
+        lines += [f"up to date {module}" for module in self.up_to_date]
+        lines.append(
+            f"{len(self.rebuilt)} rebuilt, {len(self.up_to_date)} up to date, {len(self.errors)} with errors"
+        )
+        return "\n".join(lines)
+
+
+def module_name(root: str, path: str) -> str:
+    relative = os.path.relpath(path, root)
+    if relative.endswith(SOURCE_SUFFIX):
+        relative = relative[: -len(SOURCE_SUFFIX)]
+    return "::".join(relative.split(os.sep))
+
+
+def fingerprint(node: Node) -> str:
+    """Hash of the structure and values of the tree, positions left out"""
+    return structural.digest(node).hex()[:16]
+
+
+def _statements(tree: Node) -> list[Node]:
+    if isinstance(tree, ListNode):
+        return tree.list
+    if isinstance(tree, NoNode):
+        return []
+    return [tree]
+
+
+def interface(tree: Node) -> dict[str, str]:
+    """Names bound at the top level of a module, with the fingerprint of their statements"""
+    statements_by_name: dict[str, list[Node]] = {}
+    for statement in _statements(tree):
+        if not isinstance(statement, ChainNode) or len(statement.chain) < 2:
+            continue
+        last = statement.chain[-1]
+        if isinstance(last, IdentifierNode) and len(last.identifiers_list) == 1:
+            statements_by_name.setdefault(str(last.identifiers_list[0].value), []).append(statement)
+    return {
+        name: fingerprint(ListNode(statements, statements[0].pos_start, statements[-1].pos_end))
+        for name, statements in statements_by_name.items()
+    }
+
+
+def references(tree: Node) -> set[Reference]:
+    """The references to other modules in a tree"""
+    found: set[Reference] = set()
+    for node in walk(tree):
+        if isinstance(node, IdentifierNode) and len(node.identifiers_list) > 1:
+            names = _names(node.identifiers_list)
+            found.add((names[:-1], False, names[-1]))
+        elif isinstance(node, LibIdentifierNode):
+            names = _names(node.identifiers_list)
+            if node.identifiers_list[-1].type == "NAMESP":  # `::lib::`, the whole module
+                found.add((names, True, None))
+            elif len(names) > 1:
+                found.add((names[:-1], True, names[-1]))
+    return found
+
+
+def _reference_key(reference: Reference) -> tuple:
+    namespace, absolute, name = reference
+    return namespace, absolute, name or ""
+
+
+def _names(tokens: list[BaseToken]) -> tuple[str, ...]:
+    return tuple(str(token.value) for token in tokens if token.type == "IDENTIFIER")
+
+
+def resolve(module: str, namespace: Iterable[str], absolute: bool, modules: set[str] | dict[str, Any]) -> str | None:
+    """Finds the module a namespace refers to from `module`, None if there is none"""
+    name = "::".join(namespace)
+    package = module.rpartition("::")[0]
+    if not absolute and package and f"{package}::{name}" in modules:
+        return f"{package}::{name}"
+    return name if name in modules else None
+
+
+def _used_fingerprint(resolved: str | None, name: str | None, states: dict[str, dict]) -> str | None:
+    """What a reference sees of the module it resolves to"""
+    if resolved is None:
+        return None
+    module_interface = states[resolved]["interface"]
+    if name is None:
+        return hashlib.sha256(json.dumps(module_interface, sort_keys=True).encode()).hexdigest()[:16]
+    return module_interface.get(name)
+
+
+def _state_path(root: str) -> str:
+    return os.path.join(root, cache.CACHE_DIRECTORY, BUILD_STATE)
+
+
+def _load_state(root: str) -> dict[str, dict]:
+    try:
+        with open(_state_path(root), encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != BUILD_STATE_VERSION:
+        return {}
+    return state["modules"]
+
+
+def build(root: str, workers: int | None = None, use_cache: bool = True) -> BuildReport:
+    """Builds the modules under root which changed since the last build, see the module docstring.
+    Modules with errors are left out of the state, so they are built again next time."""
+    paths = {module_name(root, path): path for path in find_sources([root])}
+    old_states = _load_state(root)
+    states: dict[str, dict] = {}
+    rebuilt: dict[str, str] = {}
+    errors: list[Error] = []
+
+    digests = {}
+    for module, path in paths.items():
+        with open(path, "rb") as file:
+            digests[module] = cache.source_hash(file.read()).hex()
+        if module not in old_states:
+            rebuilt[module] = "not built before"
+        elif old_states[module]["source_hash"] != digests[module]:
+            rebuilt[module] = "source changed"
+        else:
+            states[module] = old_states[module]
+
+    def compile_modules(modules: list[str]):
+        for parsed in parse_files([paths[module] for module in modules], workers, use_cache):
+            module = module_name(root, parsed.path)
+            if parsed.error is not None:
+                errors.append(parsed.error)
+                states.pop(module, None)
+                continue
+            assert parsed.tree is not None
+            states[module] = {
+                "source_hash": digests[module],
+                "interface": interface(parsed.tree),
+                "references": [
+                    [list(namespace), absolute, name, None, None]  # + what it resolves to and sees, see below
+                    for namespace, absolute, name in sorted(references(parsed.tree), key=_reference_key)
+                ],
+            }
+
+    compile_modules(list(rebuilt))
+
+    # Interfaces are only made of the source of their module: one pass finds every stale dependent
+    stale = {}
+    for module, state in states.items():
+        if module in rebuilt:
+            continue
+        for namespace, absolute, name, old_resolved, old_fingerprint in state["references"]:
+            resolved = resolve(module, namespace, absolute, states)
+            if resolved != old_resolved:
+                stale[module] = f"{'::'.join(namespace)} now refers to {resolved or 'no module'}"
+                break
+            if _used_fingerprint(resolved, name, states) != old_fingerprint:
+                stale[module] = f"interface of {resolved} changed ({name if name is not None else 'any name'})"
+                break
+    rebuilt.update(stale)
+    compile_modules(list(stale))
+
+    for module in rebuilt:
+        if module in states:  # records what the references see now
+            for reference in states[module]["references"]:
+                namespace, absolute, name = reference[:3]
+                reference[3] = resolve(module, namespace, absolute, states)
+                reference[4] = _used_fingerprint(reference[3], name, states)
+
+    cache.write_atomic(
+        _state_path(root),
+        json.dumps({"version": BUILD_STATE_VERSION, "modules": states}, indent=1, sort_keys=True).encode(),
+    )
+    return BuildReport(
+        rebuilt,
+        [module for module in paths if module not in rebuilt],
+        sorted(module for module in old_states if module not in paths),
+        errors,
+    )
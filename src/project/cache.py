@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""On-disk cache of parsed trees, next to the sources like .pyc files.
+
+`dir/name.huitr` is cached in `dir/__huitr_cache__/name.huitr.<python tag>.ast`. An entry starts
+with a header holding the versions and the hash of the source it was parsed from, followed by
+the tree serialised with `src.parser.serialize`. An entry whose header does not match is stale
+and is parsed again. Entries are written to a temporary file then renamed, so readers and
+concurrent writers only ever see complete entries.
+"""
+
+# Global Python imports
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+# Huitr API imports
+from src.lexer.source_file import Buffer
+from src.parser.serialize import SERIAL_VERSION
+
+CACHE_DIRECTORY = "__huitr_cache__"
+CACHE_SUFFIX = ".ast"
+MAGIC = b"HuAS"
+
+# Bump when the lexer or the parser build different trees from the same source
+PARSER_VERSION = 1
+
+# magic, parser version, serialisation version, SHA-256 of the source
+HEADER = struct.Struct("<4sHH32s")
+
+
+def cache_path(path: str) -> str:
+    directory, filename = os.path.split(path)
+    # The serialised tree is marshalled, its format depends on the Python version
+    return os.path.join(directory, CACHE_DIRECTORY, f"{filename}.{sys.implementation.cache_tag}{CACHE_SUFFIX}")
+
+
+def source_hash(source: Buffer) -> bytes:
+    return hashlib.sha256(source).digest()
+
+
+def _header(digest: bytes) -> bytes:
+    return HEADER.pack(MAGIC, PARSER_VERSION, SERIAL_VERSION, digest)
+
+
+def read_entry(path: str, digest: bytes) -> bytes | None:
+    """Returns the serialised tree cached for the source at path, if its hash is `digest`"""
+    try:
+        with open(cache_path(path), "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if data[: HEADER.size] != _header(digest):
+        return None  # stale, or written by another version
+    return data[HEADER.size :]
+
+
+def write_entry(path: str, digest: bytes, tree_data: bytes):
+    """Caches the serialised tree of the source at path, whose hash is `digest`.
+    Like for .pyc files, failing to write the cache is not an error."""
+    write_atomic(cache_path(path), _header(digest) + tree_data)
+
+
+def write_atomic(target: str, data: bytes):
+    """Writes data to a temporary file, then moves it to target: readers and concurrent
+    writers only ever see complete files, the last writer wins. Errors are ignored."""
+    directory = os.path.dirname(target)
+    temporary = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(prefix=os.path.basename(target), suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temporary, target)
+    except OSError:
+        if temporary is not None:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
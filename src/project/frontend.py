@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, NamedTuple
+# Huitr API imports
+from src.error.error import Error
+from src.lexer.lexer import Lexer
+from src.lexer.position import Position
+from src.lexer.source_file import SourceFile
+from src.parser import serialize
+from src.parser.nodes import Node
+from src.parser.parser import Parser
+from src.project import cache
+
+SOURCE_SUFFIX = ".huitr"
+
+# Error classes by name, to rebuild the errors sent back by the workers
+ERROR_CLASSES = {error_class.__name__: error_class for error_class in Error.__subclasses__()}
+
+
+class ParsedFile(NamedTuple):
+    """Result of the front end for one file: either its tree or its error"""
+    path: str
+    source_file: SourceFile
+    tree: Node | None
+    error: Error | None
+    lex_time: float
+    parse_time: float
+    cached: bool  # the tree was loaded from the cache, it was not lexed or parsed
+
+
+def find_sources(paths: Iterable[str | os.PathLike]) -> list[str]:
+    """Lists the given files, and the source files found in the given directories"""
+    sources = []
+    for path in map(os.fspath, paths):
+        if not os.path.isdir(path):
+            sources.append(path)
+            continue
+        for directory, subdirectories, filenames in os.walk(path):
+            subdirectories[:] = sorted(name for name in subdirectories if name != cache.CACHE_DIRECTORY)
+            sources.extend(
+                os.path.join(directory, filename) for filename in sorted(filenames) if filename.endswith(SOURCE_SUFFIX)
+            )
+    return sources
+
+
+def read_source(path: str) -> SourceFile:
+    """Reads a file as bytes: offsets are the same as in a mapped file, but no file stays open"""
+    with open(path, "rb") as file:
+        return SourceFile(file.read(), path)
+
+
+def lex_and_parse(source_file: SourceFile) -> tuple[Node | None, Error | None, float, float]:
+    """Returns the tree or the error, then the time spent lexing and parsing"""
+    start = time.perf_counter()
+    tokens, err = Lexer(source_file).tokenize()
+    lexed = time.perf_counter()
+    if err is not None:
+        return None, err, lexed - start, 0.0
+    tree, err = Parser(tokens).parse()
+    return tree, err, lexed - start, time.perf_counter() - lexed
+
+
+def parse_file(path: str, use_cache: bool = True) -> ParsedFile:
+    """Lexes and parses a file, or loads its tree from the cache (see `src.project.cache`)"""
+    source_file = read_source(path)
+    digest = None
+    if use_cache:
+        digest = cache.source_hash(source_file.data)  # type: ignore
+        data = cache.read_entry(path, digest)
+        if data is not None:
+            return ParsedFile(path, source_file, serialize.load(data, source_file), None, 0.0, 0.0, True)
+
+    tree, err, lex_time, parse_time = lex_and_parse(source_file)
+    if tree is not None and digest is not None:
+        cache.write_entry(path, digest, serialize.dump(tree))
+    return ParsedFile(path, source_file, tree, err, lex_time, parse_time, False)
+
+
+def _parse_in_worker(path: str, use_cache: bool) -> tuple[str, bytes | None, tuple[str, str, int, int] | None, float, float, bool]:
+    """Runs in a worker process. The tree is serialised and the error is reduced to its
+    class, message and offsets: the parent process rebuilds them against its own copy of the source"""
+    source_file = SourceFile.from_path(path)
+    digest = None
+    if use_cache:
+        digest = cache.source_hash(source_file.data)  # type: ignore
+        data = cache.read_entry(path, digest)
+        if data is not None:
+            return path, data, None, 0.0, 0.0, True
+
+    tree, err, lex_time, parse_time = lex_and_parse(source_file)
+    if err is not None:
+        error = (type(err).__name__, err.message, err.start_pos.index, err.end_pos.index)
+        return path, None, error, lex_time, parse_time, False
+    assert tree is not None
+    data = serialize.dump(tree)
+    if digest is not None:
+        cache.write_entry(path, digest, data)
+    return path, data, None, lex_time, parse_time, False
+
+
+def parse_files(
+    paths: Iterable[str | os.PathLike],
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> Iterator[ParsedFile]:
+    """Lexes and parses the files (directories are searched, see `find_sources`) in `workers`
+    processes, all the CPUs by default. With 1 worker, everything runs in this process.
+
+    Yields the files in order. A file with an error does not stop the other ones.
+    """
+    assert workers is None or workers >= 1, "There must be at least one worker"
+    sources = find_sources(paths)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for path in sources:
+            yield parse_file(path, use_cache)
+        return
+
+    chunk_size = max(1, len(sources) // (workers * 4))
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(_parse_in_worker, sources, repeat(use_cache), chunksize=chunk_size)
+        for path, data, error, lex_time, parse_time, cached in results:
+            source_file = read_source(path)
+            if error is not None:
+                error_name, message, start, end = error
+                err = ERROR_CLASSES[error_name](message, Position(start, source_file), Position(end, source_file))
+                yield ParsedFile(path, source_file, None, err, lex_time, parse_time, cached)
+            else:
+                assert data is not None
+                yield ParsedFile(path, source_file, serialize.load(data, source_file), None, lex_time, parse_time, cached)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Lists of numbers stored in arrays (see `src.runtime.values.NumberList`), and `map` and
+`filter` over them without boxing the numbers.
+
+Functions like `[_, 2 > mul]`, `[1, _ > sub]` or `[_, 3 > mul, 1 > add]`, builtins called with
+the argument and a number, are recognized from their bytecode. They are run over the whole array
+in C, with the Python operator of each builtin. When that fails (division by zero, a result too big for the
+array...), None is returned and the builtin calls the function on each number instead, which
+reports the error as usual.
+"""
+
+# Global Python imports
+import itertools
+import operator
+from array import array
+from typing import Any, Callable, Iterable
+# Huitr API imports
+from src.runtime.bytecode import Opcode
+from src.runtime.value import Value
+from src.runtime.values import Int, Float, List, NumberList, Function, BuiltinFunction, int_value
+
+ARITHMETIC: dict[str, Callable[[Any, Any], Any]] = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "div": operator.truediv,
+    "idiv": operator.floordiv,
+    "mod": operator.mod,
+}
+COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "gt": operator.gt,
+    "le": operator.le,
+    "ge": operator.ge,
+}
+
+# A function `[_, k > name, k2 > name2...]` is: the first stage, `_, k > name` or `k, _ > name`,
+# then the same instructions as `_ARGUMENT_FIRST` without LOAD_ARG for each next stage
+# (builtins are constants, see `src.runtime.compiler`)
+_ARGUMENT_FIRST = (Opcode.LOAD_ARG, Opcode.CONST, Opcode.BUILD_LIST, Opcode.CONST, Opcode.CALL)
+_ARGUMENT_SECOND = (Opcode.CONST, Opcode.LOAD_ARG, Opcode.BUILD_LIST, Opcode.CONST, Opcode.CALL)
+_NEXT_STAGE = _ARGUMENT_FIRST[1:]
+
+
+def number_list(numbers: Iterable[int | float], typecode: str) -> List:
+    """A NumberList of the numbers, or a boxed List if they do not fit in an array of typecode"""
+    numbers = list(numbers)
+    try:
+        return NumberList(array(typecode, numbers))
+    except OverflowError:
+        return List([int_value(number) if type(number) is int else Float(number) for number in numbers])
+
+
+def stages(function: Value) -> list[tuple[str, int | float, bool]] | None:
+    """For a function `[_, k > name, k2 > name2...]` (or starting with `k, _ > name`), where the k
+    are numbers and the names builtins, returns each name, k and whether the argument comes first"""
+    if type(function) is not Function:
+        return None
+    code = function.value
+    instructions = code.instructions
+    opcodes = tuple(instructions[:10:2])
+    if opcodes == _ARGUMENT_FIRST:
+        found = [(1, 3, True)]  # CONSTs of the number and of the builtin, if the argument is first
+    elif opcodes == _ARGUMENT_SECOND:
+        found = [(0, 3, False)]
+    else:
+        return None
+    if instructions[2 * (1 - found[0][0]) + 1] != 0 or instructions[5] != 2:
+        return None  # `__`, or more than 2 items
+    offset = 10
+    while instructions[offset] != Opcode.RETURN:
+        if tuple(instructions[offset:offset + 8:2]) != _NEXT_STAGE or instructions[offset + 3] != 2:
+            return None
+        found.append((offset // 2, offset // 2 + 2, True))
+        offset += 8
+
+    result = []
+    for constant_index, builtin_index, argument_first in found:
+        constant = code.constants[instructions[2 * constant_index + 1]]
+        builtin = code.constants[instructions[2 * builtin_index + 1]]
+        if type(constant) not in (Int, Float) or type(builtin) is not BuiltinFunction:
+            return None
+        result.append((builtin.name, constant.value, argument_first))
+    return result
+
+
+def _apply(
+    numbers: array, function_stages: list[tuple[str, int | float, bool]], predicate: bool,
+) -> tuple[Iterable[Any], bool] | None:
+    """The results of the arithmetic stages over the numbers, computed when they are iterated, and
+    whether they are floats. The last stage can be a comparison if `predicate`. None if the
+    stages can not all be run on Python numbers like the builtins do."""
+    results: Iterable[Any] = numbers
+    floats = numbers.typecode == "d"
+    for index, (name, constant, argument_first) in enumerate(function_stages):
+        python_operator = ARITHMETIC.get(name)
+        if python_operator is None and predicate and index == len(function_stages) - 1:
+            python_operator = COMPARISONS.get(name)
+        if python_operator is None:
+            return None
+        floats = floats or type(constant) is float
+        if name == "idiv" and floats:
+            return None  # idiv takes integers
+        floats = floats or name == "div"
+        if argument_first:
+            results = map(python_operator, results, itertools.repeat(constant))
+        else:
+            results = map(python_operator, itertools.repeat(constant), results)
+    return results, floats
+
+
+def map_numbers(value: NumberList, function: Value) -> List | None:
+    """`value, function > map`, or None if it must be done number by number"""
+    function_stages = stages(function)
+    applied = None if function_stages is None else _apply(value.numbers, function_stages, False)
+    if applied is None:
+        return None
+    results, floats = applied
+    try:
+        return number_list(results, "d" if floats else "q")
+    except ArithmeticError:
+        return None
+
+
+def filter_numbers(value: NumberList, function: Value) -> NumberList | None:
+    """`value, function > filter`, or None if it must be done number by number"""
+    function_stages = stages(function)
+    applied = None if function_stages is None else _apply(value.numbers, function_stages, True)
+    if applied is None:
+        return None
+    try:
+        return NumberList(array(value.numbers.typecode, itertools.compress(value.numbers, applied[0])))
+    except ArithmeticError:
+        return None
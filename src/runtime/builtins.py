@@ -0,0 +1,712 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Functions written in Python.
+
+A function takes one argument: `x > neg`. Functions of several arguments take a list of them,
+`1, 2 > add`. Builtins return Values, or Python ints, floats, strings, lists and None (for
+unit), which the VM turns into Values. Wrong arguments raise `Failure`.
+
+`range`, and `map`, `filter`, `sort`... of its result, make lists of numbers stored in arrays,
+see `src.runtime.arrays`.
+
+`append` and `set` make lists stored in persistent vectors, and dicts are persistent hash maps
+(see `src.runtime.persistent`): updating one takes O(log n) and leaves the old one as it was,
+sharing most of it, instead of copying it.
+
+In lazy mode (`VM.lazy`), `range`, `map` and `filter` make lazy lists, whose items are only
+computed when they are needed. `map`, `filter`, `take`, `drop` and `rest` of a lazy list are
+lazy in any mode, and builtins which go through a list walk a lazy one without computing it
+all at once.
+"""
+
+# Global Python imports
+import builtins
+import copyreg
+import itertools
+import math
+import operator
+import pickle
+from array import array
+from typing import Any, Callable, Iterator, NamedTuple
+# Huitr API imports
+from src.error.error import TypeError, ValueError, ZeroDivisionError
+from src.runtime.arrays import number_list, map_numbers, filter_numbers
+from src.runtime.memo import MemoCache, DEFAULT_MAX_SIZE
+from src.runtime.persistent import Vector, HashMap
+from src.runtime.value import Value
+from src.runtime.values import (
+    Int, Float, String, List, LazyList, NumberList, VectorList, Dict, Unit, Function, BuiltinFunction, UNIT, int_value,
+)
+from src.runtime.vm import VM, Call, Failure
+
+
+class Builtin(NamedTuple):
+    name: str
+    function: Callable[[VM, Value], Any]  # takes the argument as is, see `builtin`
+    pure: bool  # the result only depends on the argument, and calling it does nothing else
+
+
+BUILTINS: dict[str, Builtin] = {}
+
+
+def builtin(name: str, arity: int | None = None, pure: bool = True):
+    """Registers a builtin. With an arity, its argument must be a list of that many values,
+    which are given to the Python function as separate arguments."""
+    def register(function: Callable[..., Any]) -> Callable[..., Any]:
+        if arity is None:
+            call = function
+        else:
+            def call(vm: VM, argument: Value) -> Any:
+                if not isinstance(argument, List) or len(argument.value) != arity:
+                    raise Failure(TypeError, f"{name} takes a list of {arity} values, not {describe(argument)}")
+                return function(vm, *argument.value)
+        BUILTINS[name] = Builtin(name, call, pure)
+        return function
+    return register
+
+
+_VALUES: dict[str, BuiltinFunction] = {}
+
+
+def builtin_values() -> dict[str, BuiltinFunction]:
+    """A BuiltinFunction for each builtin, the same ones each time"""
+    for name, builtin in BUILTINS.items():
+        if name not in _VALUES:
+            _VALUES[name] = BuiltinFunction(name, builtin.function, builtin.pure)
+    return _VALUES
+
+
+def _reduce_builtin_value(function: BuiltinFunction) -> tuple:
+    # Pickled by name, the builtins made by the program (memo...) can not be
+    if _VALUES.get(function.name) is not function:
+        raise pickle.PicklingError(f"{function!r} is made by the program")
+    return _builtin_value, (function.name,)
+
+
+def _builtin_value(name: str) -> BuiltinFunction:
+    return builtin_values()[name]
+
+
+copyreg.pickle(BuiltinFunction, _reduce_builtin_value)
+
+
+def describe(value: Value) -> str:
+    if isinstance(value, LazyList):
+        return "a lazy list"  # which can be infinite
+    if isinstance(value, NumberList):
+        return f"a list of {len(value.numbers)}"
+    if isinstance(value, VectorList):
+        return f"a list of {len(value.vector)}"
+    if isinstance(value, Dict):
+        return f"a dict of {len(value.value)}"
+    if isinstance(value, List):
+        return f"a list of {len(value.value)}"
+    if isinstance(value, (Function, BuiltinFunction)):
+        return "a function"
+    return f"{value.type} {value!r}"
+
+
+def truthy(value: Value) -> bool:
+    """0, 0.0, "", [] and () are false, everything else is true"""
+    if isinstance(value, Unit):
+        return False
+    if isinstance(value, LazyList):
+        return next(value.iterate(), None) is not None
+    if isinstance(value, NumberList):
+        return bool(value.numbers)
+    if isinstance(value, VectorList):
+        return bool(len(value.vector))
+    if isinstance(value, (Int, Float, String, List, Dict)):
+        return bool(value.value)
+    return True
+
+
+def equal(value: Value, other: Value) -> bool:
+    pairs = [(value, other)]
+    while pairs:
+        value, other = pairs.pop()
+        if isinstance(value, (Int, Float)) and isinstance(other, (Int, Float)):
+            if value.value != other.value:
+                return False
+        elif isinstance(value, List) and isinstance(other, List):
+            if len(value.value) != len(other.value):
+                return False
+            pairs.extend(zip(value.value, other.value))
+        elif isinstance(value, String) and isinstance(other, String):
+            if value.value != other.value:
+                return False
+        elif isinstance(value, Unit) and isinstance(other, Unit):
+            continue
+        elif isinstance(value, Dict) and isinstance(other, Dict):
+            # Keys are the same values, the values bound to them are equal
+            if len(value.value) != len(other.value):
+                return False
+            for key, item in value.value.items():
+                other_item = other.value.get(key)
+                if other_item is None:
+                    return False
+                pairs.append((item, other_item))
+        elif value is not other:
+            return False
+    return True
+
+
+def number(value: Value, name: str) -> int | float:
+    if not isinstance(value, (Int, Float)):
+        raise Failure(TypeError, f"{name} takes numbers, not {describe(value)}")
+    return value.value
+
+
+def integer(value: Value, name: str) -> int:
+    if not isinstance(value, Int):
+        raise Failure(TypeError, f"{name} takes integers, not {describe(value)}")
+    return value.value
+
+
+def items(value: Value, name: str) -> list[Value]:
+    if not isinstance(value, List):
+        raise Failure(TypeError, f"{name} takes a list, not {describe(value)}")
+    return value.value
+
+
+def each(value: Value, name: str) -> Iterator[Value]:
+    """Items of a list, computed one at a time for a lazy list"""
+    if isinstance(value, LazyList):
+        return value.iterate()
+    if isinstance(value, VectorList):
+        return iter(value.vector)
+    return iter(items(value, name))
+
+
+def walks(value: Value, name: str) -> Callable[[], Iterator[Value]]:
+    """Makes iterators on the items of a list, which is checked now"""
+    if isinstance(value, LazyList):
+        return value.iterate
+    if isinstance(value, VectorList):
+        return value.vector.__iter__
+    values = items(value, name)
+    return lambda: iter(values)
+
+
+def vector(value: Value, name: str) -> Vector:
+    """Items of a list in a persistent vector, made from them if they are not in one"""
+    if isinstance(value, VectorList):
+        return value.vector
+    return Vector(each(value, name))
+
+
+def dictionary(value: Value, name: str) -> Dict:
+    if not isinstance(value, Dict):
+        raise Failure(TypeError, f"{name} takes a dict, not {describe(value)}")
+    return value
+
+
+def _comparable(value: Value, other: Value, name: str) -> tuple[Any, Any]:
+    if isinstance(value, String) and isinstance(other, String):
+        return value.value, other.value
+    return number(value, name), number(other, name)
+
+
+# Numbers
+
+@builtin("add", 2)
+def add(vm: VM, value: Value, other: Value) -> Any:
+    """Adds numbers, or joins strings or lists"""
+    if isinstance(value, String) and isinstance(other, String):
+        return value.value + other.value
+    if isinstance(value, NumberList) and isinstance(other, NumberList) and value.numbers.typecode == other.numbers.typecode:
+        return NumberList(value.numbers + other.numbers)
+    if isinstance(value, VectorList) and isinstance(other, List):
+        return VectorList(value.vector.extend(each(other, "add")))
+    if isinstance(value, List) and isinstance(other, List):
+        return value.value + other.value
+    return number(value, "add") + number(other, "add")
+
+
+@builtin("sub", 2)
+def sub(vm: VM, value: Value, other: Value) -> Any:
+    return number(value, "sub") - number(other, "sub")
+
+
+@builtin("mul", 2)
+def mul(vm: VM, value: Value, other: Value) -> Any:
+    return number(value, "mul") * number(other, "mul")
+
+
+@builtin("div", 2)
+def div(vm: VM, value: Value, other: Value) -> Any:
+    divisor = number(other, "div")
+    if not divisor:
+        raise Failure(ZeroDivisionError, "division by zero")
+    return number(value, "div") / divisor
+
+
+@builtin("idiv", 2)
+def idiv(vm: VM, value: Value, other: Value) -> Any:
+    divisor = integer(other, "idiv")
+    if not divisor:
+        raise Failure(ZeroDivisionError, "division by zero")
+    return integer(value, "idiv") // divisor
+
+
+@builtin("mod", 2)
+def mod(vm: VM, value: Value, other: Value) -> Any:
+    divisor = number(other, "mod")
+    if not divisor:
+        raise Failure(ZeroDivisionError, "modulo by zero")
+    return number(value, "mod") % divisor
+
+
+@builtin("pow", 2)
+def pow_(vm: VM, value: Value, other: Value) -> Any:
+    base, exponent = number(value, "pow"), number(other, "pow")
+    if not base and exponent < 0:
+        raise Failure(ZeroDivisionError, "zero to a negative power")
+    try:
+        return base ** exponent
+    except OverflowError:
+        raise Failure(ValueError, "result too large")
+
+
+@builtin("neg")
+def neg(vm: VM, value: Value) -> Any:
+    return -number(value, "neg")
+
+
+@builtin("abs")
+def abs_(vm: VM, value: Value) -> Any:
+    return abs(number(value, "abs"))
+
+
+@builtin("sum")
+def sum_(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList):
+        return sum(value.numbers)
+    return sum(number(item, "sum") for item in each(value, "sum"))
+
+
+@builtin("min")
+def min_(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList) and value.numbers:
+        return min(value.numbers)
+    result = min(each(value, "min"), key=lambda item: number(item, "min"), default=None)
+    if result is None:
+        raise Failure(ValueError, "min of an empty list")
+    return result
+
+
+@builtin("max")
+def max_(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList) and value.numbers:
+        return max(value.numbers)
+    result = max(each(value, "max"), key=lambda item: number(item, "max"), default=None)
+    if result is None:
+        raise Failure(ValueError, "max of an empty list")
+    return result
+
+
+# Comparisons and logic, true is 1 and false is 0
+
+@builtin("eq", 2)
+def eq(vm: VM, value: Value, other: Value) -> Any:
+    return equal(value, other)
+
+
+@builtin("ne", 2)
+def ne(vm: VM, value: Value, other: Value) -> Any:
+    return not equal(value, other)
+
+
+def _comparison(name: str, compare: Callable[[Any, Any], bool]):
+    @builtin(name, 2)
+    def comparison(vm: VM, value: Value, other: Value) -> Any:
+        return compare(*_comparable(value, other, name))
+
+
+_comparison("lt", operator.lt)
+_comparison("le", operator.le)
+_comparison("gt", operator.gt)
+_comparison("ge", operator.ge)
+
+
+@builtin("not")
+def not_(vm: VM, value: Value) -> Any:
+    return not truthy(value)
+
+
+@builtin("and")
+def and_(vm: VM, value: Value) -> Any:
+    return all(map(truthy, each(value, "and")))
+
+
+@builtin("or")
+def or_(vm: VM, value: Value) -> Any:
+    return any(map(truthy, each(value, "or")))
+
+
+@builtin("if", 3)
+def if_(vm: VM, condition: Value, then: Value, otherwise: Value) -> Any:
+    """Returns `then` if condition is true, `otherwise` if not. A function is called with unit
+    instead, so only the branch taken is computed: `n, [1], [n > f] > if`."""
+    branch = then if truthy(condition) else otherwise
+    if isinstance(branch, (Function, BuiltinFunction)):
+        return Call(branch, UNIT)  # in the place of `if`, so recursion does not nest runs of the VM
+    return branch
+
+
+# Lists
+
+@builtin("len")
+def len_(vm: VM, value: Value) -> Any:
+    if isinstance(value, String):
+        return len(value.value)
+    if isinstance(value, LazyList):
+        return sum(1 for _ in value.iterate())
+    if isinstance(value, NumberList):
+        return len(value.numbers)
+    if isinstance(value, VectorList):
+        return len(value.vector)
+    if isinstance(value, Dict):
+        return len(value.value)
+    return len(items(value, "len"))
+
+
+@builtin("get", 2)
+def get(vm: VM, value: Value, index: Value) -> Any:
+    """Item of a list or character of a string at index, negative indexes count from the end,
+    or value bound to a key in a dict"""
+    if isinstance(value, Dict):
+        item = value.value.get(index)
+        if item is None:
+            raise Failure(ValueError, f"key {index!r} not in the dict")
+        return item
+    position = integer(index, "get")
+    if isinstance(value, LazyList) and position >= 0:
+        item = next(itertools.islice(value.iterate(), position, None), None)
+        if item is not None:
+            return item
+    if isinstance(value, NumberList):
+        sequence: Any = value.numbers
+    elif isinstance(value, VectorList):
+        sequence = value.vector
+    elif isinstance(value, String):
+        sequence = value.value
+    else:
+        sequence = items(value, "get")
+    if not -len(sequence) <= position < len(sequence):
+        raise Failure(ValueError, f"index {position} out of range for length {len(sequence)}")
+    return sequence[position]
+
+
+@builtin("first")
+def first(vm: VM, value: Value) -> Any:
+    item = next(each(value, "first"), None)
+    if item is None:
+        raise Failure(ValueError, "first of an empty list")
+    return item
+
+
+@builtin("last")
+def last(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList):
+        values: Any = value.numbers
+    elif isinstance(value, VectorList):
+        values = value.vector
+    else:
+        values = items(value, "last")
+    if not values:
+        raise Failure(ValueError, "last of an empty list")
+    return values[-1]
+
+
+@builtin("rest")
+def rest(vm: VM, value: Value) -> Any:
+    if isinstance(value, LazyList):
+        return LazyList(lambda: itertools.islice(value.iterate(), 1, None))
+    if isinstance(value, NumberList):
+        return NumberList(value.numbers[1:])
+    return items(value, "rest")[1:]
+
+
+@builtin("append", 2)
+def append(vm: VM, value: Value, item: Value) -> Any:
+    return VectorList(vector(value, "append").append(item))
+
+
+@builtin("set", 3)
+def set_(vm: VM, value: Value, key: Value, item: Value) -> Any:
+    """`list, index, item > set` is the list with item at index instead, negative indexes count
+    from the end. `dict, key, item > set` is the dict with key bound to item."""
+    if isinstance(value, Dict):
+        return Dict(value.value.set(key, item))
+    position = integer(key, "set")
+    values = vector(value, "set")
+    if not -len(values) <= position < len(values):
+        raise Failure(ValueError, f"index {position} out of range for length {len(values)}")
+    return VectorList(values.set(position, item))
+
+
+@builtin("concat")
+def concat(vm: VM, value: Value) -> Any:
+    """Joins a list of lists, or of strings"""
+    parts = items(value, "concat")
+    if parts and all(isinstance(part, String) for part in parts):
+        return "".join(part.value for part in parts)
+    return [item for part in parts for item in items(part, "concat")]
+
+
+@builtin("take", 2)
+def take(vm: VM, value: Value, count: Value) -> Any:
+    stop = max(0, integer(count, "take"))
+    if isinstance(value, LazyList):
+        return LazyList(lambda: itertools.islice(value.iterate(), stop))
+    if isinstance(value, NumberList):
+        return NumberList(value.numbers[:stop])
+    return items(value, "take")[:stop]
+
+
+@builtin("drop", 2)
+def drop(vm: VM, value: Value, count: Value) -> Any:
+    start = max(0, integer(count, "drop"))
+    if isinstance(value, LazyList):
+        return LazyList(lambda: itertools.islice(value.iterate(), start, None))
+    if isinstance(value, NumberList):
+        return NumberList(value.numbers[start:])
+    return items(value, "drop")[start:]
+
+
+@builtin("reverse")
+def reverse(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList):
+        return NumberList(value.numbers[::-1])
+    return items(value, "reverse")[::-1]
+
+
+@builtin("range")
+def range_(vm: VM, value: Value) -> Any:
+    """`n > range` is 0 to n-1, `start, stop > range` and `start, stop, step > range` are like in Python"""
+    bounds = [integer(item, "range") for item in items(value, "range")] if isinstance(value, List) else [integer(value, "range")]
+    if not 1 <= len(bounds) <= 3:
+        raise Failure(TypeError, f"range takes 1 to 3 integers, not {len(bounds)}")
+    if len(bounds) == 3 and not bounds[2]:
+        raise Failure(ValueError, "range step can not be zero")
+    if vm.lazy:
+        return LazyList(lambda: map(int_value, range(*bounds)))
+    return number_list(range(*bounds), "q")
+
+
+@builtin("sort")
+def sort(vm: VM, value: Value) -> Any:
+    if isinstance(value, NumberList):
+        return NumberList(array(value.numbers.typecode, sorted(value.numbers)))
+    values = items(value, "sort")
+    if all(isinstance(item, String) for item in values):
+        return sorted(values, key=lambda item: item.value)
+    return sorted(values, key=lambda item: number(item, "sort"))
+
+
+@builtin("map", 2)
+def map_(vm: VM, value: Value, function: Value) -> Any:
+    if vm.lazy or isinstance(value, LazyList):
+        values = walks(value, "map")
+        return LazyList(lambda: (vm.call(function, item) for item in values()))
+    if isinstance(value, NumberList):
+        result = map_numbers(value, function)
+        if result is not None:
+            return result
+    values = items(value, "map")
+    if not values:
+        return []
+    results: list[Value] = []
+
+    def then(result: Value) -> Value | Call:
+        results.append(result)
+        if len(results) == len(values):
+            return List(results)
+        return Call(function, values[len(results)], then)
+    return Call(function, values[0], then)  # one item after the other, see `Call`
+
+
+@builtin("filter", 2)
+def filter_(vm: VM, value: Value, function: Value) -> Any:
+    if vm.lazy or isinstance(value, LazyList):
+        values = walks(value, "filter")
+        return LazyList(lambda: (item for item in values() if truthy(vm.call(function, item))))
+    if isinstance(value, NumberList):
+        result = filter_numbers(value, function)
+        if result is not None:
+            return result
+    values = items(value, "filter")
+    if not values:
+        return []
+    kept: list[Value] = []
+    index = 0
+
+    def then(result: Value) -> Value | Call:
+        nonlocal index
+        if truthy(result):
+            kept.append(values[index])
+        index += 1
+        if index == len(values):
+            return List(kept)
+        return Call(function, values[index], then)
+    return Call(function, values[0], then)
+
+
+@builtin("reduce", 3)
+def reduce(vm: VM, value: Value, initial: Value, function: Value) -> Any:
+    """Calls function with the list of the result so far and the next item"""
+    values = each(value, "reduce")
+
+    def then(result: Value) -> Value | Call:
+        for item in values:
+            return Call(function, List([result, item]), then)
+        return result
+    return then(initial)
+
+
+@builtin("iterate", 2)
+def iterate_(vm: VM, value: Value, function: Value) -> Any:
+    """The infinite lazy list of value, value > function, value > function > function..."""
+    if not isinstance(function, (Function, BuiltinFunction)):
+        raise Failure(TypeError, f"iterate takes a function, not {describe(function)}")
+
+    def values() -> Iterator[Value]:
+        item = value
+        while True:
+            yield item
+            item = vm.call(function, item)
+    return LazyList(values)
+
+
+# Dicts
+
+@builtin("dict")
+def dict_(vm: VM, value: Value) -> Any:
+    """A dict of a list of key, value pairs: `("a", 1), ("b", 2) > dict`, `() > dict` is empty"""
+    if isinstance(value, Unit):
+        return Dict(HashMap())
+    pairs = []
+    for pair in each(value, "dict"):
+        if not isinstance(pair, List) or len(pair.value) != 2:
+            raise Failure(TypeError, f"dict takes a list of key, value pairs, not of {describe(pair)}")
+        pairs.append(tuple(pair.value))
+    return Dict(HashMap(pairs))
+
+
+@builtin("has", 2)
+def has(vm: VM, value: Value, key: Value) -> Any:
+    return key in dictionary(value, "has").value
+
+
+@builtin("remove", 2)
+def remove(vm: VM, value: Value, key: Value) -> Any:
+    """The dict without key, which does not have to be in it"""
+    return Dict(dictionary(value, "remove").value.remove(key))
+
+
+@builtin("keys")
+def keys(vm: VM, value: Value) -> Any:
+    """Keys of a dict, by their printed values"""
+    return [key for key, _ in dictionary(value, "keys").pairs()]
+
+
+@builtin("values")
+def values_(vm: VM, value: Value) -> Any:
+    """Values of a dict, in the order of `keys`"""
+    return [item for _, item in dictionary(value, "values").pairs()]
+
+
+@builtin("pairs")
+def pairs_(vm: VM, value: Value) -> Any:
+    """Key, value pairs of a dict, in the order of `keys`"""
+    return [List([key, item]) for key, item in dictionary(value, "pairs").pairs()]
+
+
+# Strings and conversions
+
+@builtin("str")
+def str_(vm: VM, value: Value) -> Any:
+    return value.value if isinstance(value, String) else repr(value)
+
+
+@builtin("int")
+def int_(vm: VM, value: Value) -> Any:
+    if isinstance(value, String):
+        try:
+            return int(value.value)
+        except builtins.ValueError:
+            raise Failure(ValueError, f"invalid integer {value!r}")
+    result = number(value, "int")
+    if not math.isfinite(result):
+        raise Failure(ValueError, f"{value!r} can not be an integer")
+    return int(result)
+
+
+@builtin("float")
+def float_(vm: VM, value: Value) -> Any:
+    if isinstance(value, String):
+        try:
+            return float(value.value)
+        except builtins.ValueError:
+            raise Failure(ValueError, f"invalid float {value!r}")
+    return float(number(value, "float"))
+
+
+@builtin("join", 2)
+def join(vm: VM, value: Value, separator: Value) -> Any:
+    if not isinstance(separator, String):
+        raise Failure(TypeError, f"join takes a string separator, not {describe(separator)}")
+    strings = items(value, "join")
+    if not all(isinstance(item, String) for item in strings):
+        raise Failure(TypeError, "join takes a list of strings")
+    return separator.value.join(item.value for item in strings)
+
+
+# Functions
+
+@builtin("memo")
+def memo(vm: VM, value: Value) -> Any:
+    """`f > memo` is f, remembering the results of its last calls: a call with an argument equal
+    to an earlier one returns the same result without calling f again. `f, n > memo` remembers
+    n results. Only for functions which do nothing else than returning a value."""
+    if isinstance(value, List):
+        if len(value.value) != 2:
+            raise Failure(TypeError, f"memo takes a function, or a list of a function and a size, not {describe(value)}")
+        function, max_size = value.value[0], integer(value.value[1], "memo")
+        if max_size < 1:
+            raise Failure(ValueError, f"memo size must be positive, not {max_size}")
+    else:
+        function, max_size = value, DEFAULT_MAX_SIZE
+    if not isinstance(function, (Function, BuiltinFunction)):
+        raise Failure(TypeError, f"memo takes a function, not {describe(function)}")
+    name = "memo of " + (function.value.name if isinstance(function, Function) else function.name)
+    cache = MemoCache(name, max_size)
+    vm.memo_caches.append(cache)
+
+    def call(vm: VM, argument: Value) -> Any:
+        result = cache.get(argument)
+        if result is not None:
+            return result
+
+        def then(result: Value) -> Value:
+            cache.put(argument, result)
+            return result
+        return Call(function, argument, then)
+    return BuiltinFunction(name, call)
+
+
+# Input and output
+
+@builtin("print", pure=False)
+def print_(vm: VM, value: Value) -> Any:
+    """Prints a value (strings without quotes), and returns it"""
+    print(value.value if isinstance(value, String) else repr(value))
+    return value
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Bytecode run by `src.runtime.vm`.
+
+Each instruction is two ints, its opcode and its argument, so instruction i is at 2*i in
+`Code.instructions`. The source offsets of instruction i are `starts[i]` and `ends[i]`.
+
+Names are resolved by the compiler: the names a scope binds are in slots of its context, in
+the order of `Code.names`, and builtins are constants. Running the code never looks a name up.
+"""
+
+# Global Python imports
+from array import array
+from enum import IntEnum
+from typing import Any
+# Huitr API imports
+from src.lexer.position import Position
+from src.lexer.source_file import SourceFile
+
+
+class Opcode(IntEnum):
+    CONST = 0  # push constants[argument]
+    LOAD_ARG = 1  # push the argument of the function `argument` levels out (0 is the innermost)
+    LOAD_LOCAL = 2  # push the value in the slot `argument` of the context
+    STORE_LOCAL = 3  # put the top of the stack, which stays, in the slot `argument` of the context
+    BUILD_LIST = 4  # pop `argument` values, push the list of them
+    MAKE_FUNCTION = 5  # push a function running the code constants[argument]
+    CALL = 6  # pop a function then its argument, push the result of the call
+    POP = 7  # pop the top of the stack
+    RETURN = 8  # return the top of the stack
+    LOAD_OUTER = 9  # push the value in a slot of a context around, at outer[argument]
+    LOAD_MODULE = 10  # push the value of the name of a module constants[argument], see `src.runtime.modules`
+    # With more than one worker, push the list of the items of constants[argument] evaluated in
+    # parallel and jump to its end, see `src.runtime.parallel`. Else, do nothing.
+    PARALLEL = 11
+
+
+class Code:
+    """Compiled body of a function, or of a whole program"""
+    __slots__ = ("instructions", "constants", "names", "outer", "starts", "ends", "source_file", "name")
+
+    def __init__(self, source_file: SourceFile, name: str):
+        self.instructions = array("i")
+        self.constants: list[Any] = []
+        self.names: list[str] = []  # bound in the scope, by slot
+        self.outer: list[tuple[int, int, str]] = []  # how many functions out, slot and name
+        self.starts = array("i")
+        self.ends = array("i")
+        self.source_file = source_file
+        self.name = name
+
+    def emit(self, opcode: Opcode, argument: int, start: int, end: int):
+        self.instructions.append(opcode)
+        self.instructions.append(argument)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def positions(self, offset: int) -> tuple[Position, Position]:
+        """Positions of the instruction at `offset` in `instructions`"""
+        index = offset // 2
+        return Position(self.starts[index], self.source_file), Position(self.ends[index], self.source_file)
+
+    def disassemble(self) -> str:
+        """Lists the instructions of the code, then of the functions defined in it"""
+        lines = []
+        codes = [self]
+        while codes:
+            code = codes.pop()
+            lines.append(f"code {code.name}:")
+            for offset in range(0, len(code.instructions), 2):
+                opcode, argument = Opcode(code.instructions[offset]), code.instructions[offset + 1]
+                line = f"  {offset // 2:>4} {opcode.name:<13} {argument}"
+                if opcode in (Opcode.CONST, Opcode.MAKE_FUNCTION, Opcode.LOAD_MODULE, Opcode.PARALLEL):
+                    constant = code.constants[argument]
+                    line += f" ({constant.name if isinstance(constant, Code) else constant!r})"
+                elif opcode in (Opcode.LOAD_LOCAL, Opcode.STORE_LOCAL):
+                    line += f" ({code.names[argument]})"
+                elif opcode == Opcode.LOAD_OUTER:
+                    depth, slot, name = code.outer[argument]
+                    line += f" ({name}, {depth} out, slot {slot})"
+                lines.append(line)
+            inner_codes = []
+            for constant in code.constants:
+                if isinstance(constant, Code):
+                    inner_codes.append(constant)
+                else:  # the items of PARALLEL
+                    inner_codes += getattr(constant, "codes", ())
+            codes += reversed(inner_codes)
+        return "\n".join(lines)
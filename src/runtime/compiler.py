@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compiles trees to the bytecode of `src.runtime.bytecode`.
+
+- A program and a function body are statements run in order, their value is the value of the
+  last one (unit when there is none).
+- `x > f > g` calls f with x, then g with the result. `a, b` is a list, so `a, b > f` calls f
+  with the list [a, b].
+- A statement ending with `> name` binds name in its scope, when name is not a builtin and not
+  bound yet in this scope or in the scopes around. Names bound in a scope can be used anywhere
+  in it, so functions can call themselves or each other.
+- Names are resolved here: to a slot of the scope binding them, which is some functions out, or
+  to a builtin. Using a name which is neither is a ReferenceError before the program runs.
+- `a::b::name` and `::a::b::name` are names of modules, which are found here but only loaded
+  when the name is used, see `src.runtime.modules`.
+- `[...]` is a function. In its body, `_` is its argument, `__` the argument of the function
+  around it, and so on.
+- Given a threshold, lists whose items are costly get their items compiled a second time, each
+  on its own, to be evaluated in parallel, see `src.runtime.parallel`.
+"""
+
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+import math
+from typing import Any, TYPE_CHECKING
+# Huitr API imports
+from src.error.error import Error, ModuleNotFoundError, ReferenceError
+from src.lexer.source_file import SourceFile
+from src.parser.nodes import Node, ChainNode, ListNode, StringNode, IntNode, FloatNode, NoNode, LibIdentifierNode
+from src.parser.nodes import IdentifierNode, FuncDefNode, UnitNode
+from src.runtime.builtins import BUILTINS, builtin_values
+from src.runtime.bytecode import Code, Opcode
+from src.runtime.parallel import ParallelList, costs
+from src.runtime.values import Int, Float, String, UNIT, int_value
+if TYPE_CHECKING:
+    from src.runtime.modules import Importer
+
+
+class CompileError(Exception):
+    """Raised while compiling with the Error, caught by `compile_tree`"""
+    def __init__(self, error: Error):
+        super().__init__(error.message)
+        self.error = error
+
+
+# Builtins are compiled as constants, they can not be bound to something else
+_BUILTIN_VALUES = builtin_values()
+
+
+class _Scope:
+    """Code being compiled for a program, a function or an item of a parallel list, with the
+    names its statements bind"""
+    __slots__ = ("code", "names", "constant_indexes", "outer_indexes")
+
+    def __init__(self, code: Code, names: list[str]):
+        self.code = code
+        code.names = names
+        self.names = {name: slot for slot, name in enumerate(names)}
+        self.constant_indexes: dict[tuple[type, Any], int] = {}
+        self.outer_indexes: dict[tuple[int, int], int] = {}
+
+    def constant(self, value: Any) -> int:
+        if isinstance(value, Float):
+            key = (Float, value.value, math.copysign(1, value.value))  # 0.0 and -0.0 are not the same constant
+        else:
+            key = (type(value), value.value if isinstance(value, (Int, String)) else value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = self.constant_indexes[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return index
+
+    def outer(self, depth: int, slot: int, name: str) -> int:
+        """Index in `Code.outer` of the slot of a scope `depth` functions out"""
+        index = self.outer_indexes.get((depth, slot))
+        if index is None:
+            index = self.outer_indexes[depth, slot] = len(self.code.outer)
+            self.code.outer.append((depth, slot, name))
+        return index
+
+
+# Tasks of the compiler, on its stack
+_NODE = 0  # compile the node
+_EMIT = 1  # emit the instruction, at the positions of the node
+_BEGIN_FUNCTION = 2  # compile the body of the function in a new scope
+_END_FUNCTION = 3  # finish the code of the function, then make it in the scope around
+_BEGIN_ITEM = 4  # compile an item of a parallel list in a new scope
+_END_ITEM = 5  # finish the code of the item, add it to the ParallelList
+_END_PARALLEL = 6  # the usual code of the list is compiled, set where it ends
+
+
+def argument_depth(name: str) -> int | None:
+    """How many functions out `_`, `__`... refer to, None for other names"""
+    if name.strip("_"):
+        return None
+    return len(name) - 1
+
+
+def binding_name(statement: Node) -> str | None:
+    """The name a statement `... > name` would bind, if it binds a name"""
+    if not isinstance(statement, ChainNode) or len(statement.chain) < 2:
+        return None
+    last = statement.chain[-1]
+    if not isinstance(last, IdentifierNode) or len(last.identifiers_list) != 1:
+        return None
+    name = str(last.identifiers_list[0].value)
+    if argument_depth(name) is not None or name in BUILTINS:
+        return None
+    return name
+
+
+def scope_bindings(statements: list[Node], outer_names: set[str]) -> list[str | None]:
+    """The name each statement of a scope binds, or None. `outer_names` are bound in the scopes around."""
+    names: set[str] = set()
+    bindings = []
+    for statement in statements:
+        name = binding_name(statement)
+        if name is not None and (name in names or name in outer_names):
+            name = None  # already bound: this is a call
+        if name is not None:
+            names.add(name)
+        bindings.append(name)
+    return bindings
+
+
+def statements_of(body: Node) -> list[Node]:
+    """Statements of a program or of the body of a function"""
+    if isinstance(body, ListNode):
+        return body.list
+    assert isinstance(body, NoNode)
+    return []
+
+
+def compile_tree(
+    tree: Node, source_file: SourceFile, importer: Importer | None = None, parallel_threshold: int | None = None,
+) -> tuple[Code, None] | tuple[None, Error]:
+    """Compiles a program, whose modules are found by `importer` (without one, it can not use any).
+    Lists with at least two items costing `parallel_threshold` can be evaluated in parallel."""
+    try:
+        return _Compiler(source_file, importer, parallel_threshold).compile(tree), None
+    except CompileError as e:
+        return None, e.error
+
+
+class _Compiler:
+    def __init__(self, source_file: SourceFile, importer: Importer | None, parallel_threshold: int | None):
+        self.source_file = source_file
+        self.importer = importer
+        self.parallel_threshold = parallel_threshold
+        self.costs: dict[int, int] = {}  # of the nodes, by id
+        self.in_parallel = 0  # how many parallel lists the node is in
+        self.scopes: list[_Scope] = []
+        self.functions: list[int] = []  # index in `scopes` of the functions, whose argument is `_`
+        self.bound: dict[str, tuple[int, int]] = {}  # index in `scopes` and slot of the names bound
+        self.tasks: list[tuple] = []
+
+    def compile(self, tree: Node) -> Code:
+        if self.parallel_threshold is not None:
+            self.costs = costs(tree)
+        # Trees can be nested deeper than the recursion limit: tasks are on a stack
+        self.begin_scope(Code(self.source_file, "<program>"), tree, None)
+        tasks = self.tasks
+        while tasks:
+            task = tasks.pop()
+            kind = task[0]
+            if kind == _NODE:
+                self.node(task[1])
+            elif kind == _EMIT:
+                _, opcode, argument, node = task
+                self.emit(opcode, argument, node)
+            elif kind == _BEGIN_FUNCTION:
+                node = task[1]
+                name = f"function at line {node.pos_start.line_number + 1}, column {node.pos_start.column + 1}"
+                self.begin_scope(Code(self.source_file, name), node.body_node, node)
+                self.functions.append(len(self.scopes) - 1)
+            elif kind == _END_FUNCTION:
+                node = task[1]
+                code = self.end_scope(node)
+                self.functions.pop()
+                self.emit(Opcode.MAKE_FUNCTION, self.scopes[-1].constant(code), node)
+            elif kind == _BEGIN_ITEM:
+                node = task[1]
+                name = f"item at line {node.pos_start.line_number + 1}, column {node.pos_start.column + 1}"
+                self.scopes.append(_Scope(Code(self.source_file, name), []))
+            elif kind == _END_ITEM:
+                _, node, parallel_list = task
+                parallel_list.codes.append(self.end_scope(node))
+            else:
+                task[1].end = len(self.scopes[-1].code.instructions)
+                self.in_parallel -= 1
+        return self.end_scope(None)
+
+    def emit(self, opcode: Opcode, argument: int, node: Node | None):
+        if node is None or isinstance(node, NoNode):
+            start = end = 0
+        else:
+            start, end = node.pos_start.index, node.pos_end.index
+        self.scopes[-1].code.emit(opcode, argument, start, end)
+
+    def begin_scope(self, code: Code, body: Node, function: FuncDefNode | None):
+        """Starts compiling statements in a new scope. `function` is the function they are the body of."""
+        statements = statements_of(body)
+        bindings = scope_bindings(statements, set(self.bound))
+        scope = _Scope(code, [name for name in bindings if name is not None])
+        for name, slot in scope.names.items():
+            self.bound[name] = (len(self.scopes), slot)
+        self.scopes.append(scope)
+
+        tasks: list[tuple] = []
+        for index, (statement, name) in enumerate(zip(statements, bindings)):
+            if name is None:
+                tasks.append((_NODE, statement))
+            else:
+                assert isinstance(statement, ChainNode)
+                chain = statement.chain
+                value = chain[0] if len(chain) == 2 else ChainNode(chain[:-1], chain[0].pos_start, chain[-2].pos_end)
+                tasks.append((_NODE, value))
+                tasks.append((_EMIT, Opcode.STORE_LOCAL, scope.names[name], chain[-1]))
+            if index < len(statements) - 1:
+                tasks.append((_EMIT, Opcode.POP, 0, statement))
+        if not statements:
+            tasks.append((_EMIT, Opcode.CONST, scope.constant(UNIT), function))
+        self.tasks.extend(reversed(tasks))
+
+    def end_scope(self, node: Node | None) -> Code:
+        """Finishes the code of the scope, returning at the positions of node"""
+        self.emit(Opcode.RETURN, 0, node)
+        scope = self.scopes.pop()
+        for name in scope.names:
+            del self.bound[name]
+        return scope.code
+
+    def node(self, node: Node):
+        """Compiles an expression: pushes the tasks compiling it, or emits its instructions"""
+        scope = self.scopes[-1]
+        if isinstance(node, ChainNode):
+            tasks = [(_NODE, node.chain[0])]
+            for stage in node.chain[1:]:
+                tasks.append((_NODE, stage))
+                tasks.append((_EMIT, Opcode.CALL, 0, stage))
+            self.tasks.extend(reversed(tasks))
+        elif isinstance(node, ListNode):
+            if self.is_parallel(node):
+                self.parallel_list(node)
+                return
+            self.tasks.append((_EMIT, Opcode.BUILD_LIST, len(node.list), node))
+            self.tasks.extend((_NODE, item) for item in reversed(node.list))
+        elif isinstance(node, FuncDefNode):
+            self.tasks.append((_END_FUNCTION, node))
+            self.tasks.append((_BEGIN_FUNCTION, node))
+        elif isinstance(node, IdentifierNode):
+            self.identifier(node)
+        elif isinstance(node, IntNode):
+            self.emit(Opcode.CONST, scope.constant(int_value(node.int_token.value)), node)  # type: ignore
+        elif isinstance(node, FloatNode):
+            self.emit(Opcode.CONST, scope.constant(Float(node.float_token.value)), node)  # type: ignore
+        elif isinstance(node, StringNode):
+            self.emit(Opcode.CONST, scope.constant(String(node.string_token.value)), node)  # type: ignore
+        elif isinstance(node, UnitNode):
+            self.emit(Opcode.CONST, scope.constant(UNIT), node)
+        elif isinstance(node, LibIdentifierNode):
+            names = [str(token.value) for token in node.identifiers_list if token.type == "IDENTIFIER"]
+            if node.identifiers_list[-1].type == "NAMESP":  # `::lib::`, the whole module
+                self.module_name(names, True, None, node)
+            elif len(names) > 1:
+                self.module_name(names[:-1], True, names[-1], node)
+            else:
+                raise CompileError(ModuleNotFoundError(f"'::{names[0]}' is not in a module", node.pos_start, node.pos_end))
+        else:
+            raise AssertionError(f"can not compile {type(node).__name__}")
+
+    def is_parallel(self, node: ListNode) -> bool:
+        """Whether to compile a list to be evaluated in parallel, not in a list which is"""
+        threshold = self.parallel_threshold
+        if threshold is None or self.in_parallel:
+            return False
+        return sum(self.costs.get(id(item), 0) >= threshold for item in node.list) >= 2
+
+    def parallel_list(self, node: ListNode):
+        """PARALLEL, then the usual code of the list, which it jumps over with more than one worker"""
+        parallel_list = ParallelList()
+        self.in_parallel += 1
+        tasks: list[tuple] = []
+        for item in node.list:
+            tasks += [(_BEGIN_ITEM, item), (_NODE, item), (_END_ITEM, item, parallel_list)]
+        tasks.append((_EMIT, Opcode.PARALLEL, self.scopes[-1].constant(parallel_list), node))
+        tasks += [(_NODE, item) for item in node.list]
+        tasks.append((_EMIT, Opcode.BUILD_LIST, len(node.list), node))
+        tasks.append((_END_PARALLEL, parallel_list))
+        self.tasks.extend(reversed(tasks))
+
+    def identifier(self, node: IdentifierNode):
+        if len(node.identifiers_list) > 1:
+            names = [str(token.value) for token in node.identifiers_list]
+            self.module_name(names[:-1], False, names[-1], node)
+            return
+        name = str(node.identifiers_list[0].value)
+        depth = argument_depth(name)
+        if depth is None:
+            self.name(name, node)
+        elif depth >= len(self.functions):
+            raise CompileError(ReferenceError(
+                f"'{name}' is the argument of a function {depth + 1} levels out, there are {len(self.functions)}",
+                node.pos_start, node.pos_end,
+            ))
+        else:
+            # The items of parallel lists are scopes too, whose argument is unit
+            self.emit(Opcode.LOAD_ARG, len(self.scopes) - 1 - self.functions[-1 - depth], node)
+
+    def name(self, name: str, node: IdentifierNode):
+        scope = self.scopes[-1]
+        bound = self.bound.get(name)
+        if bound is not None:
+            scope_index, slot = bound
+            depth = len(self.scopes) - 1 - scope_index
+            if depth:
+                self.emit(Opcode.LOAD_OUTER, scope.outer(depth, slot, name), node)
+            else:
+                self.emit(Opcode.LOAD_LOCAL, slot, node)
+        elif name in _BUILTIN_VALUES:
+            self.emit(Opcode.CONST, scope.constant(_BUILTIN_VALUES[name]), node)
+        else:
+            raise CompileError(ReferenceError(f"name '{name}' is not defined", node.pos_start, node.pos_end))
+
+    def module_name(self, namespace: list[str], absolute: bool, name: str | None, node: Node):
+        written = ("::" if absolute else "") + "::".join(namespace) + "::" + (name or "")
+        if self.importer is None:
+            raise CompileError(ModuleNotFoundError(f"can not load '{written}', modules can not be used here", node.pos_start, node.pos_end))
+        imported = self.importer.find(namespace, absolute, name)
+        if imported is None:
+            raise CompileError(ModuleNotFoundError(f"no module {'::'.join(namespace)} for '{written}'", node.pos_start, node.pos_end))
+        self.emit(Opcode.LOAD_MODULE, self.scopes[-1].constant(imported), node)
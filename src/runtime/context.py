@@ -7,9 +7,24 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# __future__ imports (must be first)
+from __future__ import annotations
 # Global Python imports
-from typing import TypedDict
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from src.runtime.value import Value
 
+# Slots of the contexts of the functions which bind no names, most of them
+_NO_SLOTS = ()
 
-class Context(TypedDict):
-    ...
+
+class Context:
+    """Values of the names bound in a scope: the whole program, or a call of a function. The
+    compiler gives each name a slot, see `Code.names`, None until the name is bound.
+    `argument` is what the function was called with, `_` in its body."""
+    __slots__ = ("parent", "argument", "slots")
+
+    def __init__(self, parent: Context | None, argument: Value | None, size: int):
+        self.parent = parent
+        self.argument = argument
+        self.slots: list[Value | None] = [None] * size if size else _NO_SLOTS  # type: ignore
@@ -2,29 +2,33 @@
 # -*- coding:utf-8 -*-
 
 # Huitr - a purely functional programming language.
-# Copyright (C) 2024  3fxcf9, jd-develop
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 # Huitr API imports
-from src.parser.nodes import *
-
-
-def visit_chain_node(node: ChainNode):
-    ...
-
-
-def visit_list_node(node: ListNode):
-    ...
-
-
-def visit(node: Node):
-    """Visit (execute) a node"""
-    if isinstance(node, ChainNode):
-        return visit_chain_node(node)
-    elif isinstance(node, ListNode):
-        return visit_list_node(node)
-    else:
-        return NotImplemented
-
+from src.error.error import Error
+from src.lexer.source_file import SourceFile
+from src.parser.nodes import Node
+from src.runtime.compiler import compile_tree
+from src.runtime.modules import Importer
+from src.runtime.value import Value
+from src.runtime.vm import VM
+
+
+def interpret(
+    tree: Node, source_file: SourceFile, vm: VM | None = None, importer: Importer | None = None,
+) -> tuple[Value, None] | tuple[None, Error]:
+    """Compiles then runs a program, returns the value of its last statement. Give a `vm` to
+    look at it after the run (see `VM.memo_caches`). Its modules are looked for next to it,
+    unless an `importer` is given."""
+    if importer is None:
+        importer = Importer.for_program(source_file.filename)
+    if vm is None:
+        vm = VM()
+    code, error = compile_tree(tree, source_file, importer, vm.parallel_threshold)
+    if error is not None:
+        return None, error
+    assert code is not None
+    return vm.run(code)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Memoization: results of the calls of a function, by argument, see the `memo` builtin.
+
+Arguments are compared with the equality of values (see `src.runtime.values`): a call with an
+argument equal to the one of an earlier call returns the same result without running the
+function. This is only right for functions which do nothing else than returning a value, it is
+up to the program to memoize only those.
+"""
+
+# Global Python imports
+from collections import OrderedDict
+# Huitr API imports
+from src.runtime.value import Value
+
+# Results kept by `f > memo`
+DEFAULT_MAX_SIZE = 1024
+
+
+class MemoCache:
+    """Results of a function, the least recently used ones are evicted when there are more than `max_size`"""
+    __slots__ = ("name", "max_size", "results", "hits", "misses", "evictions")
+
+    def __init__(self, name: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.name = name  # of the function, for the statistics
+        self.max_size = max_size
+        self.results: OrderedDict[Value, Value] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, argument: Value) -> Value | None:
+        result = self.results.get(argument)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(argument)
+        return result
+
+    def put(self, argument: Value, result: Value):
+        self.results[argument] = result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def __repr__(self) -> str:
+        return f"{self.name}: {self.hits} hits, {self.misses} misses, {self.evictions} evictions"
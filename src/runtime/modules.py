@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Modules: `a::b::name` is the value bound to name at the top level of the module `a::b`, the
+file `a/b.huitr`. It is looked for next to the file using it, then in the search paths (the
+directory of the program, then the libraries given with `--library-path`). `::a::b::name` is
+only looked for in the search paths. `::a::b::` is a dict of all the names of the module.
+
+The compiler only finds the file. The module is loaded (parsed, compiled and run) the first
+time one of its names is used, so a program pays for the modules it uses, not for the ones it
+could use. Modules are loaded once per process: `MODULES` keeps them by real path.
+"""
+
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+import os
+import threading
+import time
+from typing import Iterable, TYPE_CHECKING
+# Huitr API imports
+from src.error.error import Error, ReferenceError
+from src.project.build import module_name
+from src.project.frontend import SOURCE_SUFFIX, parse_file
+from src.runtime.compiler import compile_tree
+from src.runtime.context import Context
+from src.runtime.persistent import HashMap
+from src.runtime.value import Value
+from src.runtime.values import String, Dict
+from src.runtime.vm import Failure
+if TYPE_CHECKING:
+    from src.runtime.vm import VM
+
+
+class Module:
+    """A module file, and what it bound once it is loaded"""
+    __slots__ = (
+        "name", "path", "search_paths", "use_cache", "slots", "context", "loading",
+        "parse_time", "compile_time", "run_time", "cached",
+    )
+
+    def __init__(self, name: str, path: str, search_paths: list[str], use_cache: bool):
+        self.name = name
+        self.path = path
+        self.search_paths = search_paths
+        self.use_cache = use_cache
+        self.slots: dict[str, int] = {}  # of the names it binds in `context`
+        self.context: Context | None = None  # None until it is loaded
+        self.loading = False
+        self.parse_time = self.compile_time = self.run_time = 0.0
+        self.cached = False  # its tree was in the cache of the front end
+
+    def load(self, vm: VM) -> Error | None:
+        """Loads the module if it was not, returns the error of its source or its run if any"""
+        if self.context is not None:
+            return None
+        with _LOADING:  # the threads evaluating items in parallel wait for the one loading it
+            return self._load(vm)
+
+    def _load(self, vm: VM) -> Error | None:
+        if self.context is not None:
+            return None
+        if self.loading:
+            raise Failure(ReferenceError, f"module {self.name} is used while it is loaded, by a module it uses")
+        self.loading = True
+        try:
+            start = time.perf_counter()
+            parsed = parse_file(self.path, self.use_cache)
+            parsed_time = time.perf_counter()
+            self.parse_time, self.cached = parsed_time - start, parsed.cached
+            if parsed.error is not None:
+                return parsed.error
+            assert parsed.tree is not None
+
+            importer = Importer(os.path.dirname(self.path), self.search_paths, self.use_cache)
+            code, error = compile_tree(parsed.tree, parsed.source_file, importer, vm.parallel_threshold)
+            compiled_time = time.perf_counter()
+            self.compile_time = compiled_time - parsed_time
+            if error is not None:
+                return error
+            assert code is not None
+
+            context = Context(None, None, len(code.names))
+            _, error = vm.run(code, context)
+            self.run_time = time.perf_counter() - compiled_time
+            if error is not None:
+                return error
+            self.slots = {name: slot for slot, name in enumerate(code.names)}
+            self.context = context
+            return None
+        finally:
+            self.loading = False
+
+    def get(self, name: str | None) -> Value:
+        """Value bound to name in the loaded module, a dict of all its names for None"""
+        assert self.context is not None
+        slots = self.context.slots
+        if name is None:
+            return Dict(HashMap((String(bound), slots[slot]) for bound, slot in self.slots.items()))
+        slot = self.slots.get(name)
+        if slot is None:
+            raise Failure(ReferenceError, f"name '{name}' is not bound in module {self.name}")
+        return slots[slot]  # type: ignore
+
+    def __reduce__(self) -> tuple:
+        # In another process, the module of the same file, loaded there when it is used
+        return module_of, (self.path, self.name, self.search_paths, self.use_cache)
+
+    def __repr__(self) -> str:
+        source = "from the cache" if self.cached else "parsed"
+        return (
+            f"module {self.name}: {source} in {self.parse_time * 1000:.2f}ms, compiled in "
+            f"{self.compile_time * 1000:.2f}ms, ran in {self.run_time * 1000:.2f}ms"
+        )
+
+
+class Import:
+    """A name of a module used in compiled code, the constant of LOAD_MODULE. `value` is None
+    until the name is first used."""
+    __slots__ = ("module", "name", "value")
+
+    def __init__(self, module: Module, name: str | None):
+        self.module = module
+        self.name = name  # None for the whole module
+        self.value: Value | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.module.name}::{self.name or ''}"
+
+
+MODULES: dict[str, Module] = {}
+_LOADING = threading.RLock()
+
+
+def module_of(path: str, name: str, search_paths: list[str], use_cache: bool) -> Module:
+    """The Module of a file, made the first time"""
+    module = MODULES.get(path)
+    if module is None:
+        module = MODULES[path] = Module(name, path, search_paths, use_cache)
+    return module
+
+
+def loaded_modules() -> list[Module]:
+    """The modules loaded by this process, in the order they were found"""
+    return [module for module in MODULES.values() if module.context is not None]
+
+
+class Importer:
+    """Finds the modules used by a file when it is compiled. `directory` is the directory of the file."""
+    def __init__(self, directory: str, search_paths: list[str], use_cache: bool = True):
+        self.directory = directory
+        self.search_paths = search_paths
+        self.use_cache = use_cache
+        self.imports: dict[tuple[str, str | None], Import] = {}
+
+    @classmethod
+    def for_program(cls, path: str, library_paths: Iterable[str] = (), use_cache: bool = True) -> Importer:
+        root = os.path.dirname(os.path.abspath(path))
+        return cls(root, [root, *map(os.path.abspath, library_paths)], use_cache)
+
+    def find(self, namespace: list[str], absolute: bool, name: str | None) -> Import | None:
+        """`namespace::name`, `::namespace::name` if absolute, None if there is no such module"""
+        relative_path = os.path.join(*namespace) + SOURCE_SUFFIX
+        directories = self.search_paths if absolute else [self.directory, *self.search_paths]
+        for directory in directories:
+            path = os.path.realpath(os.path.join(directory, relative_path))
+            if os.path.isfile(path):
+                break
+        else:
+            return None
+
+        imported = self.imports.get((path, name))
+        if imported is None:
+            module = module_of(path, self.name(path), self.search_paths, self.use_cache)
+            imported = self.imports[path, name] = Import(module, name)
+        return imported
+
+    def name(self, path: str) -> str:
+        """Name of the module of a file, from the search path it is in"""
+        for directory in self.search_paths:
+            if os.path.commonpath([directory, path]) == directory:
+                return module_name(directory, path)
+        return module_name(self.directory, path)
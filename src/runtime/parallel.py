@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Evaluating the items of a list in parallel, with more than one worker (`--workers`).
+
+The compiler estimates the cost of evaluating each item of a list (`costs`): calling a function
+of the program or an argument, which can do anything, or a builtin calling functions, costs
+`CALL_COST`, other builtins `BUILTIN_COST`. A list with at least two items costing the
+threshold or more gets a PARALLEL instruction before its usual code, with the code of each item
+compiled on its own (`ParallelList`). The lists in these items are compiled as usual.
+
+The items are evaluated by worker processes, which get them pickled; on free-threaded CPython,
+by threads. Workers run them on their own VM, which stops at impure builtins (`print`...). The
+results are taken in order, and an item is evaluated again by the VM of the program, after the
+ones before it, when:
+
+- it called an impure builtin, so what it prints comes in the usual order,
+- it can not be pickled, or its value can not (a lazy list, a memoized function), or its value
+  holds functions of the program, which would be copies.
+
+The error of an item is returned once the ones before it are evaluated, so the value or the
+error of a list is the one evaluating its items in order gives.
+"""
+
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+import pickle
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+# Huitr API imports
+from src.error.error import Error
+from src.parser.nodes import Node, ChainNode, IdentifierNode, FuncDefNode
+from src.parser.visitor import Visitor
+from src.runtime.builtins import BUILTINS
+from src.runtime.bytecode import Code
+from src.runtime.context import Context
+from src.runtime.value import Value
+from src.runtime.values import List, LazyList, VectorList, Dict, Function, UNIT
+from src.runtime.vm import VM, Impure
+
+CALL_COST = 100
+BUILTIN_COST = 1
+CALLING_BUILTINS = {"map", "filter", "reduce", "iterate"}
+
+# Without the GIL, threads run Python code in parallel
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def call_cost(stage: Node) -> int:
+    """Estimated cost of calling what a stage of a chain evaluates to, without evaluating it"""
+    if isinstance(stage, FuncDefNode):
+        return BUILTIN_COST  # the cost of its body is the one of the node
+    if isinstance(stage, IdentifierNode) and len(stage.identifiers_list) == 1:
+        name = str(stage.identifiers_list[0].value)
+        if name in CALLING_BUILTINS:
+            return CALL_COST
+        if name in BUILTINS:
+            return BUILTIN_COST
+    return CALL_COST
+
+
+class _Costs(Visitor):
+    def __init__(self):
+        super().__init__()
+        self.costs: dict[int, int] = {}
+
+    def generic_visit(self, node: Node, children_values: list[int]) -> int:
+        cost = sum(children_values)
+        if isinstance(node, ChainNode):
+            cost += sum(map(call_cost, node.chain[1:]))
+        self.costs[id(node)] = cost
+        return cost
+
+
+def costs(tree: Node) -> dict[int, int]:
+    """Estimated cost of evaluating each node of a tree, by id"""
+    visitor = _Costs()
+    visitor.visit(tree)
+    return visitor.costs
+
+
+class ParallelList:
+    """The constant of PARALLEL: the code of each item of a list, run with unit as argument in a
+    context whose parent is the one of the list, and the offset where the usual code of the list ends"""
+    __slots__ = ("codes", "end")
+
+    def __init__(self):
+        self.codes: list[Code] = []
+        self.end = 0
+
+    def evaluate(self, vm: VM, context: Context) -> tuple[list[Value], None] | tuple[None, Error]:
+        return evaluate(vm, [Function(context, code) for code in self.codes])
+
+    def __repr__(self) -> str:
+        return f"{len(self.codes)} items, up to {self.end // 2}"
+
+
+def evaluate(vm: VM, items: list[Function]) -> tuple[list[Value], None] | tuple[None, Error]:
+    """Calls each function with unit on the workers of vm. Returns their values, or the error
+    of the first one failing."""
+    executor = _executor(vm.workers)
+    futures: list[Future | None] = []
+    for item in items:
+        if FREE_THREADED:
+            futures.append(executor.submit(_run_in_thread, vm, item))
+        else:
+            data = _dumps(item)
+            futures.append(None if data is None else executor.submit(_run_in_process, data, vm.max_depth, vm.lazy))
+
+    values = []
+    try:
+        for item, future in zip(items, futures):
+            outcome = None if future is None else future.result()
+            if type(outcome) is bytes:
+                outcome = pickle.loads(outcome)
+            if outcome is None:  # evaluated here, after the items before it
+                values.append(vm.call(item, UNIT))
+                continue
+            value, error = outcome
+            if error is not None:
+                return None, error
+            values.append(value)
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+    return values, None
+
+
+_EXECUTORS: dict[int, Executor] = {}
+
+
+def _executor(workers: int) -> Executor:
+    """The pool of that many workers, started the first time"""
+    executor = _EXECUTORS.get(workers)
+    if executor is None:
+        executor = _EXECUTORS[workers] = (ThreadPoolExecutor if FREE_THREADED else ProcessPoolExecutor)(workers)
+    return executor
+
+
+def _run(vm: VM, item: Function) -> tuple[Value, None] | tuple[None, Error] | None:
+    """Calls item with unit on a pure-only VM, None if it calls an impure builtin"""
+    code = item.value
+    try:
+        return vm.run(code, Context(item.context, UNIT, len(code.names)))
+    except Impure:
+        return None
+
+
+def _run_in_thread(vm: VM, item: Function) -> tuple[Value, None] | tuple[None, Error] | None:
+    worker = VM(vm.max_depth, vm.lazy, pure_only=True)
+    worker.memo_caches = vm.memo_caches
+    return _run(worker, item)
+
+
+def _run_in_process(data: bytes, max_depth: int, lazy: bool) -> bytes | None:
+    """The outcome of the pickled item, pickled, None if it must be evaluated again"""
+    outcome = _run(VM(max_depth, lazy, pure_only=True), pickle.loads(data))
+    if outcome is None or not _transferable(outcome[0]):
+        return None
+    return _dumps(outcome)
+
+
+def _transferable(value: Value | None) -> bool:
+    """Whether a value can be sent to the program: it holds no lazy list, and no function of the
+    program, whose copy would not be equal to it"""
+    values = [value]
+    while values:
+        value = values.pop()
+        value_type = type(value)
+        if value_type is Function or value_type is LazyList:
+            return False
+        if value_type is List:
+            values += value.value  # type: ignore
+        elif value_type is VectorList:
+            values.extend(value.vector)  # type: ignore
+        elif value_type is Dict:
+            for pair in value.value.items():  # type: ignore
+                values += pair
+    return True
+
+
+def _dumps(value: Any) -> bytes | None:
+    """value pickled, None if it can not be"""
+    try:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None
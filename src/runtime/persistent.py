@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Persistent vector and hash map: updating one makes a new one, which shares all but the
+nodes on the path to the change with the old one, so updates take O(log n) and keeping the old
+version (a snapshot) costs nothing.
+
+`Vector` is a trie of tuples of 32 items, with the last items in a tail tuple so appending is
+mostly copying the tail. `HashMap` is a hash array mapped trie: each level takes 5 bits of the
+hash of the keys, nodes only keep the children which are there, and a bitmap of which ones.
+
+Trees are at most 13 levels deep, these recurse.
+"""
+
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+from typing import Any, Hashable, Iterable, Iterator
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+_HASH_MASK = (1 << 64) - 1  # hashes are taken as unsigned 64 bits integers
+
+
+class Vector:
+    """Persistent list of items. The trie has `count - len(tail)` items, a multiple of 32, in
+    leaves of 32 items under `shift // 5` levels of nodes."""
+    __slots__ = ("count", "shift", "root", "tail")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        items = tuple(items)
+        self.count = len(items)
+        tail_start = (self.count - 1) & ~MASK if items else 0
+        self.tail = items[tail_start:]
+        # The full levels, from the leaves up
+        nodes: list[tuple] = [items[start:start + WIDTH] for start in range(0, tail_start, WIDTH)]
+        self.shift = BITS
+        while len(nodes) > WIDTH:
+            nodes = [tuple(nodes[start:start + WIDTH]) for start in range(0, len(nodes), WIDTH)]
+            self.shift += BITS
+        self.root: tuple = tuple(nodes)
+
+    @classmethod
+    def _make(cls, count: int, shift: int, root: tuple, tail: tuple) -> Vector:
+        vector = cls.__new__(cls)
+        vector.count, vector.shift, vector.root, vector.tail = count, shift, root, tail
+        return vector
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._leaves(self.root, self.shift)
+        yield from self.tail
+
+    def _leaves(self, node: tuple, shift: int) -> Iterator[Any]:
+        if shift == BITS:
+            for leaf in node:
+                yield from leaf
+        else:
+            for child in node:
+                yield from self._leaves(child, shift - BITS)
+
+    def __getitem__(self, index: int) -> Any:
+        """Item at index, negative indexes count from the end"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        tail_start = self.count - len(self.tail)
+        if index >= tail_start:
+            return self.tail[index - tail_start]
+        node = self.root
+        for shift in range(self.shift, 0, -BITS):
+            node = node[(index >> shift) & MASK]
+        return node[index & MASK]
+
+    def append(self, item: Any) -> Vector:
+        """A vector with item after the items of this one"""
+        if len(self.tail) < WIDTH:
+            return self._make(self.count + 1, self.shift, self.root, self.tail + (item,))
+        # The tail is full, it goes into the trie
+        if (self.count >> BITS) > (1 << self.shift):  # the root is full
+            root = (self.root, _path(self.shift, self.tail))
+            return self._make(self.count + 1, self.shift + BITS, root, (item,))
+        root = self._push_tail(self.shift, self.root)
+        return self._make(self.count + 1, self.shift, root, (item,))
+
+    def _push_tail(self, shift: int, node: tuple) -> tuple:
+        index = ((self.count - 1) >> shift) & MASK
+        if shift == BITS:
+            child = self.tail
+        elif index < len(node):
+            child = self._push_tail(shift - BITS, node[index])
+        else:
+            child = _path(shift - BITS, self.tail)
+        return node[:index] + (child,)  # the trie is filled from the left, index is the last one
+
+    def extend(self, items: Iterable[Any]) -> Vector:
+        vector = self
+        for item in items:
+            vector = vector.append(item)
+        return vector
+
+    def set(self, index: int, item: Any) -> Vector:
+        """A vector with item instead of the one at index, negative indexes count from the end"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        tail_start = self.count - len(self.tail)
+        if index >= tail_start:
+            tail = _replaced(self.tail, index - tail_start, item)
+            return self._make(self.count, self.shift, self.root, tail)
+        return self._make(self.count, self.shift, _set(self.root, self.shift, index, item), self.tail)
+
+
+def _path(shift: int, node: tuple) -> tuple:
+    """node, under nodes down from shift"""
+    for _ in range(shift // BITS):
+        node = (node,)
+    return node
+
+
+def _set(node: tuple, shift: int, index: int, item: Any) -> tuple:
+    child_index = (index >> shift) & MASK
+    if not shift:
+        return _replaced(node, child_index, item)
+    return _replaced(node, child_index, _set(node[child_index], shift - BITS, index, item))
+
+
+def _replaced(items: tuple, index: int, item: Any) -> tuple:
+    return items[:index] + (item,) + items[index + 1:]
+
+
+class _Node:
+    """Children of a node of a HashMap: (key, value) tuples, _Nodes and _Collisions, in the
+    order of the bits set in bitmap"""
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: tuple):
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _Collision:
+    """(key, value) tuples of keys with the same hash"""
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, hash_: int, pairs: tuple):
+        self.hash = hash_
+        self.pairs = pairs
+
+
+_EMPTY = _Node(0, ())
+_MISSING = object()
+
+
+class HashMap:
+    """Persistent map from hashable keys to values"""
+    __slots__ = ("count", "root")
+
+    def __init__(self, pairs: Iterable[tuple[Hashable, Any]] = ()):
+        self.count = 0
+        self.root = _EMPTY
+        for key, value in pairs:
+            self.root, added = _put(self.root, 0, hash(key) & _HASH_MASK, key, value)
+            self.count += added
+
+    @classmethod
+    def _make(cls, count: int, root: _Node) -> HashMap:
+        hash_map = cls.__new__(cls)
+        hash_map.count, hash_map.root = count, root
+        return hash_map
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for key, _ in self.items())
+
+    def items(self) -> Iterator[tuple[Hashable, Any]]:
+        nodes: list[_Node | _Collision] = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, _Collision):
+                yield from node.pairs
+                continue
+            for child in node.children:
+                if type(child) is tuple:
+                    yield child
+                else:
+                    nodes.append(child)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        key_hash = hash(key) & _HASH_MASK
+        node: Any = self.root
+        shift = 0
+        while True:
+            if isinstance(node, _Collision):
+                for pair_key, value in node.pairs:
+                    if pair_key == key:
+                        return value
+                return default
+            bit = 1 << ((key_hash >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            node = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            if type(node) is tuple:
+                return node[1] if node[0] == key else default
+            shift += BITS
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key: Hashable, value: Any) -> HashMap:
+        """A map where key is bound to value"""
+        root, added = _put(self.root, 0, hash(key) & _HASH_MASK, key, value)
+        return self._make(self.count + added, root)
+
+    def remove(self, key: Hashable) -> HashMap:
+        """A map without key, this one if it is not there"""
+        root = _remove(self.root, 0, hash(key) & _HASH_MASK, key)
+        if root is self.root:
+            return self
+        return self._make(self.count - 1, root or _EMPTY)  # type: ignore
+
+
+def _put(node: _Node | _Collision, shift: int, key_hash: int, key: Hashable, value: Any) -> tuple[Any, int]:
+    """node with key bound to value, and 1 if the key was not there, 0 if it was"""
+    if isinstance(node, _Collision):
+        for index, (pair_key, _) in enumerate(node.pairs):
+            if pair_key == key:
+                return _Collision(node.hash, _replaced(node.pairs, index, (key, value))), 0
+        return _Collision(node.hash, node.pairs + ((key, value),)), 1
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        children = node.children[:index] + ((key, value),) + node.children[index:]
+        return _Node(node.bitmap | bit, children), 1
+    child = node.children[index]
+    if type(child) is not tuple:
+        child, added = _put(child, shift + BITS, key_hash, key, value)
+    elif child[0] == key:
+        child, added = (key, value), 0
+    else:
+        child, added = _split(child, hash(child[0]) & _HASH_MASK, (key, value), key_hash, shift + BITS), 1
+    return _Node(node.bitmap, _replaced(node.children, index, child)), added
+
+
+def _split(pair: tuple, pair_hash: int, other: tuple, other_hash: int, shift: int) -> _Node | _Collision:
+    """A node with two pairs of different keys"""
+    if pair_hash == other_hash:
+        return _Collision(pair_hash, (pair, other))
+    bit, other_bit = 1 << ((pair_hash >> shift) & MASK), 1 << ((other_hash >> shift) & MASK)
+    if bit == other_bit:
+        return _Node(bit, (_split(pair, pair_hash, other, other_hash, shift + BITS),))
+    return _Node(bit | other_bit, (pair, other) if bit < other_bit else (other, pair))
+
+
+def _remove(node: _Node | _Collision, shift: int, key_hash: int, key: Hashable) -> Any:
+    """node without key (itself if the key is not there), None if it is empty"""
+    if isinstance(node, _Collision):
+        pairs = tuple(pair for pair in node.pairs if pair[0] != key)
+        if len(pairs) == len(node.pairs):
+            return node
+        return _Collision(node.hash, pairs) if len(pairs) > 1 else _Node(1 << ((node.hash >> shift) & MASK), pairs)
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    index = (node.bitmap & (bit - 1)).bit_count()
+    child = node.children[index]
+    if type(child) is tuple:
+        if child[0] != key:
+            return node
+        new_child = None
+    else:
+        new_child = _remove(child, shift + BITS, key_hash, key)
+        if new_child is child:
+            return node
+    if new_child is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap ^ bit, node.children[:index] + node.children[index + 1:])
+    return _Node(node.bitmap, _replaced(node.children, index, new_child))
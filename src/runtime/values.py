@@ -7,67 +7,318 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+import math
+import pickle
+import sys
+from array import array
+from typing import Callable, Iterator, TYPE_CHECKING
 # Huitr API imports
-from src.lexer.position import Position
-from src.runtime.context import Context
+from src.runtime.persistent import Vector, HashMap
 from src.runtime.value import Value
+if TYPE_CHECKING:
+    from src.runtime.bytecode import Code
+    from src.runtime.context import Context
+
+# Huitr ints have no size limit, printing them or reading them from a literal must not fail
+# (CPython refuses to convert ints of more than 4300 digits to or from strings by default)
+if hasattr(sys, "set_int_max_str_digits"):
+    sys.set_int_max_str_digits(0)
+
+# Ints made by `int_value` in this range are shared
+SMALL_INTS = range(-5, 1025)
+
+
+# Int, Float, String, List, Dict and Unit are equal (and hash the same) when they hold the same value
+# of the same type: 1 and 1.0 are different, unlike for the `eq` builtin. Functions are only
+# equal to themselves.
 
 
 class Int(Value):
-    """Integer"""
-    def __init__(self, pos_start: Position, pos_end: Position, context: Context, value: int):
-        super().__init__(pos_start, pos_end, context)
-        self.type: str = "int"
-        self.value: int = value
+    """Integer, see `int_value`"""
+    __slots__ = ("value",)
+    type = "int"
+
+    def __init__(self, value: int):
+        self.value = value
 
     def __repr__(self):
         return str(self.value)
 
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Int and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 class Float(Value):
     """Float"""
-    def __init__(self, pos_start: Position, pos_end: Position, context: Context, value: float):
-        super().__init__(pos_start, pos_end, context)
-        self.type: str = "float"
-        self.value: float = value
+    __slots__ = ("value",)
+    type = "float"
+
+    def __init__(self, value: float):
+        self.value = value
 
     def __repr__(self):
         return str(self.value)
 
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not Float or self.value != other.value:
+            return False
+        # 0.0 and -0.0 are printed differently
+        return self.value != 0 or math.copysign(1, self.value) == math.copysign(1, other.value)
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 class String(Value):
     """String"""
-    def __init__(self, pos_start: Position, pos_end: Position, context: Context, value: str):
-        super().__init__(pos_start, pos_end, context)
-        self.type: str = "str"
-        self.value: str = value
+    __slots__ = ("value",)
+    type = "str"
+
+    def __init__(self, value: str):
+        self.value = value
 
     def __repr__(self) -> str:
         value_to_print = self.value
         if "\"" in value_to_print:
             if "'" in value_to_print:
-                return f'"{value_to_print.replace("\"", "\\\"")}"'
+                escaped = value_to_print.replace('"', '\\"')
+                return f'"{escaped}"'
             return f"'{value_to_print}'"
         return f'"{self.value}"'
 
+    def __eq__(self, other: object) -> bool:
+        return type(other) is String and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 class List(Value):
     """List of values"""
-    def __init__(self, pos_start: Position, pos_end: Position, context: Context, value: list[Value]):
-        super().__init__(pos_start, pos_end, context)
-        self.type: str = "list"
-        self.value: list[Value] = value
+    __slots__ = ("value",)
+    type = "list"
+
+    def __init__(self, value: list[Value]):
+        self.value = value
 
     def __repr__(self) -> str:
         return "[" + ",".join(map(repr, self.value)) + "]"
 
+    def __eq__(self, other: object) -> bool:
+        # Lists can be nested deeper than the recursion limit
+        pairs: list[tuple[object, object]] = [(self, other)]
+        while pairs:
+            value, other = pairs.pop()
+            if isinstance(value, List):
+                if type(value) is LazyList or type(other) is LazyList:
+                    if value is not other:
+                        return False
+                elif not isinstance(other, List) or len(value.value) != len(other.value):  # type: ignore
+                    return False
+                else:
+                    pairs.extend(zip(value.value, other.value))  # type: ignore
+            elif value != other:
+                return False
+        return True
+
+    def __hash__(self) -> int:
+        # The hash of the tuple of the hashes of the items. Lists can be nested deeper than the
+        # recursion limit: the lists in it are found on a stack, then hashed innermost first.
+        # Lists hashing in their own way (lazy lists...) are hashed like other items.
+        lists = [self]
+        order = []  # lists before the ones in them
+        while lists:
+            value = lists.pop()
+            order.append(value)
+            lists += [item for item in value.value if type(item) is List or type(item) is VectorList]
+        hashes: dict[int, int] = {}  # by id of the list
+        for value in reversed(order):
+            hashes[id(value)] = hash(tuple([
+                hashes[id(item)] if type(item) is List or type(item) is VectorList else hash(item)
+                for item in value.value
+            ]))
+        return hashes[id(self)]
+
+
+class LazyList(List):
+    """List whose items are computed when they are needed (see `--lazy`). `items` makes an
+    iterator computing them, each walk of the list computes them again, so they do not have to
+    be kept. `value` computes them all, and keeps them.
+    As they can be infinite, a lazy list is only equal to itself (it is then a memo or dict key
+    which computes nothing), unlike for the `eq` builtin."""
+    __slots__ = ("items", "_items")
+
+    def __init__(self, items: Callable[[], Iterator[Value]]):
+        self.items = items
+        super().__init__(None)  # type: ignore
+
+    @property
+    def value(self) -> list[Value]:  # type: ignore
+        if self._items is None:
+            self._items = list(self.items())
+        return self._items
+
+    @value.setter
+    def value(self, items: list[Value] | None):
+        self._items = items  # None until they are all computed
+
+    def iterate(self) -> Iterator[Value]:
+        if self._items is not None:
+            return iter(self._items)
+        return self.items()
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __reduce__(self):
+        # Pickling `value` would compute the items, which can be infinite
+        raise pickle.PicklingError("a lazy list can not be pickled")
+
+
+class NumberList(List):
+    """List of ints or of floats, stored without boxing them in an array: of typecode 'q' for
+    ints which fit in 64 bits, 'd' for floats. Builtins which know about it go over the array,
+    `value` boxes the numbers for the others, once."""
+    __slots__ = ("numbers", "_items")
+
+    def __init__(self, numbers: array):
+        self.numbers = numbers
+        super().__init__(None)  # type: ignore
+
+    @property
+    def value(self) -> list[Value]:  # type: ignore
+        if self._items is None:
+            self._items = list(map(int_value if self.numbers.typecode == "q" else Float, self.numbers))
+        return self._items
+
+    @value.setter
+    def value(self, items: list[Value] | None):
+        self._items = items  # None until they are boxed
+
+    def __eq__(self, other: object) -> bool:
+        # Floats are not compared in the arrays, where 0.0 and -0.0 are equal
+        if type(other) is NumberList and self.numbers.typecode == other.numbers.typecode == "q":
+            return self.numbers == other.numbers
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.numbers))  # the hash of the boxed list
+
+    def __reduce__(self) -> tuple:
+        return NumberList, (self.numbers,)  # not `value`, which boxes them
+
+
+class VectorList(List):
+    """List stored in a persistent vector (see `src.runtime.persistent.Vector`), made by the
+    builtins which update lists, so an update shares the items of the list it was made from
+    instead of copying them. `value` makes a Python list of the items, once."""
+    __slots__ = ("vector", "_items")
+
+    def __init__(self, vector: Vector):
+        self.vector = vector
+        super().__init__(None)  # type: ignore
+
+    @property
+    def value(self) -> list[Value]:  # type: ignore
+        if self._items is None:
+            self._items = list(self.vector)
+        return self._items
+
+    @value.setter
+    def value(self, items: list[Value] | None):
+        self._items = items  # None until they are needed
+
+    def __reduce__(self) -> tuple:
+        return VectorList, (self.vector,)
+
+
+class Dict(Value):
+    """Map from values to values, in a persistent hash map (see `src.runtime.persistent.HashMap`).
+    Keys are compared like values are (see above), so 1 and 1.0 are different keys."""
+    __slots__ = ("value",)
+    type = "dict"
+
+    def __init__(self, value: HashMap):
+        self.value = value
+
+    def __repr__(self) -> str:
+        return "{" + ",".join(f"{key!r}:{value!r}" for key, value in self.pairs()) + "}"
+
+    def pairs(self) -> list[tuple[Value, Value]]:
+        """Keys and values, by the printed keys: the order in the trie depends on the hashes of
+        strings, which change from a run to another"""
+        return sorted(self.value.items(), key=lambda pair: repr(pair[0]))
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not Dict or len(self.value) != len(other.value):
+            return False
+        missing = object()
+        return all(other.value.get(key, missing) == value for key, value in self.value.items())
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.value.items()))
+
 
 class Unit(Value):
-    """unit"""
-    def __init__(self, pos_start: Position, pos_end: Position, context: Context):
-        super().__init__(pos_start, pos_end, context)
-        self.type: str = "unit"
+    """unit, there is one: `UNIT`"""
+    __slots__ = ()
+    type = "unit"
 
     def __repr__(self) -> str:
         return "()"
 
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Unit
+
+    def __hash__(self) -> int:
+        return hash(Unit)
+
+    def __reduce__(self) -> str:
+        return "UNIT"
+
+
+class Function(Value):
+    """Function defined in Huitr, `context` is the one it was defined in"""
+    __slots__ = ("value", "context")
+    type = "function"
+
+    def __init__(self, context: Context, code: Code):
+        self.context = context
+        self.value = code
+
+    def __repr__(self) -> str:
+        return "<function>"
+
+
+class BuiltinFunction(Value):
+    """Function written in Python, see `src.runtime.builtins`"""
+    __slots__ = ("name", "value", "pure")
+    type = "function"
+
+    def __init__(self, name: str, function: Callable, pure: bool = True):
+        self.name = name
+        self.value = function
+        self.pure = pure  # the result only depends on the argument, and calling it does nothing else
+
+    def __repr__(self) -> str:
+        return f"<built-in function {self.name}>"
+
+
+UNIT = Unit()
+_SMALL_INTS = [Int(value) for value in SMALL_INTS]
+
+
+def int_value(value: int) -> Int:
+    """The Int of value, shared if it is small"""
+    if SMALL_INTS.start <= value < SMALL_INTS.stop:
+        return _SMALL_INTS[value - SMALL_INTS.start]
+    return Int(value)
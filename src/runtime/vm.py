@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Virtual machine running the bytecode of `src.runtime.bytecode`"""
+
+# __future__ imports (must be first)
+from __future__ import annotations
+# Global Python imports
+import builtins
+from typing import Any, Callable, TYPE_CHECKING
+# Huitr API imports
+from src.error.error import Error, ReferenceError, RecursionError, TypeError
+from src.runtime.bytecode import Code, Opcode
+from src.runtime.context import Context
+from src.runtime.memo import MemoCache
+from src.runtime.value import Value
+from src.runtime.values import Float, String, List, Function, BuiltinFunction, UNIT, int_value
+if TYPE_CHECKING:
+    from src.runtime.modules import Import
+    from src.runtime.parallel import ParallelList
+
+# Calls of functions in progress, including the ones the program is waiting the result of, it
+# does not depend on the recursion limit of Python
+DEFAULT_MAX_DEPTH = 2_000_000
+# Estimated cost of the items of the lists evaluated in parallel, see `src.runtime.parallel`
+DEFAULT_PARALLEL_THRESHOLD = 100
+
+# Plain ints, looking up enum members is slow in the dispatch loop
+(
+    _CONST, _LOAD_ARG, _LOAD_LOCAL, _STORE_LOCAL, _BUILD_LIST, _MAKE_FUNCTION, _CALL, _POP, _RETURN, _LOAD_OUTER,
+    _LOAD_MODULE, _PARALLEL,
+) = map(int, (
+    Opcode.CONST, Opcode.LOAD_ARG, Opcode.LOAD_LOCAL, Opcode.STORE_LOCAL, Opcode.BUILD_LIST,
+    Opcode.MAKE_FUNCTION, Opcode.CALL, Opcode.POP, Opcode.RETURN, Opcode.LOAD_OUTER, Opcode.LOAD_MODULE,
+    Opcode.PARALLEL,
+))
+
+
+class Failure(Exception):
+    """Raised by builtins: the VM reports it as an error of `error_class` at the call"""
+    def __init__(self, error_class: type[Error], message: str):
+        super().__init__(message)
+        self.error_class = error_class
+        self.message = message
+
+
+class Impure(Exception):
+    """Raised by a VM running only pure code when an impure builtin is called"""
+
+
+class Call:
+    """Returned by a builtin: the VM calls `function` with `argument` in its place, without
+    nesting a run of the VM. `then`, if given, is called with the result and returns the result
+    of the builtin, or another Call, so a builtin can call functions one after the other (map...)."""
+    __slots__ = ("function", "argument", "then")
+
+    def __init__(self, function: Value, argument: Value, then: Callable[[Value], Value | Call] | None = None):
+        self.function = function
+        self.argument = argument
+        self.then = then
+
+
+class _Then:
+    """The `then` of a Call waiting on the frame stack for the result of a function, with the
+    call of the builtin which asked for it: `code` at `pc`, where its errors are reported"""
+    __slots__ = ("then", "code", "pc", "resume")
+
+    def __init__(self, then: Callable[[Value], Value | Call], code: Code, pc: int):
+        self.then = then
+        self.code = code
+        self.pc = pc
+        self.resume: Code | None = None
+
+    def resume_code(self) -> Code:
+        """Code making the Call returned by `then`, from the function then its argument on the
+        stack, at the positions of the call of the builtin"""
+        if self.resume is None:
+            index = (self.pc - 2) // 2
+            start, end = self.code.starts[index], self.code.ends[index]
+            self.resume = Code(self.code.source_file, self.code.name)
+            self.resume.emit(Opcode.CALL, 0, start, end)
+            self.resume.emit(Opcode.RETURN, 0, start, end)
+        return self.resume
+
+
+class _Raised(Exception):
+    """Carries an Error, with its position, out of the nested runs of the VM"""
+    def __init__(self, error: Error):
+        super().__init__(error.message)
+        self.error = error
+
+
+class VM:
+    """Runs calls of Huitr functions on its own stack of frames: a call in tail position (the last
+    thing a function does) replaces the frame of the caller, so it runs in constant space.
+
+    With more than one worker, the items of costly lists are evaluated in parallel, see
+    `src.runtime.parallel`. A `pure_only` VM raises Impure instead of calling impure builtins.
+    """
+    def __init__(
+        self, max_depth: int = DEFAULT_MAX_DEPTH, lazy: bool = False, workers: int = 1,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD, pure_only: bool = False,
+    ):
+        self.max_depth = max_depth
+        self.lazy = lazy  # builtins make lazy lists, see `src.runtime.values.LazyList`
+        self.workers = workers
+        # What the compiler is given: None when no list is compiled to be evaluated in parallel
+        self.parallel_threshold = parallel_threshold if workers > 1 else None
+        self.pure_only = pure_only
+        self.memo_caches: list[MemoCache] = []  # of the functions memoized by the program
+
+    def run(self, code: Code, context: Context | None = None) -> tuple[Value, None] | tuple[None, Error]:
+        """Runs a program, or a module in its context"""
+        if context is None:
+            context = Context(None, None, len(code.names))
+        try:
+            return self._run(code, context), None
+        except _Raised as e:
+            return None, e.error
+
+    def call(self, function: Value, argument: Value) -> Value:
+        """Calls a function in a nested run of the VM, for the lazy lists of builtins, which call
+        functions when their items are needed. Builtins return a Call instead."""
+        thens = []
+        while True:
+            if isinstance(function, Function):
+                code = function.value
+                result = self._run(code, Context(function.context, argument, len(code.names)))
+            else:
+                if not isinstance(function, BuiltinFunction):
+                    raise Failure(TypeError, f"{function!r} is not a function")
+                if self.pure_only and not function.pure:
+                    raise Impure(function.name)
+                result = function.value(self, argument)
+                if type(result) is not Call:
+                    result = self.box(result)
+            while thens and type(result) is not Call:
+                result = thens.pop()(result)
+            if type(result) is not Call:
+                return result
+            if result.then is not None:
+                thens.append(result.then)
+            function, argument = result.function, result.argument
+
+    def load(self, imported: Import) -> Value:
+        """Value of a name of a module, the module is loaded the first time"""
+        error = imported.module.load(self)
+        if error is not None:
+            raise _Raised(error)
+        imported.value = imported.module.get(imported.name)
+        return imported.value
+
+    def parallel(self, parallel_list: ParallelList, context: Context) -> Value:
+        """The list of the values of the items, evaluated by the workers"""
+        values, error = parallel_list.evaluate(self, context)
+        if error is not None:
+            raise _Raised(error)
+        return List(values)
+
+    def box(self, value: Any) -> Value:
+        """Returns value as a Value"""
+        if isinstance(value, Value):
+            return value
+        value_type = type(value)
+        if value_type is int or value_type is bool:
+            return int_value(int(value))
+        if value_type is float:
+            return Float(value)
+        if value_type is str:
+            return String(value)
+        if value_type is list:
+            return List([self.box(item) for item in value])
+        assert value is None, f"can not make a value of {value_type.__name__}"
+        return UNIT
+
+    def _run(self, code: Code, context: Context) -> Value:
+        # Frames of the callers: (code, context, pc, stack) tuples, and the `then` of the calls
+        # asked by builtins, to call with the result of the frame above
+        frames: list[tuple[Code, Context, int, list[Value]] | _Then] = []
+        instructions = code.instructions
+        constants = code.constants
+        stack: list[Value] = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        pure_only = self.pure_only
+        try:
+            while True:
+                opcode = instructions[pc]
+                argument = instructions[pc + 1]
+                pc += 2
+                if opcode == _CONST:
+                    push(constants[argument])
+                elif opcode == _LOAD_LOCAL:
+                    value = context.slots[argument]
+                    if value is None:
+                        raise Failure(ReferenceError, f"name '{code.names[argument]}' is used before it is bound")
+                    push(value)
+                elif opcode == _LOAD_OUTER:
+                    depth, slot, name = code.outer[argument]
+                    outer_context = context
+                    for _ in range(depth):
+                        outer_context = outer_context.parent  # type: ignore
+                    value = outer_context.slots[slot]
+                    if value is None:
+                        raise Failure(ReferenceError, f"name '{name}' is used before it is bound")
+                    push(value)
+                elif opcode == _CALL:
+                    function = pop()
+                    function_argument = pop()
+                    thens = None
+                    while True:
+                        function_type = type(function)
+                        if function_type is Function:
+                            if instructions[pc] != _RETURN:  # not a tail call: come back here
+                                frames.append((code, context, pc, stack))
+                            if thens is not None:
+                                frames += thens
+                            if len(frames) >= self.max_depth:
+                                raise Failure(RecursionError, "maximum recursion depth exceeded")
+                            code = function.value
+                            instructions = code.instructions
+                            constants = code.constants
+                            context = Context(function.context, function_argument, len(code.names))
+                            stack = []
+                            push = stack.append
+                            pop = stack.pop
+                            pc = 0
+                            break
+                        if function_type is not BuiltinFunction:
+                            raise Failure(TypeError, f"{function!r} is not a function")
+                        if pure_only and not function.pure:
+                            raise Impure(function.name)
+                        result = function.value(self, function_argument)
+                        if type(result) is not Call:
+                            result = self.box(result)
+                            while thens and type(result) is not Call:
+                                result = thens.pop().then(result)
+                            if type(result) is not Call:
+                                push(result)
+                                break
+                        if result.then is not None:
+                            if thens is None:
+                                thens = []
+                            thens.append(_Then(result.then, code, pc))
+                        function, function_argument = result.function, result.argument
+                elif opcode == _LOAD_ARG:
+                    argument_context = context
+                    for _ in range(argument):
+                        argument_context = argument_context.parent  # type: ignore
+                    push(argument_context.argument)  # type: ignore
+                elif opcode == _POP:
+                    pop()
+                elif opcode == _RETURN:
+                    result = pop()
+                    while frames:
+                        frame = frames.pop()
+                        if type(frame) is tuple:
+                            code, context, pc, stack = frame
+                            instructions = code.instructions
+                            constants = code.constants
+                            push = stack.append
+                            pop = stack.pop
+                            push(result)
+                            break
+                        code, pc = frame.code, frame.pc  # type: ignore
+                        result = frame.then(result)  # type: ignore
+                        if type(result) is Call:  # made from the call of the builtin
+                            if result.then is frame.then:  # type: ignore
+                                frames.append(frame)
+                            elif result.then is not None:
+                                frames.append(_Then(result.then, code, pc))
+                            function = result.function
+                            if type(function) is Function:
+                                if len(frames) >= self.max_depth:
+                                    raise Failure(RecursionError, "maximum recursion depth exceeded")
+                                code = function.value
+                                context = Context(function.context, result.argument, len(code.names))
+                                stack = []
+                            else:
+                                code = frame.resume_code()  # type: ignore
+                                stack = [result.argument, function]
+                            instructions = code.instructions
+                            constants = code.constants
+                            push = stack.append
+                            pop = stack.pop
+                            pc = 0
+                            break
+                    else:
+                        return result
+                elif opcode == _BUILD_LIST:
+                    if argument:
+                        items = stack[-argument:]
+                        del stack[-argument:]
+                    else:
+                        items = []
+                    push(List(items))
+                elif opcode == _MAKE_FUNCTION:
+                    push(Function(context, constants[argument]))
+                elif opcode == _LOAD_MODULE:
+                    value = constants[argument].value
+                    if value is None:
+                        value = self.load(constants[argument])
+                    push(value)
+                elif opcode == _STORE_LOCAL:
+                    context.slots[argument] = stack[-1]
+                elif opcode == _PARALLEL:
+                    if self.workers > 1:  # else the items are evaluated by the next instructions
+                        push(self.parallel(constants[argument], context))
+                        pc = constants[argument].end
+                else:
+                    raise AssertionError(f"invalid opcode {opcode}")
+        except Failure as e:
+            raise _Raised(e.error_class(e.message, *code.positions(pc - 2)))
+        except builtins.RecursionError:
+            # The lazy lists of builtins calling functions (map...) still nest runs of the VM
+            raise _Raised(RecursionError("maximum recursion depth exceeded", *code.positions(pc - 2)))
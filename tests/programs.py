@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Running programs given as strings, as `main.py run` does"""
+
+# Global Python imports
+import contextlib
+import io
+# Huitr API imports
+from src.lexer.lexer import Lexer
+from src.lexer.source_file import SourceFile
+from src.optimizer.fold import fold
+from src.optimizer.inline import inline
+from src.parser.parser import Parser
+from src.runtime.interpreter import interpret
+from src.runtime.vm import VM
+
+
+def run(source: str, optimize: bool = True, vm: VM | None = None) -> tuple[str, str | None]:
+    """What the program prints, and its error (without the traceback), if any"""
+    source_file = SourceFile(source, "<test>")
+    tree, error = Parser(Lexer(source_file).stream()).parse()
+    if error is not None:
+        return "", error.message
+    assert tree is not None
+    if optimize:
+        tree, _ = inline(tree)
+        tree, _ = fold(tree)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        _, error = interpret(tree, source_file, vm)
+    return output.getvalue(), None if error is None else f"{error.type}: {error.message}"
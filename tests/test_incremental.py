@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Random edits of random sources: updating the tokens and the tree must give what lexing and
+parsing the edited source from scratch gives"""
+
+# Global Python imports
+import random
+# Huitr API imports
+from src.lexer.lexer import Lexer
+from src.lexer.source_file import SourceFile
+from src.parser.incremental import apply_edit
+from src.parser.parser import Parser
+from src.parser.visitor import walk
+
+FRAGMENTS = [
+    "(", ")", "[", "]", ">", ",", ";", "a", "bb", "1", "2.5", "'s t'", "::", "x::y", " ", "\n", "()", "f",
+    ".. c ..", ". c\n", "«u»",
+]
+
+
+def _tokens(tokens):
+    return [(token.type, token.value, token.start_pos.index, token.end_pos.index) for token in tokens]
+
+
+def _tree(tree):
+    if tree is None:
+        return None
+    return repr(tree), [
+        (type(node).__name__, getattr(node, "pos_start", None) and node.pos_start.index,
+         getattr(node, "pos_end", None) and node.pos_end.index)
+        for node in walk(tree)
+    ]
+
+
+def _error(error):
+    return error and (error.message, error.start_pos.index, error.start_pos.line_number, error.start_pos.column)
+
+
+def test_edits_give_what_parsing_from_scratch_gives():
+    rng = random.Random(5)
+    edits = 0
+    for _ in range(5000):
+        source = " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 20)))
+        source_file = SourceFile(source, "f")
+        tokens, error = Lexer(source_file).tokenize()
+        if error is not None:
+            continue
+        tree, error = Parser(tokens).parse()
+        if error is not None:
+            continue
+        for _ in range(4):
+            offset = rng.randint(0, len(source))
+            deleted = rng.randint(0, min(5, len(source) - offset))
+            inserted = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 3)))
+            source = source[:offset] + inserted + source[offset + deleted:]
+            tokens, tree, error = apply_edit(source_file, tokens, tree, offset, deleted, inserted)
+            edits += 1
+
+            expected_file = SourceFile(source, "f")
+            expected_tokens, expected_error = Lexer(expected_file).tokenize()
+            expected_tree = None
+            if expected_error is None:
+                expected_tree, expected_error = Parser(expected_tokens).parse()
+            assert source_file.source == source
+            assert source_file.line_starts == expected_file.line_starts
+            assert (_tree(tree), _error(error)) == (_tree(expected_tree), _error(expected_error)), (source, offset, deleted, inserted)
+            if error is not None:
+                break
+            assert _tokens(tokens) == _tokens(expected_tokens)
+    assert edits > 1000
+
+
+def test_edit_far_from_the_end_does_not_move_the_next_positions():
+    source_file = SourceFile("a > f;\n" * 1000, "f")
+    tokens, _ = Lexer(source_file).tokenize()
+    tree, _ = Parser(tokens).parse()
+    last = tokens[-2]
+    tokens, tree, error = apply_edit(source_file, tokens, tree, 0, 1, "bb")
+    tokens, tree, error = apply_edit(source_file, tokens, tree, 7, 0, "\n\n")
+    assert error is None
+    # The positions after the edits were not updated, they move when they are read
+    assert last.end_pos.index == len(source_file.source) - 2
+    assert (last.end_pos.line_number, last.end_pos.column) == (1001, 5)
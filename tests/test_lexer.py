@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""The regex engine, in all its forms, against the reference engine (tokenize_chars)"""
+
+# Global Python imports
+import gc
+import random
+import tracemalloc
+# Huitr API imports
+from src.error.error import Error
+from src.lexer import lexer
+from src.lexer.collection import fewer_collections
+from src.lexer.lexer import Lexer, stream_tokens
+
+FRAGMENTS = [
+    "(", ")", "[", "]", ">", ",", ";", ":", "::", "a", "Zb9", "1", "2.5", "1.5.2", " 3e-2 ", "'s t'", '"', "«u»",
+    "»", "é", "€", " ", "\n", "\t", "\N{NBSP}", ". c\n", ".. c ..", "..",
+]
+
+
+def _lexed(tokens, error):
+    if error is not None:
+        return error.message, error.start_pos.index, error.start_pos.line_number, error.start_pos.column
+    return [
+        (token.type, token.value, token.start_pos.index, token.end_pos.index,
+         token.start_pos.line_number, token.start_pos.column)
+        for token in tokens
+    ]
+
+
+def _streamed(items):
+    if items and isinstance(items[-1], Error):
+        return _lexed(None, items[-1])
+    return _lexed(items, None)
+
+
+def test_engines_give_the_same_tokens(monkeypatch):
+    monkeypatch.setattr(lexer, "BATCH_SIZE", 2)  # so that the sources are scanned in several batches
+    rng = random.Random(3)
+    for _ in range(5000):
+        source = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 15)))
+        expected = _lexed(*Lexer(source, "f", engine="char").tokenize())
+        assert _lexed(*Lexer(source, "f").tokenize()) == expected, source
+        buffer, error = Lexer(source, "f").tokenize_compact()
+        assert _lexed(list(buffer), error) == expected, source
+        assert _streamed(list(Lexer(source, "f").stream())) == expected, source
+        chunk_size = rng.randint(1, 3)
+        chunks = [source[i:i + chunk_size] for i in range(0, len(source), chunk_size)]
+        assert _streamed(list(stream_tokens(chunks, "f"))) == expected, source
+
+
+def test_stream_keeps_a_batch_of_tokens():
+    source = "[_, 1 > lt, [0], [(__, 1 > sub > f), (__, 2 > sub > f) > add] > if] > f;\n" * 5000
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        count = sum(1 for _ in stream_tokens(source))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert count == 200_001
+    # Scanning all the tokens into one TokenBuffer took about 5 MB
+    assert peak < 2_000_000
+
+
+def test_thresholds_of_the_garbage_collector_are_restored():
+    threshold = gc.get_threshold()
+    with fewer_collections():
+        with fewer_collections():
+            Lexer("a > b", "f").tokenize()
+        assert gc.get_threshold() != threshold
+    assert gc.get_threshold() == threshold
+    assert gc.isenabled()
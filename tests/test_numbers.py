@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Huitr API imports
+from tests.programs import run
+
+
+def test_negative_zero_is_kept_by_the_optimisations():
+    source = "0.0 > print; 0.0 > neg > print; (0.0 > neg), 0.0 > print;"
+    assert run(source) == run(source, optimize=False) == ("0.0\n-0.0\n[-0.0,0.0]\n", None)
+
+
+def test_big_ints_print():
+    output, error = run("2, 20000 > pow > print; 10, 5000 > pow > str > len > print;")
+    assert error is None
+    assert output.splitlines() == [str(2 ** 20000), "5001"]
+
+
+def test_big_int_literal():
+    assert run("1" * 5000 + " > print;") == ("1" * 5000 + "\n", None)
+
+
+def test_int_of_non_finite_floats():
+    for value in ("1e999", "1e999 > neg", "1e999, (1e999 > neg) > add"):
+        output, error = run(f"{value} > int;")
+        assert output == "" and error is not None and error.startswith("ValueError")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Random programs give the same output and the same error with and without the optimizer"""
+
+# Global Python imports
+import random
+import time
+# Huitr API imports
+from src.lexer.lexer import Lexer
+from src.optimizer.inline import inline
+from src.parser.parser import Parser
+from tests.programs import run
+
+OPERATORS = ["add", "sub", "mul", "max", "min", "idiv", "mod", "lt", "eq"]
+
+
+def _expression(rng: random.Random, depth: int, in_function: bool, names: list[str], functions: list[str]) -> str:
+    """An expression using the names, and calling the functions (which do not call each other in a loop)"""
+    choice = rng.randrange(10 if depth else 3)
+    if choice == 0:
+        return str(rng.randint(0, 9))
+    if choice == 1:
+        return "_" if in_function else str(rng.randint(0, 3))
+    if choice == 2:
+        return rng.choice(names) if names else "1"
+
+    def inner() -> str:
+        return _expression(rng, depth - 1, in_function, names, functions)
+    if choice <= 4:
+        return f"({inner()}, {inner()} > {rng.choice(OPERATORS)})"
+    if choice == 5:
+        return f"({inner()} > [{_expression(rng, depth - 1, True, names, functions)}])"
+    if choice == 6:
+        return f"({inner()} > {rng.choice(functions or ['neg'])})"
+    if choice == 7:
+        return f"({inner()} > print)"
+    if choice == 8:
+        return f"({inner()}, 2 > lt, [{inner()}], [{inner()}] > if)"
+    return f"({inner()} > [_] > [_, 1 > add] > [_, 2 > mul])"
+
+
+def _program(rng: random.Random) -> str:
+    statements = [
+        f"[{_expression(rng, 2, True, [], [])}] > h",
+        f"[{_expression(rng, 2, True, [], ['h'])} > h] > g",
+        f"[{_expression(rng, 2, True, [], ['g', 'h'])} > g] > f",
+    ]
+    names: list[str] = []
+    for i in range(rng.randint(0, 3)):
+        statements.append(f"{_expression(rng, 3, False, names, ['f', 'g', 'h'])} > x{i}")
+        names.append(f"x{i}")
+    statements.append(f"{_expression(rng, 4, False, names, ['f', 'g', 'h'])} > print")
+    return ";\n".join(statements)
+
+
+def test_optimized_programs_do_the_same():
+    rng = random.Random(7)
+    inlined = 0
+    for _ in range(1500):
+        source = _program(rng)
+        assert run(source, optimize=True) == run(source, optimize=False), source
+        inlined += sum(inline(Parser(Lexer(source, "f").tokenize()[0]).parse()[0])[1])  # type: ignore
+    assert inlined > 3000
+
+
+def test_long_chain_is_inlined_in_linear_time():
+    def inline_time(stages: int) -> float:
+        tree, _ = Parser(Lexer("1" + " > [_]" * stages + " > print", "f").tokenize()[0]).parse()
+        best = float("inf")
+        for _ in range(2):
+            start = time.perf_counter()
+            _, report = inline(tree)  # type: ignore
+            best = min(best, time.perf_counter() - start)
+            assert report.reduced == stages
+        return best
+    # It took 16 times longer (quadratic), it takes 4 times longer now
+    assert inline_time(40_000) < 8 * inline_time(10_000)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Global Python imports
+from array import array
+# Huitr API imports
+from src.runtime.persistent import Vector
+from src.runtime.values import List, LazyList, NumberList, VectorList, int_value
+from tests.programs import run
+
+
+def test_infinite_lazy_lists_are_keys():
+    source = (
+        "[_ > first] > memo > head; (0, [_, 1 > add] > iterate) > naturals;"
+        "naturals > head > print; naturals > head > print;"
+        "((naturals, 1), (naturals, 2) > dict), naturals > get > print;"
+    )
+    assert run(source) == ("0\n0\n2\n", None)
+
+
+def test_lazy_lists_are_only_equal_to_themselves():
+    lazy = LazyList(lambda: iter([int_value(1)]))
+    assert lazy == lazy and List([lazy]) == List([lazy])
+    assert lazy != List([int_value(1)]) and List([int_value(1)]) != lazy
+    assert lazy != LazyList(lambda: iter([int_value(1)]))
+    assert hash(List([lazy])) == hash(List([lazy]))
+
+
+def test_nested_lists_hash_by_their_items():
+    # Nested lists counted only by their length: all of these had the same hash
+    assert len({hash(List([List([int_value(i)]), int_value(0)])) for i in range(100)}) == 100
+    numbers = [int_value(1), int_value(2)]
+    equal_lists = [
+        List(numbers), NumberList(array("q", [1, 2])), VectorList(Vector(numbers)),
+    ]
+    assert len({hash(List([nested, int_value(3)])) for nested in equal_lists}) == 1
+
+    deep = List([])
+    for _ in range(100_000):
+        deep = List([deep])
+    assert hash(deep) == hash(deep)
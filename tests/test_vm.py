@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# Huitr - a purely functional programming language.
+# Copyright (C) 2024-2025  3fxcf9, jd-develop
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Huitr API imports
+from src.runtime.vm import VM
+from tests.programs import run
+
+DEPTH = 10_000  # nested runs of the VM failed at about 300
+
+
+def test_tail_calls_run_in_constant_space():
+    # Deeper than max_depth: only a call in tail position can do it
+    source = "[_, 1 > lt, [0], [__, 1 > sub > loop] > if] > loop; 100000 > loop > print;"
+    assert run(source, optimize=False, vm=VM(max_depth=100)) == ("0\n", None)
+
+
+def test_recursion_does_not_use_the_python_stack():
+    source = f"[_, 1 > lt, [0], [(__, 1 > sub > f), 1 > add] > if] > f; {DEPTH} > f > print;"
+    assert run(source, optimize=False) == (f"{DEPTH}\n", None)
+
+
+def test_recursion_through_builtins_calling_functions():
+    source = (
+        "[_, 1 > lt, [0], [(1 > range), [___, 1 > sub > f] > map > [_, 0 > get]] > if] > f;"
+        "[_, 1 > lt, [0], [(1 > range), [___, 1 > sub > g] > filter > len] > if] > g;"
+        "[_, 1 > lt, [0], [(1 > range), 0, [___, 1 > sub > h] > reduce] > if] > h;"
+        f"{DEPTH} > f > print; {DEPTH} > g > print; {DEPTH} > h > print;"
+    )
+    assert run(source, optimize=False) == ("0\n0\n0\n", None)
+
+
+def test_max_depth():
+    source = "[_, 1 > lt, [0], [(__, 1 > sub > f), 1 > add] > if] > f; 1000 > f;"
+    output, error = run(source, optimize=False, vm=VM(max_depth=100))
+    assert error == "RecursionError: maximum recursion depth exceeded"
+
+
+def test_builtins_calling_functions():
+    source = (
+        "(1, 2, 3), [_, 10 > mul] > map > print;"
+        "(1, 2, 3, 4), [_, 2 > mod] > filter > print;"
+        "(1, 2, 3, 4), 0, [_ > add] > reduce > print;"
+        "(1, 2), neg > map > print;"
+        "(1, 2, 3), [_ > print] > map;"
+        "(1, 2), [_ > print] > filter;"
+    )
+    assert run(source, optimize=False) == ("[10,20,30]\n[1,3]\n10\n[-1,-2]\n1\n2\n3\n1\n2\n", None)
+
+
+def test_errors_of_functions_called_by_builtins():
+    output, error = run('(1, "a"), [_ > neg] > map > print;', optimize=False)
+    assert output == "" and error == 'TypeError: neg takes numbers, not str "a"'